@@ -1,10 +1,9 @@
 from colorama import Fore, Style
-from autogpt.app import execute_command, get_command
+from autogpt.agent.reply import AssistantReply
+from autogpt.app import execute_commands
 
 from autogpt.chat import chat_with_ai, create_chat_message
 from autogpt.config import Config
-from autogpt.json_fixes.master_json_fix_method import fix_json_using_multiple_techniques
-from autogpt.json_validation.validate_json import validate_json
 from autogpt.logs import logger, print_assistant_thoughts
 from autogpt.speech import say_text
 from autogpt.spinner import Spinner
@@ -55,7 +54,13 @@ class Agent:
         loop_count = 0
         command_name = None
         arguments = None
+        commands = []
         user_input = ""
+        response_schema = (
+            "llm_response_format_2"
+            if cfg.max_parallel_commands > 1
+            else "llm_response_format_1"
+        )
 
         while True:
             # Discontinue if continuous limit is reached
@@ -80,18 +85,18 @@ class Agent:
                     cfg.fast_token_limit,
                 )  # TODO: This hardcodes the model to use GPT3.5. Make this an argument
 
-            assistant_reply_json = fix_json_using_multiple_techniques(assistant_reply)
+            # Parse the reply once, everything below reads from it
+            reply = AssistantReply.parse(assistant_reply, response_schema)
+            commands = reply.commands
 
             # Print Assistant thoughts
-            if assistant_reply_json != {}:
-                validate_json(assistant_reply_json, 'llm_response_format_1')
-                # Get command name and arguments
+            if reply.json:
                 try:
-                    print_assistant_thoughts(self.ai_name, assistant_reply_json)
-                    command_name, arguments = get_command(assistant_reply_json)
-                    # command_name, arguments = assistant_reply_json_valid["command"]["name"], assistant_reply_json_valid["command"]["args"]
+                    print_assistant_thoughts(self.ai_name, reply.thoughts)
+                    command_name, arguments = commands[0]
                     if cfg.speak_mode:
-                        say_text(f"I want to execute {command_name}")
+                        names = ", ".join(reply.command_names)
+                        say_text(f"I want to execute {names}")
                 except Exception as e:
                     logger.error("Error: \n", str(e))
 
@@ -99,12 +104,8 @@ class Agent:
                 ### GET USER AUTHORIZATION TO EXECUTE COMMAND ###
                 # Get key press: Prompt the user to press enter to continue or escape
                 # to exit
-                logger.typewriter_log(
-                    "NEXT ACTION: ",
-                    Fore.CYAN,
-                    f"COMMAND = {Fore.CYAN}{command_name}{Style.RESET_ALL}  "
-                    f"ARGUMENTS = {Fore.CYAN}{arguments}{Style.RESET_ALL}",
-                )
+                log_next_actions(commands)
+                logger.flush()
                 print(
                     "Enter 'y' to authorise command, 'y -N' to run N continuous "
                     "commands, 'n' to exit program, or enter feedback for "
@@ -153,30 +154,20 @@ class Agent:
                     break
             else:
                 # Print command
-                logger.typewriter_log(
-                    "NEXT ACTION: ",
-                    Fore.CYAN,
-                    f"COMMAND = {Fore.CYAN}{command_name}{Style.RESET_ALL}"
-                    f"  ARGUMENTS = {Fore.CYAN}{arguments}{Style.RESET_ALL}",
-                )
+                log_next_actions(commands)
 
             # Execute command
-            if command_name is not None and command_name.lower().startswith("error"):
-                result = (
-                    f"Command {command_name} threw the following error: {arguments}"
-                )
-            elif command_name == "human_feedback":
+            if command_name == "human_feedback":
                 result = f"Human feedback: {user_input}"
+            elif not commands:
+                result = "Error: Could not find a command in the response"
             else:
-                result = (
-                    f"Command {command_name} returned: "
-                    f"{execute_command(command_name, arguments)}"
-                )
+                result = execute_commands(commands)
                 if self.next_action_count > 0:
                     self.next_action_count -= 1
 
             memory_to_add = (
-                f"Assistant Reply: {assistant_reply} "
+                f"Assistant Reply: {reply.raw} "
                 f"\nResult: {result} "
                 f"\nHuman Feedback: {user_input} "
             )
@@ -195,3 +186,18 @@ class Agent:
                 logger.typewriter_log(
                     "SYSTEM: ", Fore.YELLOW, "Unable to execute command"
                 )
+
+
+def log_next_actions(commands) -> None:
+    """Print the commands the AI wants to execute next
+
+    Args:
+        commands (list): The command name and arguments of every command
+    """
+    for command_name, arguments in commands:
+        logger.typewriter_log(
+            "NEXT ACTION: ",
+            Fore.CYAN,
+            f"COMMAND = {Fore.CYAN}{command_name}{Style.RESET_ALL}  "
+            f"ARGUMENTS = {Fore.CYAN}{arguments}{Style.RESET_ALL}",
+        )
@@ -0,0 +1,101 @@
+"""The reply of the AI, parsed once per step"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from autogpt.app import get_commands
+from autogpt.json_fixes.master_json_fix_method import fix_json_using_multiple_techniques
+from autogpt.json_validation.validate_json import validate_json
+
+
+@dataclass
+class Thoughts:
+    """The thoughts the AI shares along with its commands"""
+
+    text: Optional[str] = None
+    reasoning: Optional[str] = None
+    plan: Optional[str] = None
+    criticism: Optional[str] = None
+    speak: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, thoughts: Any) -> Thoughts:
+        """Read the thoughts from the "thoughts" object of a reply
+
+        Args:
+            thoughts (Any): The "thoughts" object
+
+        Returns:
+            Thoughts: The thoughts, with the plan as a string
+        """
+        if not isinstance(thoughts, dict):
+            return cls()
+        plan = thoughts.get("plan")
+        # If it's a list, join it into a string
+        if isinstance(plan, list):
+            plan = "\n".join(str(line) for line in plan)
+        elif isinstance(plan, dict):
+            plan = str(plan)
+        return cls(
+            text=thoughts.get("text"),
+            reasoning=thoughts.get("reasoning"),
+            plan=plan,
+            criticism=thoughts.get("criticism"),
+            speak=thoughts.get("speak"),
+        )
+
+    def plan_lines(self) -> List[str]:
+        """Get the steps of the plan, without their leading dashes
+
+        Returns:
+            List[str]: The steps of the plan
+        """
+        if not self.plan:
+            return []
+        return [line.lstrip("- ").strip() for line in self.plan.split("\n")]
+
+
+@dataclass
+class AssistantReply:
+    """A reply of the AI, parsed, validated and split into its parts
+
+    Attributes:
+        raw: The reply as the AI sent it.
+        json: The parsed reply, empty if it couldn't be parsed.
+        thoughts: The thoughts of the AI.
+        commands: The name and arguments of every command in the reply.
+    """
+
+    raw: str
+    json: Dict[str, Any] = field(default_factory=dict)
+    thoughts: Thoughts = field(default_factory=Thoughts)
+    commands: List[Tuple[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, raw: str, schema_name: str) -> AssistantReply:
+        """Parse a reply of the AI, fixing its JSON if needed
+
+        Args:
+            raw (str): The reply
+            schema_name (str): The name of the JSON schema to validate it with
+
+        Returns:
+            AssistantReply: The parsed reply
+        """
+        reply_json = fix_json_using_multiple_techniques(raw)
+        if not isinstance(reply_json, dict) or not reply_json:
+            return cls(raw)
+
+        validate_json(reply_json, schema_name)
+        return cls(
+            raw,
+            reply_json,
+            Thoughts.from_json(reply_json.get("thoughts")),
+            get_commands(reply_json),
+        )
+
+    @property
+    def command_names(self) -> List[str]:
+        """The names of the commands in the reply"""
+        return [name for name, _ in self.commands]
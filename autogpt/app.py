@@ -1,35 +1,29 @@
 """ Command and Control """
 import json
-from typing import List, NoReturn, Union, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, NoReturn, Tuple, Dict
 from autogpt.agent.agent_manager import AgentManager
-from autogpt.commands.evaluate_code import evaluate_code
-from autogpt.commands.google_search import google_official_search, google_search
-from autogpt.commands.improve_code import improve_code
-from autogpt.commands.write_tests import write_tests
+from autogpt.commands.command import COMMAND_REGISTRY, Command, command
 from autogpt.config import Config
-from autogpt.commands.image_gen import generate_image
-from autogpt.commands.audio_text import read_audio_from_file
-from autogpt.commands.web_requests import scrape_links, scrape_text
-from autogpt.commands.execute_code import (
-    execute_python_file,
-    execute_shell,
-    execute_shell_popen,
-)
-from autogpt.commands.file_operations import (
-    append_to_file,
-    delete_file,
-    read_file,
-    search_files,
-    write_to_file,
-    download_file
-)
 from autogpt.json_fixes.parsing import fix_and_parse_json
-from autogpt.memory import get_memory
-from autogpt.processing.text import summarize_text
+from autogpt.logs import logger
 from autogpt.speech import say_text
-from autogpt.commands.web_selenium import browse_website
-from autogpt.commands.git_operations import clone_repository
-from autogpt.commands.twitter import send_tweet
+
+# Importing the command modules registers their commands, in the order they
+# are listed in the prompt. The modules are imported here, at startup, but
+# import their heavy third party dependencies only when a command runs.
+import autogpt.commands.google_search  # noqa: F401
+import autogpt.commands.web_selenium  # noqa: F401
+import autogpt.commands.web_async  # noqa: F401
+import autogpt.commands.git_operations  # noqa: F401
+import autogpt.commands.file_operations  # noqa: F401
+import autogpt.commands.evaluate_code  # noqa: F401
+import autogpt.commands.improve_code  # noqa: F401
+import autogpt.commands.write_tests  # noqa: F401
+import autogpt.commands.execute_code  # noqa: F401
+import autogpt.commands.image_gen  # noqa: F401
+import autogpt.commands.twitter  # noqa: F401
+import autogpt.commands.audio_text  # noqa: F401
 
 
 CFG = Config()
@@ -93,162 +87,112 @@ def get_command(response_json: Dict):
         return "Error:", str(e)
 
 
-def map_command_synonyms(command_name: str):
-    """Takes the original command name given by the AI, and checks if the
-    string matches a list of common/known hallucinations
-    """
-    synonyms = [
-        ("write_file", "write_to_file"),
-        ("create_file", "write_to_file"),
-        ("search", "google"),
-    ]
-    for seen_command, actual_command_name in synonyms:
-        if command_name == seen_command:
-            return actual_command_name
-    return command_name
+def get_commands(response_json: Dict) -> List[Tuple[str, Any]]:
+    """Parse the response and return the names and arguments of its commands
 
-
-def execute_command(command_name: str, arguments):
-    """Execute the command and return the result
+    The response may hold a single "command" or a list of "commands".
 
     Args:
-        command_name (str): The name of the command to execute
-        arguments (dict): The arguments for the command
+        response_json (json): The response from the AI
 
     Returns:
-        str: The result of the command
+        list: The command name and arguments of every command
     """
-    try:
-        command_name = map_command_synonyms(command_name.lower())
-        if command_name == "google":
-            # Check if the Google API key is set and use the official search method
-            # If the API key is not set or has only whitespaces, use the unofficial
-            # search method
-            key = CFG.google_api_key
-            if key and key.strip() and key != "your-google-api-key":
-                google_result = google_official_search(arguments["input"])
-                return google_result
-            else:
-                google_result = google_search(arguments["input"])
-
-            # google_result can be a list or a string depending on the search results
-            if isinstance(google_result, list):
-                safe_message = [google_result_single.encode('utf-8', 'ignore') for google_result_single in google_result]
-            else:
-                safe_message = google_result.encode('utf-8', 'ignore')
-
-            return safe_message.decode('utf-8')
-        elif command_name == "memory_add":
-            memory = get_memory(CFG)
-            return memory.add(arguments["string"])
-        elif command_name == "start_agent":
-            return start_agent(
-                arguments["name"], arguments["task"], arguments["prompt"]
+    if not isinstance(response_json, dict) or "commands" not in response_json:
+        return [get_command(response_json)]
+
+    commands = response_json["commands"]
+    if not isinstance(commands, list) or not commands:
+        return [("Error:", "'commands' is not a list of command objects")]
+    if len(commands) > CFG.max_parallel_commands:
+        return [
+            (
+                "Error:",
+                f"Got {len(commands)} commands, respond with at most"
+                f" {CFG.max_parallel_commands} commands at once",
             )
-        elif command_name == "message_agent":
-            return message_agent(arguments["key"], arguments["message"])
-        elif command_name == "list_agents":
-            return list_agents()
-        elif command_name == "delete_agent":
-            return delete_agent(arguments["key"])
-        elif command_name == "get_text_summary":
-            return get_text_summary(arguments["url"], arguments["question"])
-        elif command_name == "get_hyperlinks":
-            return get_hyperlinks(arguments["url"])
-        elif command_name == "clone_repository":
-            return clone_repository(
-                arguments["repository_url"], arguments["clone_path"]
-            )
-        elif command_name == "read_file":
-            return read_file(arguments["file"])
-        elif command_name == "write_to_file":
-            return write_to_file(arguments["file"], arguments["text"])
-        elif command_name == "append_to_file":
-            return append_to_file(arguments["file"], arguments["text"])
-        elif command_name == "delete_file":
-            return delete_file(arguments["file"])
-        elif command_name == "search_files":
-            return search_files(arguments["directory"])
-        elif command_name == "download_file":
-            if not CFG.allow_downloads:
-                return "Error: You do not have user authorization to download files locally."
-            return download_file(arguments["url"], arguments["file"])
-        elif command_name == "browse_website":
-            return browse_website(arguments["url"], arguments["question"])
-        # TODO: Change these to take in a file rather than pasted code, if
-        # non-file is given, return instructions "Input should be a python
-        # filepath, write your code to file and try again"
-        elif command_name == "evaluate_code":
-            return evaluate_code(arguments["code"])
-        elif command_name == "improve_code":
-            return improve_code(arguments["suggestions"], arguments["code"])
-        elif command_name == "write_tests":
-            return write_tests(arguments["code"], arguments.get("focus"))
-        elif command_name == "execute_python_file":  # Add this command
-            return execute_python_file(arguments["file"])
-        elif command_name == "execute_shell":
-            if CFG.execute_local_commands:
-                return execute_shell(arguments["command_line"])
-            else:
-                return (
-                    "You are not allowed to run local shell commands. To execute"
-                    " shell commands, EXECUTE_LOCAL_COMMANDS must be set to 'True' "
-                    "in your config. Do not attempt to bypass the restriction."
-                )
-        elif command_name == "execute_shell_popen":
-            if CFG.execute_local_commands:
-                return execute_shell_popen(arguments["command_line"])
-            else:
-                return (
-                    "You are not allowed to run local shell commands. To execute"
-                    " shell commands, EXECUTE_LOCAL_COMMANDS must be set to 'True' "
-                    "in your config. Do not attempt to bypass the restriction."
-                )
-        elif command_name == "read_audio_from_file":
-            return read_audio_from_file(arguments["file"])
-        elif command_name == "generate_image":
-            return generate_image(arguments["prompt"])
-        elif command_name == "send_tweet":
-            return send_tweet(arguments["text"])
-        elif command_name == "do_nothing":
-            return "No action performed."
-        elif command_name == "task_complete":
-            shutdown()
-        else:
-            return (
-                f"Unknown command '{command_name}'. Please refer to the 'COMMANDS'"
-                " list for available commands and only respond in the specified JSON"
-                " format."
-            )
-    except Exception as e:
-        return f"Error: {str(e)}"
+        ]
+    return [get_command({"command": command}) for command in commands]
 
 
-def get_text_summary(url: str, question: str) -> str:
-    """Return the results of a Google search
+def execute_commands(commands: List[Tuple[str, Any]]) -> str:
+    """Execute commands concurrently and return all their results
 
     Args:
-        url (str): The url to scrape
-        question (str): The question to summarize the text for
+        commands (list): The command name and arguments of every command
 
     Returns:
-        str: The summary of the text
+        str: The results of the commands, one per line
     """
-    text = scrape_text(url)
-    summary = summarize_text(url, text, question)
-    return f""" "Result" : {summary}"""
+    # Shutting down has to wait until the other commands have finished
+    last = [
+        (command_name, arguments)
+        for command_name, arguments in commands
+        if _is_task_complete(command_name)
+    ]
+    concurrent = [command for command in commands if command not in last]
+
+    if len(concurrent) == 1:
+        results = [_execute_and_describe(*concurrent[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(len(concurrent), 1)) as executor:
+            results = list(
+                executor.map(
+                    lambda command: _execute_and_describe(*command), concurrent
+                )
+            )
+    for command_name, arguments in last:
+        results.append(_execute_and_describe(command_name, arguments))
+    return "\n".join(results)
+
+
+def _is_task_complete(command_name: str) -> bool:
+    command = COMMAND_REGISTRY.get(command_name)
+    return command is not None and command.name == "task_complete"
 
 
-def get_hyperlinks(url: str) -> Union[str, List[str]]:
-    """Return the results of a Google search
+def _execute_and_describe(command_name: str, arguments) -> str:
+    if command_name.lower().startswith("error"):
+        return f"Command {command_name} threw the following error: {arguments}"
+    result = execute_command(command_name, arguments)
+    return f"Command {command_name} returned: {result}"
+
+
+def execute_command(command_name: str, arguments):
+    """Execute the command and return the result
 
     Args:
-        url (str): The url to scrape
+        command_name (str): The name of the command to execute
+        arguments (dict): The arguments for the command
 
     Returns:
-        str or list: The hyperlinks on the page
+        str: The result of the command
     """
-    return scrape_links(url)
+    command = COMMAND_REGISTRY.get(command_name)
+    if command is None:
+        return (
+            f"Unknown command '{command_name}'. Please refer to the 'COMMANDS'"
+            " list for available commands and only respond in the specified JSON"
+            " format."
+        )
+    if not command.is_enabled(CFG):
+        return command.disabled_reason or f"Error: Command '{command.name}' is disabled"
+    if not isinstance(arguments, dict):
+        arguments = {}
+    try:
+        return COMMAND_REGISTRY.call(command, arguments)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def log_command_duration(
+    command: Command, arguments: dict, result: Any, duration: float
+) -> None:
+    """Log how long a command took, to find slow commands in debug mode"""
+    logger.debug(f"Command {command.name} took {duration:.3f}s")
+
+
+COMMAND_REGISTRY.add_hook(log_command_duration)
 
 
 def shutdown() -> NoReturn:
@@ -257,6 +201,11 @@ def shutdown() -> NoReturn:
     quit()
 
 
+@command(
+    "start_agent",
+    "Start GPT Agent",
+    {"name": "<name>", "task": "<short_task_desc>", "prompt": "<prompt>"},
+)
 def start_agent(name: str, task: str, prompt: str, model=CFG.fast_llm_model) -> str:
     """Start an agent with a given name, task, and prompt
 
@@ -289,6 +238,7 @@ def start_agent(name: str, task: str, prompt: str, model=CFG.fast_llm_model) ->
     return f"Agent {name} created with key {key}. First response: {agent_response}"
 
 
+@command("message_agent", "Message GPT Agent", {"key": "<key>", "message": "<message>"})
 def message_agent(key: str, message: str) -> str:
     """Message an agent with a given key and message"""
     # Check if the key is a valid integer
@@ -303,6 +253,7 @@ def message_agent(key: str, message: str) -> str:
     return agent_response
 
 
+@command("list_agents", "List GPT Agents")
 def list_agents():
     """List all agents
 
@@ -314,6 +265,7 @@ def list_agents():
     )
 
 
+@command("delete_agent", "Delete GPT Agent", {"key": "<key>"})
 def delete_agent(key: str) -> str:
     """Delete an agent with a given key
 
@@ -325,3 +277,23 @@ def delete_agent(key: str) -> str:
     """
     result = AGENT_MANAGER.delete_agent(key)
     return f"Agent {key} deleted." if result else f"Agent {key} does not exist."
+
+
+@command("do_nothing", "Do Nothing")
+def do_nothing() -> str:
+    """Do nothing
+
+    Returns:
+        str: A message saying no action was performed
+    """
+    return "No action performed."
+
+
+@command("task_complete", "Task Complete (Shutdown)", {"reason": "<reason>"})
+def task_complete(reason: str) -> NoReturn:
+    """Shut down the program once the AI has completed its task
+
+    Args:
+        reason (str): Why the task is complete
+    """
+    shutdown()
@@ -39,8 +39,13 @@ def generate_context(prompt, relevant_memory, full_message_history, model):
     # Add messages from the full message history until we reach the token limit
     next_message_to_add_index = len(full_message_history) - 1
     insertion_index = len(current_context)
-    # Count the currently used tokens
-    current_tokens_used = token_counter.count_message_tokens(current_context, model)
+    # Count the currently used tokens. The prompt is the same on every turn, so
+    # its count is cached. Both counts include the tokens priming the reply.
+    current_tokens_used = (
+        token_counter.count_static_message_tokens("system", prompt, model)
+        + token_counter.count_message_tokens(current_context[1:], model)
+        - token_counter.REPLY_PRIMING_TOKENS
+    )
     return (
         next_message_to_add_index,
         current_tokens_used,
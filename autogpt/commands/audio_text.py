@@ -1,12 +1,21 @@
 import requests
 import json
 
+from autogpt.commands.command import command
 from autogpt.config import Config
 from autogpt.workspace import path_in_workspace
 
 cfg = Config()
 
 
+@command(
+    "read_audio_from_file",
+    "Convert Audio to text",
+    {"audio_path": "<audio_path>"},
+    arg_aliases={"file": "audio_path"},
+    enabled=lambda config: bool(config.huggingface_audio_to_text_model),
+    disabled_reason="Error: No Hugging Face audio to text model is configured.",
+)
 def read_audio_from_file(audio_path):
     audio_path = path_in_workspace(audio_path)
     with open(audio_path, "rb") as audio_file:
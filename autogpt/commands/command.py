@@ -0,0 +1,214 @@
+"""Registry of the commands the AI can execute"""
+from __future__ import annotations
+
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from autogpt.config import Config
+
+# Called after every command with the command, its arguments, its result and
+# the number of seconds it took
+CommandHook = Callable[["Command", dict, Any, float], None]
+
+
+@dataclass
+class Command:
+    """A command the AI can execute
+
+    Attributes:
+        name: The name the AI uses for the command.
+        label: A short description of the command, shown in the prompt.
+        method: The function executing the command.
+        args: The arguments of the command and a description of their values.
+        enabled: Whether the command is enabled, or a function taking the
+            configuration and telling whether it is.
+        disabled_reason: The message returned when a disabled command is used.
+        aliases: Other names the AI is known to use for the command.
+        arg_aliases: Other names the AI is known to use for arguments, mapped
+            to the name of the argument.
+    """
+
+    name: str
+    label: str
+    method: Callable[..., Any]
+    args: dict[str, str] = field(default_factory=dict)
+    enabled: bool | Callable[[Config], bool] = True
+    disabled_reason: str | None = None
+    aliases: tuple[str, ...] = ()
+    arg_aliases: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        parameters = inspect.signature(self.method).parameters.values()
+        self._accepts_any = any(p.kind == p.VAR_KEYWORD for p in parameters)
+        self._parameters = {p.name for p in parameters}
+        self._required = [
+            p.name
+            for p in parameters
+            if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+        ]
+
+    def is_enabled(self, config: Config) -> bool:
+        """Check whether the command is enabled
+
+        Args:
+            config (Config): The configuration
+
+        Returns:
+            bool: True if the command is enabled, False otherwise
+        """
+        if callable(self.enabled):
+            return self.enabled(config)
+        return self.enabled
+
+    def __call__(self, **arguments) -> Any:
+        arguments = {self.arg_aliases.get(k, k): v for k, v in arguments.items()}
+        if not self._accepts_any:
+            unknown = [k for k in arguments if k not in self._parameters]
+            missing = [name for name in self._required if name not in arguments]
+            if missing:
+                raise TypeError(self._describe_bad_arguments(missing, unknown))
+            # Leave out arguments the AI made up, rather than failing on them
+            arguments = {k: v for k, v in arguments.items() if k in self._parameters}
+        return self.method(**arguments)
+
+    def _describe_bad_arguments(self, missing: list[str], unknown: list[str]) -> str:
+        message = f"Command '{self.name}' is missing the arguments {missing}"
+        if unknown:
+            message += f", and got unknown arguments {unknown}"
+        return f"{message}. Its arguments are {list(self.args)}"
+
+
+class CommandRegistry:
+    """The commands the AI can execute, by name"""
+
+    def __init__(self) -> None:
+        self.commands: dict[str, Command] = {}
+        self.aliases: dict[str, str] = {}
+        self.hooks: list[CommandHook] = []
+        # Incremented whenever the registered commands change
+        self.version = 0
+
+    def register(self, command: Command) -> None:
+        """Register a command, replacing any command with the same name
+
+        Args:
+            command (Command): The command
+        """
+        self.commands[command.name] = command
+        for alias in command.aliases:
+            self.aliases[alias] = command.name
+        self.version += 1
+
+    def unregister(self, name: str) -> None:
+        """Unregister a command
+
+        Args:
+            name (str): The name of the command
+        """
+        command = self.commands.pop(name)
+        for alias in command.aliases:
+            self.aliases.pop(alias, None)
+        self.version += 1
+
+    def get(self, name: str) -> Command | None:
+        """Get a command by its name or one of its aliases
+
+        Args:
+            name (str): The name the AI used
+
+        Returns:
+            Command | None: The command, or None if there is no such command
+        """
+        name = name.lower()
+        return self.commands.get(self.aliases.get(name, name))
+
+    def enabled_commands(self, config: Config) -> list[Command]:
+        """Get the enabled commands, in the order they were registered
+
+        Args:
+            config (Config): The configuration
+
+        Returns:
+            list[Command]: The enabled commands
+        """
+        return [
+            command for command in self.commands.values() if command.is_enabled(config)
+        ]
+
+    def add_hook(self, hook: CommandHook) -> None:
+        """Add a function to call after every command, e.g. to time commands
+
+        Args:
+            hook (CommandHook): The function
+        """
+        self.hooks.append(hook)
+
+    def call(self, command: Command, arguments: dict) -> Any:
+        """Execute a command and call the hooks
+
+        Args:
+            command (Command): The command
+            arguments (dict): The arguments the AI gave
+
+        Returns:
+            Any: The result of the command
+        """
+        start = time.perf_counter()
+        result = command(**arguments)
+        duration = time.perf_counter() - start
+        for hook in self.hooks:
+            hook(command, arguments, result, duration)
+        return result
+
+
+COMMAND_REGISTRY = CommandRegistry()
+
+
+def command(
+    name: str,
+    label: str,
+    args: dict[str, str] | None = None,
+    enabled: bool | Callable[[Config], bool] = True,
+    disabled_reason: str | None = None,
+    aliases: tuple[str, ...] = (),
+    arg_aliases: dict[str, str] | None = None,
+    registry: CommandRegistry = COMMAND_REGISTRY,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register the decorated function as a command
+
+    Args:
+        name (str): The name the AI uses for the command
+        label (str): A short description of the command, shown in the prompt
+        args (dict[str, str], optional): The arguments of the command and a
+            description of their values
+        enabled (bool | Callable[[Config], bool]): Whether the command is enabled,
+            or a function taking the configuration and telling whether it is
+        disabled_reason (str, optional): The message returned when the command is
+            used while disabled
+        aliases (tuple[str, ...]): Other names the AI is known to use
+        arg_aliases (dict[str, str], optional): Other names the AI is known to use
+            for arguments, mapped to the name of the argument
+        registry (CommandRegistry): The registry to register the command in
+
+    Returns:
+        Callable: The decorator, which returns the function unchanged
+    """
+
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        registry.register(
+            Command(
+                name,
+                label,
+                method,
+                args or {},
+                enabled,
+                disabled_reason,
+                aliases,
+                arg_aliases or {},
+            )
+        )
+        return method
+
+    return decorator
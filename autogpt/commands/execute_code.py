@@ -1,15 +1,70 @@
-"""Execute code in a Docker container"""
+"""Execute code in a sandbox or in the shell"""
+from __future__ import annotations
+
+import atexit
 import os
 import subprocess
+from typing import TYPE_CHECKING
+
+from autogpt.commands.command import command
+from autogpt.commands.file_operations import tail_file
+from autogpt.config import Config
+from autogpt.process_manager import ProcessManager, TooManyJobs
+from autogpt.processing.output import (
+    BYTES_PER_TOKEN,
+    capture_process,
+    truncate_to_tokens,
+)
+from autogpt.workspace import path_in_workspace, WORKSPACE_PATH
 
-import docker
-from docker.errors import ImageNotFound
+if TYPE_CHECKING:
+    from autogpt.sandbox import Sandbox
 
-from autogpt.workspace import path_in_workspace, WORKSPACE_PATH
+CFG = Config()
+_sandbox = None
+
+process_manager = ProcessManager(WORKSPACE_PATH / "jobs", CFG.max_background_jobs)
+atexit.register(process_manager.kill_all)
+
+
+def get_sandbox() -> Sandbox:
+    """Get the sandbox Python files are executed in, creating it on first use
+
+    Returns:
+        Sandbox: The sandbox
+    """
+    global _sandbox
+    if _sandbox is None:
+        # Imported here so the Docker client is only loaded when code is run
+        from autogpt.sandbox import create_sandbox
+
+        _sandbox = create_sandbox(CFG, local=we_are_running_in_a_docker_container())
+        atexit.register(_sandbox.close)
+    return _sandbox
+
+
+def shell_commands_enabled(config: Config) -> bool:
+    """Check whether the AI is allowed to run shell commands
+
+    Args:
+        config (Config): The configuration
 
+    Returns:
+        bool: True if local commands may be executed, False otherwise
+    """
+    return config.execute_local_commands
+
+
+SHELL_COMMANDS_DISABLED = (
+    "You are not allowed to run local shell commands. To execute"
+    " shell commands, EXECUTE_LOCAL_COMMANDS must be set to 'True' "
+    "in your config. Do not attempt to bypass the restriction."
+)
 
+
+@command("execute_python_file", "Execute Python File", {"file": "<file>"})
 def execute_python_file(file: str) -> str:
-    """Execute a Python file in a Docker container and return the output
+    """Execute a Python file in a sandbox and return the output
 
     Args:
         file (str): The name of the file to execute
@@ -28,120 +83,171 @@ def execute_python_file(file: str) -> str:
     if not os.path.isfile(file_path):
         return f"Error: File '{file}' does not exist."
 
-    if we_are_running_in_a_docker_container():
-        result = subprocess.run(
-            f"python {file_path}", capture_output=True, encoding="utf8", shell=True
-        )
-        if result.returncode == 0:
-            return result.stdout
-        else:
-            return f"Error: {result.stderr}"
-
     try:
-        client = docker.from_env()
-
-        # You can replace this with the desired Python image/version
-        # You can find available Python images on Docker Hub:
-        # https://hub.docker.com/_/python
-        image_name = "python:3-alpine"
-        try:
-            client.images.get(image_name)
-            print(f"Image '{image_name}' found locally")
-        except ImageNotFound:
-            print(f"Image '{image_name}' not found locally, pulling from Docker Hub")
-            # Use the low-level API to stream the pull response
-            low_level_client = docker.APIClient()
-            for line in low_level_client.pull(image_name, stream=True, decode=True):
-                # Print the status and progress, if available
-                status = line.get("status")
-                progress = line.get("progress")
-                if status and progress:
-                    print(f"{status}: {progress}")
-                elif status:
-                    print(status)
-
-        container = client.containers.run(
-            image_name,
-            f"python {file}",
-            volumes={
-                os.path.abspath(WORKSPACE_PATH): {
-                    "bind": "/workspace",
-                    "mode": "ro",
-                }
-            },
-            working_dir="/workspace",
-            stderr=True,
-            stdout=True,
-            detach=True,
-        )
-
-        container.wait()
-        logs = container.logs().decode("utf-8")
-        container.remove()
-
-        # print(f"Execution complete. Output: {output}")
-        # print(f"Logs: {logs}")
-
-        return logs
-
+        exit_code, output = get_sandbox().run(file)
     except Exception as e:
         return f"Error: {str(e)}"
 
+    output = truncate_to_tokens(
+        output, CFG.execute_output_max_tokens, CFG.fast_llm_model
+    )
+    if exit_code != 0:
+        return f"Error: {output}"
+    return output
 
+
+@command(
+    "execute_shell",
+    "Execute Shell Command, non-interactive commands only",
+    {"command_line": "<command_line>"},
+    enabled=shell_commands_enabled,
+    disabled_reason=SHELL_COMMANDS_DISABLED,
+)
 def execute_shell(command_line: str) -> str:
     """Execute a shell command and return the output
 
+    The output is read as it is written, keeping only its start and its end.
+    The command is killed if it runs for too long or writes too much.
+
     Args:
         command_line (str): The command line to execute
 
     Returns:
         str: The output of the command
     """
-    current_dir = os.getcwd()
-    # Change dir into workspace if necessary
-    if str(WORKSPACE_PATH) not in current_dir:
-        os.chdir(WORKSPACE_PATH)
+    print(f"Executing command '{command_line}' in working directory '{WORKSPACE_PATH}'")
 
-    print(f"Executing command '{command_line}' in working directory '{os.getcwd()}'")
+    process = subprocess.Popen(
+        command_line,
+        shell=True,
+        cwd=WORKSPACE_PATH,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    captured = capture_process(
+        process,
+        CFG.execute_shell_timeout,
+        CFG.execute_output_max_bytes,
+        CFG.execute_output_max_tokens * BYTES_PER_TOKEN,
+    )
 
-    result = subprocess.run(command_line, capture_output=True, shell=True)
-    output = f"STDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}"
+    # Share the budget between both streams
+    max_tokens = CFG.execute_output_max_tokens // 2
+    stdout = truncate_to_tokens(
+        captured.stdout.decode(), max_tokens, CFG.fast_llm_model
+    )
+    stderr = truncate_to_tokens(
+        captured.stderr.decode(), max_tokens, CFG.fast_llm_model
+    )
+    output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
+    if captured.killed_reason:
+        output += f"\n{captured.killed_reason}"
+    return output
 
-    # Change back to whatever the prior working dir was
 
-    os.chdir(current_dir)
+@command(
+    "execute_shell_popen",
+    "Execute Shell Command Popen, non-interactive commands only",
+    {"command_line": "<command_line>"},
+    enabled=shell_commands_enabled,
+    disabled_reason=SHELL_COMMANDS_DISABLED,
+)
+def execute_shell_popen(command_line: str) -> str:
+    """Execute a shell command in the background and return the ID of its job
 
-    return output
+    Args:
+        command_line (str): The command line to execute
+
+    Returns:
+        str: Description of the fact that the process started and its job ID
+    """
+    print(f"Executing command '{command_line}' in working directory '{WORKSPACE_PATH}'")
+
+    try:
+        job = process_manager.start(command_line, WORKSPACE_PATH)
+    except TooManyJobs as e:
+        return f"Error: {str(e)}"
+
+    return (
+        f"Subprocess started as job {job.id} with PID:'{job.process.pid}'. Use"
+        " job_status, job_output and job_kill with its job ID to follow it."
+    )
 
 
-def execute_shell_popen(command_line) -> str:
-    """Execute a shell command with Popen and returns an english description
-    of the event and the process id
+@command(
+    "job_status",
+    "Get Background Job Status",
+    {"job_id": "<job_id>"},
+    enabled=shell_commands_enabled,
+    disabled_reason=SHELL_COMMANDS_DISABLED,
+)
+def job_status(job_id: str) -> str:
+    """Get the status of a background job
 
     Args:
-        command_line (str): The command line to execute
+        job_id (str): The ID of the job
 
     Returns:
-        str: Description of the fact that the process started and its id
+        str: Whether the job is running, and its exit code if it isn't
     """
-    current_dir = os.getcwd()
+    try:
+        return process_manager.get(job_id).describe()
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
 
-    if WORKING_DIRECTORY not in current_dir:  # Change dir into workspace if necessary
-        work_dir = os.path.join(os.getcwd(), WORKING_DIRECTORY)
-        os.chdir(work_dir)
 
-    print(f"Executing command '{command_line}' in working directory '{os.getcwd()}'")
+@command(
+    "job_output",
+    "Get Background Job Output",
+    {"job_id": "<job_id>", "num_lines": "<num_lines>"},
+    enabled=shell_commands_enabled,
+    disabled_reason=SHELL_COMMANDS_DISABLED,
+)
+def job_output(job_id: str, num_lines: int = 20) -> str:
+    """Get the last lines of output of a background job
 
-    do_not_show_output = subprocess.DEVNULL
-    process = subprocess.Popen(
-        command_line, shell=True, stdout=do_not_show_output, stderr=do_not_show_output
+    Args:
+        job_id (str): The ID of the job
+        num_lines (int): The number of lines to get
+
+    Returns:
+        str: The status and the last lines of output of the job
+    """
+    try:
+        job = process_manager.get(job_id)
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
+
+    if not job.log_path.exists():
+        return f"{job.describe()}\nNo output yet."
+    output = tail_file(job.log_path.relative_to(WORKSPACE_PATH), int(num_lines))
+    output = truncate_to_tokens(
+        output, CFG.execute_output_max_tokens, CFG.fast_llm_model
     )
+    return f"{job.describe()}\nLast lines of output:\n{output}"
+
 
-    # Change back to whatever the prior working dir was
+@command(
+    "job_kill",
+    "Kill Background Job",
+    {"job_id": "<job_id>"},
+    enabled=shell_commands_enabled,
+    disabled_reason=SHELL_COMMANDS_DISABLED,
+)
+def job_kill(job_id: str) -> str:
+    """Kill a background job
 
-    os.chdir(current_dir)
+    Args:
+        job_id (str): The ID of the job
 
-    return f"Subprocess started with PID:'{str(process.pid)}'"
+    Returns:
+        str: The status of the killed job
+    """
+    try:
+        return process_manager.kill(job_id).describe()
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
 
 
 def we_are_running_in_a_docker_container() -> bool:
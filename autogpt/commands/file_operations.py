@@ -1,21 +1,31 @@
 """File operations for AutoGPT"""
 from __future__ import annotations
 
+import mmap
 import os
 import os.path
+import re
+from itertools import islice
 from pathlib import Path
 from typing import Generator, List
 import requests
 from requests.adapters import HTTPAdapter
 from requests.adapters import Retry
 from colorama import Fore, Back
+from autogpt.commands.command import command
+from autogpt.config import Config
 from autogpt.spinner import Spinner
 from autogpt.utils import readable_file_size
 from autogpt.workspace import path_in_workspace, WORKSPACE_PATH
+from autogpt.workspace_index import DEFAULT_SEARCH_LIMIT, WORKSPACE_INDEX
 
+CFG = Config()
 
 LOG_FILE = "file_logger.txt"
 LOG_FILE_PATH = WORKSPACE_PATH / LOG_FILE
+READ_BLOCK_SIZE = 64 * 1024
+# The number of chunks ingest_file adds to the memory at once
+INGEST_BATCH_SIZE = 100
 
 
 def check_duplicate_operation(operation: str, filename: str) -> bool:
@@ -82,58 +92,289 @@ def split_file(
         start += max_length - overlap
 
 
-def read_file(filename: str) -> str:
+def read_file_chunks(
+    filename: str, max_length: int = 4000, overlap: int = 0
+) -> Generator[str, None, None]:
+    """
+    Stream a file as chunks of text, reading no more than one chunk ahead so that
+    memory use is bounded by the chunk size rather than the file size.
+
+    The chunks are the same as the ones split_file would produce for the whole
+    file content, except that trailing chunks whose text is already part of the
+    previous chunk are skipped and that a file shorter than the overlap still
+    yields one chunk.
+
+    :param filename: The name of the file to read
+    :param max_length: The maximum length of each chunk
+    :param overlap: The number of overlapping characters between chunks
+    :return: A generator yielding chunks of text
+    """
+    filepath = path_in_workspace(filename)
+    window = max_length + overlap
+    step = max_length - overlap
+    with open(filepath, "r", encoding="utf-8") as f:
+        buffer = ""
+        first = True
+        while True:
+            while len(buffer) <= window:
+                data = f.read(max(window + 1 - len(buffer), READ_BLOCK_SIZE))
+                if not data:
+                    break
+                buffer += data
+
+            if len(buffer) > window:
+                yield buffer[: window - 1]
+                buffer = buffer[step:]
+                first = False
+                continue
+
+            if buffer and (first or len(buffer) > overlap):
+                yield buffer
+            return
+
+
+def read_file(filename: str, max_length: int | None = None) -> str:
     """Read a file and return the contents
 
     Args:
         filename (str): The name of the file to read
+        max_length (int, optional): The maximum number of characters to return.
+            Longer files are truncated with a note on how to read the rest.
+
+    Returns:
+        str: The contents of the file
+    """
+    try:
+        filepath = path_in_workspace(filename)
+        with open(filepath, "r", encoding="utf-8") as f:
+            if max_length is None:
+                return f.read()
+            content = f.read(max_length)
+            if not f.read(1):
+                return content
+        return (
+            f"{content}\n\n[Truncated after {max_length} characters, the file is"
+            f" {readable_file_size(os.path.getsize(filepath))}. Use start_line and"
+            " end_line to read other parts of the file.]"
+        )
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+# Earlier prompts named the file argument "file"
+FILE_ARG_ALIASES = {"file": "filename"}
+
+
+@command(
+    "read_file",
+    "Read file",
+    {
+        "filename": "<filename>",
+        "start_line": "<optional_start_line>",
+        "end_line": "<optional_end_line>",
+    },
+    arg_aliases=FILE_ARG_ALIASES,
+)
+def read_file_command(
+    filename: str, start_line: int | None = None, end_line: int | None = None
+) -> str:
+    """Read a file for the AI, either a range of its lines or as much of it as
+    the read_file_max_length setting allows
+
+    Args:
+        filename (str): The name of the file to read
+        start_line (int, optional): The first line to read, counting from 1
+        end_line (int, optional): The last line to read
 
     Returns:
         str: The contents of the file
     """
+    if start_line or end_line:
+        return read_file_lines(filename, start_line or 1, end_line or None)
+    return read_file(filename, CFG.read_file_max_length)
+
+
+def read_file_lines(
+    filename: str, start_line: int = 1, end_line: int | None = None
+) -> str:
+    """Read a range of lines from a file without loading the rest of it
+
+    Args:
+        filename (str): The name of the file to read
+        start_line (int): The first line to read, counting from 1
+        end_line (int, optional): The last line to read, inclusive.
+            Defaults to the end of the file.
+
+    Returns:
+        str: The requested lines
+    """
     try:
+        start_line = max(int(start_line), 1)
+        stop = None if end_line is None else max(int(end_line), start_line - 1)
         filepath = path_in_workspace(filename)
         with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-        return content
+            return "".join(islice(f, start_line - 1, stop))
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def read_file_bytes(filename: str, start: int = 0, length: int | None = None) -> str:
+    """Read a byte range from a file
+
+    Args:
+        filename (str): The name of the file to read
+        start (int): The offset of the first byte to read.
+            Negative values count from the end of the file.
+        length (int, optional): The number of bytes to read.
+            Defaults to the end of the file.
+
+    Returns:
+        str: The bytes decoded as UTF-8, with undecodable bytes replaced
+    """
+    try:
+        filepath = path_in_workspace(filename)
+        with open(filepath, "rb") as f:
+            f.seek(int(start), os.SEEK_SET if int(start) >= 0 else os.SEEK_END)
+            data = f.read() if length is None else f.read(int(length))
+        return data.decode("utf-8", errors="replace")
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def head_file(filename: str, num_lines: int = 10) -> str:
+    """Read the first lines of a file
+
+    Args:
+        filename (str): The name of the file to read
+        num_lines (int): The number of lines to read
+
+    Returns:
+        str: The first lines of the file
+    """
+    return read_file_lines(filename, 1, num_lines)
+
+
+def tail_file(filename: str, num_lines: int = 10) -> str:
+    """Read the last lines of a file by scanning backwards from its end
+
+    Args:
+        filename (str): The name of the file to read
+        num_lines (int): The number of lines to read
+
+    Returns:
+        str: The last lines of the file
+    """
+    try:
+        filepath = path_in_workspace(filename)
+        with open(filepath, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b""
+            # A trailing newline terminates the last line, it doesn't start a new one
+            while position > 0 and data.count(b"\n", 0, len(data) - 1) < num_lines:
+                block = min(READ_BLOCK_SIZE, position)
+                position -= block
+                f.seek(position)
+                data = f.read(block) + data
+        lines = data.splitlines(keepends=True)
+        return b"".join(lines[-num_lines:]).decode("utf-8", errors="replace")
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+@command(
+    "search_in_file",
+    "Search in file",
+    {"filename": "<filename>", "pattern": "<regex>"},
+    arg_aliases=FILE_ARG_ALIASES,
+)
+def search_in_file(filename: str, pattern: str, max_results: int = 20) -> list[str]:
+    """Search a file for a regular expression without reading it into memory
+
+    The file is memory-mapped, so only the pages around the matches are loaded.
+
+    Args:
+        filename (str): The name of the file to search
+        pattern (str): The regular expression to search for
+        max_results (int): The maximum number of matching lines to return
+
+    Returns:
+        list[str]: The matching lines, prefixed with their line number
+    """
+    try:
+        filepath = path_in_workspace(filename)
+        regex = re.compile(pattern.encode("utf-8"))
+        results = []
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return results
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                line_number = 1
+                counted_up_to = 0
+                position = 0
+                while len(results) < max_results:
+                    match = regex.search(mm, position)
+                    if match is None:
+                        break
+                    line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                    line_end = mm.find(b"\n", match.start())
+                    if line_end == -1:
+                        line_end = len(mm)
+                    line_number += mm[counted_up_to:line_start].count(b"\n")
+                    counted_up_to = line_start
+                    line = mm[line_start:line_end].decode("utf-8", errors="replace")
+                    results.append(f"{line_number}: {line}")
+                    # Report every line only once
+                    position = line_end + 1
+        return results
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
 def ingest_file(
     filename: str, memory, max_length: int = 4000, overlap: int = 200
 ) -> None:
     """
-    Ingest a file by reading its content, splitting it into chunks with a specified
-    maximum length and overlap, and adding the chunks to the memory storage.
+    Ingest a file by streaming its content in chunks with a specified maximum
+    length and overlap, and adding the chunks to the memory storage.
 
     :param filename: The name of the file to ingest
-    :param memory: An object with an add() method to store the chunks in memory
+    :param memory: An object with an add_many() method to store the chunks in memory
     :param max_length: The maximum length of each chunk, default is 4000
     :param overlap: The number of overlapping characters between chunks, default is 200
     """
     try:
         print(f"Working with file {filename}")
-        content = read_file(filename)
-        content_length = len(content)
-        print(f"File length: {content_length} characters")
-
-        chunks = list(split_file(content, max_length=max_length, overlap=overlap))
-
-        num_chunks = len(chunks)
-        for i, chunk in enumerate(chunks):
-            print(f"Ingesting chunk {i + 1} / {num_chunks} into memory")
-            memory_to_add = (
-                f"Filename: {filename}\n" f"Content part#{i + 1}/{num_chunks}: {chunk}"
+        file_size = os.path.getsize(path_in_workspace(filename))
+        print(f"File size: {readable_file_size(file_size)}")
+
+        num_chunks = 0
+        batch = []
+        for chunk in read_file_chunks(filename, max_length=max_length, overlap=overlap):
+            num_chunks += 1
+            batch.append(
+                f"Filename: {filename}\n" f"Content part#{num_chunks}: {chunk}"
             )
-
-            memory.add(memory_to_add)
+            # Memories embed and store a batch of chunks at once
+            if len(batch) == INGEST_BATCH_SIZE:
+                print(f"Ingesting chunks {num_chunks - len(batch) + 1}-{num_chunks}")
+                memory.add_many(batch)
+                batch = []
+        if batch:
+            print(f"Ingesting chunks {num_chunks - len(batch) + 1}-{num_chunks}")
+            memory.add_many(batch)
 
         print(f"Done ingesting {num_chunks} chunks from {filename}.")
     except Exception as e:
         print(f"Error while ingesting file '{filename}': {str(e)}")
 
 
+@command(
+    "write_to_file",
+    "Write to file",
+    {"filename": "<filename>", "text": "<text>"},
+    aliases=("write_file", "create_file"),
+    arg_aliases=FILE_ARG_ALIASES,
+)
 def write_to_file(filename: str, text: str) -> str:
     """Write text to a file
 
@@ -153,12 +394,19 @@ def write_to_file(filename: str, text: str) -> str:
             os.makedirs(directory)
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(text)
+        WORKSPACE_INDEX.add(filepath)
         log_operation("write", filename)
         return "File written to successfully."
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+@command(
+    "append_to_file",
+    "Append to file",
+    {"filename": "<filename>", "text": "<text>"},
+    arg_aliases=FILE_ARG_ALIASES,
+)
 def append_to_file(filename: str, text: str, shouldLog: bool = True) -> str:
     """Append text to a file
 
@@ -173,6 +421,7 @@ def append_to_file(filename: str, text: str, shouldLog: bool = True) -> str:
         filepath = path_in_workspace(filename)
         with open(filepath, "a") as f:
             f.write(text)
+        WORKSPACE_INDEX.add(filepath)
 
         if shouldLog:
             log_operation("append", filename)
@@ -182,6 +431,12 @@ def append_to_file(filename: str, text: str, shouldLog: bool = True) -> str:
         return f"Error: {str(e)}"
 
 
+@command(
+    "delete_file",
+    "Delete file",
+    {"filename": "<filename>"},
+    arg_aliases=FILE_ARG_ALIASES,
+)
 def delete_file(filename: str) -> str:
     """Delete a file
 
@@ -196,38 +451,69 @@ def delete_file(filename: str) -> str:
     try:
         filepath = path_in_workspace(filename)
         os.remove(filepath)
+        WORKSPACE_INDEX.remove(filepath)
         log_operation("delete", filename)
         return "File deleted successfully."
     except Exception as e:
         return f"Error: {str(e)}"
 
 
-def search_files(directory: str) -> list[str]:
+@command(
+    "search_files",
+    "Search Files",
+    {"directory": "<directory>", "pattern": "<optional_glob_pattern>"},
+)
+def search_files(
+    directory: str,
+    pattern: str | None = None,
+    offset: int = 0,
+    limit: int | None = DEFAULT_SEARCH_LIMIT,
+) -> list[str]:
     """Search for files in a directory
 
     Args:
         directory (str): The directory to search in
+        pattern (str, optional): A glob pattern the file names must match
+        offset (int): The number of matching files to skip, for paging
+        limit (int, optional): The maximum number of files to return,
+            None for no limit
 
     Returns:
-        list[str]: A list of files found in the directory
+        list[str]: A list of files found in the directory. If there are more
+            matches than the limit, the last item tells how to get the next page.
     """
-    found_files = []
-
     if directory in {"", "/"}:
-        search_directory = WORKSPACE_PATH
+        relative_directory = ""
     else:
-        search_directory = path_in_workspace(directory)
-
-    for root, _, files in os.walk(search_directory):
-        for file in files:
-            if file.startswith("."):
-                continue
-            relative_path = os.path.relpath(os.path.join(root, file), WORKSPACE_PATH)
-            found_files.append(relative_path)
+        relative_directory = os.path.relpath(
+            path_in_workspace(directory), WORKSPACE_PATH
+        )
+
+    offset = int(offset)
+    limit = None if limit is None else int(limit)
+    found_files, total = WORKSPACE_INDEX.search(
+        relative_directory, pattern, offset=offset, limit=limit
+    )
+
+    remaining = total - offset - len(found_files)
+    if remaining > 0:
+        found_files.append(
+            f"... {remaining} more files not shown, search again with offset"
+            f" {offset + len(found_files)} or a more specific pattern"
+        )
 
     return found_files
 
 
+@command(
+    "download_file",
+    "Downloads a file from the internet, and stores it locally",
+    {"url": "<file_url>", "filename": "<saved_filename>"},
+    enabled=lambda config: config.allow_downloads,
+    disabled_reason="Error: You do not have user authorization to download files"
+    " locally.",
+    arg_aliases=FILE_ARG_ALIASES,
+)
 def download_file(url, filename):
     """Downloads a file
     Args:
@@ -261,6 +547,8 @@ def download_file(url, filename):
                         progress = f"{readable_file_size(downloaded_size)} / {readable_file_size(total_size)}"
                         spinner.update_message(f"{message} {progress}")
 
+            WORKSPACE_INDEX.add(safe_filename)
+
             return f'Successfully downloaded and locally stored file: "{filename}"! (Size: {readable_file_size(total_size)})'
     except requests.HTTPError as e:
         return f"Got an HTTP Error whilst trying to download file: {e}"
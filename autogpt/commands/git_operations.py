@@ -1,11 +1,17 @@
 """Git operations for autogpt"""
-import git
+from autogpt.commands.command import command
 from autogpt.config import Config
 from autogpt.workspace import path_in_workspace
 
 CFG = Config()
 
 
+@command(
+    "clone_repository",
+    "Clone Repository",
+    {"repo_url": "<url>", "clone_path": "<directory>"},
+    arg_aliases={"repository_url": "repo_url"},
+)
 def clone_repository(repo_url: str, clone_path: str) -> str:
     """Clone a GitHub repository locally
 
@@ -19,6 +25,8 @@ def clone_repository(repo_url: str, clone_path: str) -> str:
     auth_repo_url = f"//{CFG.github_username}:{CFG.github_api_key}@".join(split_url)
     safe_clone_path = path_in_workspace(clone_path)
     try:
+        import git
+
         git.Repo.clone_from(auth_repo_url, safe_clone_path)
         return f"""Cloned {repo_url} to {safe_clone_path}"""
     except Exception as e:
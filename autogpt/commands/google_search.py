@@ -3,8 +3,7 @@ from __future__ import annotations
 
 import json
 
-from duckduckgo_search import ddg
-
+from autogpt.commands.command import command
 from autogpt.config import Config
 
 CFG = Config()
@@ -24,6 +23,8 @@ def google_search(query: str, num_results: int = 8) -> str:
     if not query:
         return json.dumps(search_results)
 
+    from duckduckgo_search import ddg
+
     results = ddg(query, max_results=num_results)
     if not results:
         return json.dumps(search_results)
@@ -85,3 +86,30 @@ def google_official_search(query: str, num_results: int = 8) -> str | list[str]:
 
     # Return the list of search result URLs
     return search_results_links
+
+
+@command("google", "Google Search", {"input": "<search>"}, aliases=("search",))
+def google(input: str) -> str:
+    """Search Google, with the official API if a Google API key is set
+
+    Args:
+        input (str): The search query
+
+    Returns:
+        str: The results of the search
+    """
+    key = CFG.google_api_key
+    if key and key.strip() and key != "your-google-api-key":
+        return google_official_search(input)
+
+    google_result = google_search(input)
+    # google_result can be a list or a string depending on the search results
+    if isinstance(google_result, list):
+        safe_message = [
+            google_result_single.encode("utf-8", "ignore")
+            for google_result_single in google_result
+        ]
+    else:
+        safe_message = google_result.encode("utf-8", "ignore")
+
+    return safe_message.decode("utf-8")
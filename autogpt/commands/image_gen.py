@@ -6,13 +6,14 @@ from base64 import b64decode
 
 import openai
 import requests
-from PIL import Image
+from autogpt.commands.command import command
 from autogpt.config import Config
 from autogpt.workspace import path_in_workspace
 
 CFG = Config()
 
 
+@command("generate_image", "Generate Image", {"prompt": "<prompt>"})
 def generate_image(prompt: str) -> str:
     """Generate an image from a prompt.
 
@@ -60,6 +61,8 @@ def generate_image_with_hf(prompt: str, filename: str) -> str:
         },
     )
 
+    from PIL import Image
+
     image = Image.open(io.BytesIO(response.content))
     print(f"Image Generated for prompt:{prompt}")
 
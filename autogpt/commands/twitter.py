@@ -1,11 +1,20 @@
-import tweepy
 import os
 from dotenv import load_dotenv
 
+from autogpt.commands.command import command
+
 load_dotenv()
 
 
+@command(
+    "send_tweet",
+    "Send Tweet",
+    {"tweet_text": "<tweet_text>"},
+    arg_aliases={"text": "tweet_text"},
+)
 def send_tweet(tweet_text):
+    import tweepy
+
     consumer_key = os.environ.get("TW_CONSUMER_KEY")
     consumer_secret = os.environ.get("TW_CONSUMER_SECRET")
     access_token = os.environ.get("TW_ACCESS_TOKEN")
@@ -0,0 +1,169 @@
+"""Fetch and summarize several webpages concurrently"""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+import autogpt.processing.text as summary
+from autogpt.commands.command import command
+from autogpt.commands.web_requests import (
+    http_cache,
+    parse_page,
+    validate_url,
+)
+from autogpt.config import Config
+from autogpt.processing.html import format_hyperlinks
+
+if TYPE_CHECKING:
+    import aiohttp
+
+CFG = Config()
+
+# The maximum number of URLs browse_websites visits at once
+MAX_URLS = 10
+# Pages larger than this are cut off
+MAX_PAGE_SIZE = 5 * 1024 * 1024
+# The number of bytes of a page read at once
+READ_SIZE = 64 * 1024
+
+
+async def fetch_page(
+    session: aiohttp.ClientSession, url: str
+) -> tuple[str | None, str | None]:
+    """Fetch a single page, going through the shared HTTP cache
+
+    Args:
+        session (aiohttp.ClientSession): The session to send the request with
+        url (str): The URL of the page
+
+    Returns:
+        tuple[str | None, str | None]: The HTML of the page and an error message,
+            one of which is None
+    """
+    import aiohttp
+
+    try:
+        sanitized_url = validate_url(url)
+    except ValueError as e:
+        return None, f"Error: {str(e)}"
+
+    cached = http_cache.get(sanitized_url)
+    if cached is not None and cached.is_fresh():
+        return cached.to_response().text, None
+
+    try:
+        async with session.get(
+            sanitized_url,
+            headers=cached.validators() if cached is not None else None,
+        ) as response:
+            if response.status == 304 and cached is not None:
+                http_cache.revalidated(cached, _to_requests_response(response, b""))
+                return cached.to_response().text, None
+            if response.status >= 400:
+                return None, f"Error: HTTP {response.status} error"
+
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(READ_SIZE):
+                body += chunk
+                if len(body) >= MAX_PAGE_SIZE:
+                    break
+            complete = len(body) <= MAX_PAGE_SIZE and response.content.at_eof()
+            page = _to_requests_response(response, bytes(body[:MAX_PAGE_SIZE]))
+            # A page that was cut off isn't cached
+            if complete:
+                http_cache.store(sanitized_url, page)
+            return page.text, None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return None, f"Error: {str(e) or type(e).__name__}"
+
+
+async def fetch_pages(
+    urls: list[str],
+    timeout: float | None = None,
+    max_connections: int | None = None,
+    max_connections_per_host: int | None = None,
+) -> list[tuple[str | None, str | None]]:
+    """Fetch several pages concurrently over a shared connection pool
+
+    Args:
+        urls (list[str]): The URLs of the pages
+        timeout (float, optional): Timeout in seconds for each page.
+            Defaults to the browse_timeout setting.
+        max_connections (int, optional): The maximum number of open connections.
+            Defaults to the browse_max_connections setting.
+        max_connections_per_host (int, optional): The maximum number of open
+            connections to the same host. Defaults to the
+            browse_max_connections_per_host setting.
+
+    Returns:
+        list[tuple[str | None, str | None]]: The HTML or error message of every
+            page, in the order of the URLs
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=max_connections or CFG.browse_max_connections,
+        limit_per_host=max_connections_per_host
+        or CFG.browse_max_connections_per_host,
+    )
+    client_timeout = aiohttp.ClientTimeout(total=timeout or CFG.browse_timeout)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=client_timeout,
+        headers={"User-Agent": CFG.user_agent},
+    ) as session:
+        return await asyncio.gather(*(fetch_page(session, url) for url in urls))
+
+
+@command(
+    "browse_websites",
+    "Browse Several Websites At Once",
+    {"urls": "<list_of_urls>", "question": "<what_you_want_to_find>"},
+)
+def browse_websites(urls: list[str] | str, question: str) -> str:
+    """Fetch several websites in parallel and answer a question about each
+
+    Args:
+        urls (list[str] | str): The URLs to browse, as a list or a comma separated
+            string
+        question (str): The question to answer using the websites
+
+    Returns:
+        str: The answer and the first links of every website
+    """
+    if isinstance(urls, str):
+        urls = [url.strip() for url in urls.split(",")]
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return "Error: No URLs given"
+    if len(urls) > MAX_URLS:
+        return f"Error: Too many URLs, browse at most {MAX_URLS} at once"
+
+    pages = asyncio.run(fetch_pages(urls))
+
+    results = {}
+    for url, (html, error) in zip(urls, pages):
+        if error:
+            results[url] = error
+            continue
+        text, hyperlinks = parse_page(url, html)
+        answer = summary.summarize_text(url, text, question)
+        links = format_hyperlinks(hyperlinks)[:5]
+        results[url] = f"Answer gathered from website: {answer} \n \n Links: {links}"
+
+    return json.dumps(results, ensure_ascii=False, indent=4)
+
+
+def _to_requests_response(response: aiohttp.ClientResponse, body: bytes) -> Response:
+    """Wrap an aiohttp response in a requests Response for the HTTP cache"""
+    page = Response()
+    page.status_code = response.status
+    page.headers = CaseInsensitiveDict(response.headers)
+    page.url = str(response.url)
+    page.encoding = response.charset
+    page._content = body
+    return page
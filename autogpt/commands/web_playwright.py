@@ -1,48 +1,226 @@
 """Web scraping commands using Playwright"""
 from __future__ import annotations
 
+import asyncio
+import atexit
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Coroutine, TypeVar
+
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 except ImportError:
     print(
         "Playwright not installed. Please install it with 'pip install playwright' to use."
     )
-from bs4 import BeautifulSoup
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
+from autogpt.config import Config
+from autogpt.processing.html import extract_page, format_hyperlinks
 
+CFG = Config()
 
-def scrape_text(url: str) -> str:
-    """Scrape text from a webpage
+# Resources that are never needed to get the text and links of a page
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+T = TypeVar("T")
+
+
+class PlaywrightBrowser:
+    """A persistent Chromium browser with a pool of reusable contexts
+
+    The browser lives on its own event loop in a background thread, so it can be
+    used from synchronous code and from any other event loop alike. Pages are
+    opened in pooled browser contexts, which are cleared of cookies between
+    uses, and requests for images, fonts and media are aborted.
+    """
+
+    def __init__(self, max_contexts: int = 4) -> None:
+        """Initialize the browser, which is only launched when first used
+
+        Args:
+            max_contexts (int): The maximum number of pages open at the same time
+        """
+        self.max_contexts = max(max_contexts, 1)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._playwright = None
+        self._browser = None
+        self._idle_contexts: list = []
+        # Created on the event loop they are used from, see _get_loop()
+        self._slots: asyncio.Semaphore | None = None
+        self._launch_lock: asyncio.Lock | None = None
+
+    def run(self, coroutine: Coroutine[object, object, T]) -> T:
+        """Run a coroutine on the browser's event loop and wait for its result
+
+        Args:
+            coroutine (Coroutine): The coroutine to run
+
+        Returns:
+            T: The result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+    async def run_async(self, coroutine: Coroutine[object, object, T]) -> T:
+        """Run a coroutine on the browser's event loop from another event loop
+
+        Args:
+            coroutine (Coroutine): The coroutine to run
+
+        Returns:
+            T: The result of the coroutine
+        """
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+        )
+
+    async def fetch_html(self, url: str) -> str:
+        """Render a page and get its HTML. Must run on the browser's event loop.
+
+        Args:
+            url (str): The URL of the page
+
+        Returns:
+            str: The HTML of the rendered page
+        """
+        async with self.page() as page:
+            await page.goto(url, wait_until="domcontentloaded")
+            return await page.content()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator:
+        """Open a page in a pooled context. Must run on the browser's event loop.
+
+        Yields:
+            Page: The new page, closed on exit
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_contexts)
+            self._launch_lock = asyncio.Lock()
+        async with self._slots:
+            context = await self._take_context()
+            try:
+                page = await context.new_page()
+                try:
+                    yield page
+                finally:
+                    await page.close()
+                await context.clear_cookies()
+            except BaseException:
+                await context.close()
+                raise
+            self._idle_contexts.append(context)
+
+    def close(self) -> None:
+        """Close the browser and stop its event loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                # Primitives can't be shared with the loop of a closed browser
+                self._slots = self._launch_lock = None
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="playwright", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    async def _take_context(self):
+        # Pages opened at the same time must not each launch their own browser
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                # Contexts of a crashed browser can't be reused
+                self._idle_contexts.clear()
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch()
+
+        if self._idle_contexts:
+            return self._idle_contexts.pop()
+        context = await self._browser.new_context()
+        await context.route("**/*", block_heavy_resources)
+        return context
+
+    async def _shutdown(self) -> None:
+        self._idle_contexts.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def block_heavy_resources(route) -> None:
+    """Abort requests for resources that don't contribute to the text of a page
 
     Args:
-        url (str): The URL to scrape text from
+        route (Route): The intercepted request
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+browser = PlaywrightBrowser(CFG.playwright_max_contexts)
+atexit.register(browser.close)
+
+
+async def scrape_pages_async(urls: list[str]) -> list[tuple[str, list[str]] | str]:
+    """Render several webpages at once and scrape their text and links
+
+    Can be awaited from any event loop.
+
+    Args:
+        urls (list[str]): The URLs to scrape
 
     Returns:
-        str: The scraped text
+        list[tuple[str, list[str]] | str]: The text and links of every page, or an
+            error message, in the order of the URLs
     """
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
 
-        try:
-            page.goto(url)
-            html_content = page.content()
-            soup = BeautifulSoup(html_content, "html.parser")
+    async def render_all() -> list[str | BaseException]:
+        return await asyncio.gather(
+            *(browser.fetch_html(url) for url in urls), return_exceptions=True
+        )
+
+    pages = await browser.run_async(render_all())
+    results = []
+    for url, html in zip(urls, pages):
+        if isinstance(html, BaseException):
+            results.append(f"Error: {str(html)}")
+            continue
+        text, hyperlinks = extract_page(html, url)
+        results.append((text, format_hyperlinks(hyperlinks)))
+    return results
 
-            for script in soup(["script", "style"]):
-                script.extract()
 
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = "\n".join(chunk for chunk in chunks if chunk)
+def scrape_text(url: str) -> str:
+    """Scrape text from a webpage
 
-        except Exception as e:
-            text = f"Error: {str(e)}"
+    Args:
+        url (str): The URL to scrape text from
 
-        finally:
-            browser.close()
+    Returns:
+        str: The scraped text
+    """
+    try:
+        html_content = browser.run(browser.fetch_html(url))
+    except Exception as e:
+        return f"Error: {str(e)}"
 
+    text, _ = extract_page(html_content, url)
     return text
 
 
@@ -55,25 +233,10 @@ def scrape_links(url: str) -> str | list[str]:
     Returns:
         Union[str, List[str]]: The scraped links
     """
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-
-        try:
-            page.goto(url)
-            html_content = page.content()
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            for script in soup(["script", "style"]):
-                script.extract()
-
-            hyperlinks = extract_hyperlinks(soup, url)
-            formatted_links = format_hyperlinks(hyperlinks)
-
-        except Exception as e:
-            formatted_links = f"Error: {str(e)}"
-
-        finally:
-            browser.close()
+    try:
+        html_content = browser.run(browser.fetch_html(url))
+    except Exception as e:
+        return f"Error: {str(e)}"
 
-    return formatted_links
+    _, hyperlinks = extract_page(html_content, url)
+    return format_hyperlinks(hyperlinks)
@@ -1,22 +1,30 @@
 """Browse a webpage and summarize it using the LLM model"""
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
+from typing import Callable, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import requests
 from requests.compat import urljoin
 from requests import Response
-from bs4 import BeautifulSoup
 
 from autogpt.config import Config
-from autogpt.memory import get_memory
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
+from autogpt.http_cache import HTTPCache
+from autogpt.processing.html import extract_page, format_hyperlinks
 
 CFG = Config()
-memory = get_memory(CFG)
 
 session = requests.Session()
 session.headers.update({"User-Agent": CFG.user_agent})
+http_cache = HTTPCache(CFG.http_cache_dir, CFG.http_cache_max_size * 1024 * 1024)
+
+# Results of parsing a page, by (kind, URL, hash of the page content)
+PARSED_CACHE_SIZE = 64
+parsed_cache: OrderedDict[tuple[str, str, str], object] = OrderedDict()
+
+T = TypeVar("T")
 
 
 def is_valid_url(url: str) -> bool:
@@ -84,6 +92,29 @@ def check_local_file_access(url: str) -> bool:
     return any(url.startswith(prefix) for prefix in local_prefixes)
 
 
+def validate_url(url: str) -> str:
+    """Check that a URL may be requested and sanitize it
+
+    Args:
+        url (str): The URL to check
+
+    Returns:
+        str: The sanitized URL
+
+    Raises:
+        ValueError: If the URL is invalid or points to the local machine
+    """
+    # Restrict access to local files
+    if check_local_file_access(url):
+        raise ValueError("Access to local files is restricted")
+
+    # Most basic check if the URL is valid:
+    if not url.startswith("http://") and not url.startswith("https://"):
+        raise ValueError("Invalid URL format")
+
+    return sanitize_url(url)
+
+
 def get_response(
     url: str, timeout: int = 10
 ) -> tuple[None, str] | tuple[Response, None]:
@@ -101,22 +132,27 @@ def get_response(
         requests.exceptions.RequestException: If the HTTP request fails
     """
     try:
-        # Restrict access to local files
-        if check_local_file_access(url):
-            raise ValueError("Access to local files is restricted")
+        sanitized_url = validate_url(url)
 
-        # Most basic check if the URL is valid:
-        if not url.startswith("http://") and not url.startswith("https://"):
-            raise ValueError("Invalid URL format")
+        cached = http_cache.get(sanitized_url)
+        if cached is not None and cached.is_fresh():
+            return cached.to_response(), None
 
-        sanitized_url = sanitize_url(url)
+        response = session.get(
+            sanitized_url,
+            timeout=timeout,
+            headers=cached.validators() if cached is not None else None,
+        )
 
-        response = session.get(sanitized_url, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            http_cache.revalidated(cached, response)
+            return cached.to_response(), None
 
         # Check if the response contains an HTTP error
         if response.status_code >= 400:
             return None, f"Error: HTTP {str(response.status_code)} error"
 
+        http_cache.store(sanitized_url, response)
         return response, None
     except ValueError as ve:
         # Handle invalid URL format
@@ -128,6 +164,33 @@ def get_response(
         return None, f"Error: {str(re)}"
 
 
+def memoize_parsed(kind: str, url: str, html: str, parse: Callable[[], T]) -> T:
+    """Return the memoized result of parsing a page, parsing it if needed
+
+    Results are keyed by the URL and a hash of the page content, so a page that
+    changed is parsed again.
+
+    Args:
+        kind (str): What the result is, e.g. "page"
+        url (str): The URL of the page
+        html (str): The content of the page
+        parse (Callable[[], T]): The function to call on a cache miss
+
+    Returns:
+        T: The result of parsing the page
+    """
+    key = (kind, url, hashlib.sha256(html.encode("utf-8")).hexdigest())
+    if key in parsed_cache:
+        parsed_cache.move_to_end(key)
+        return parsed_cache[key]
+
+    result = parse()
+    parsed_cache[key] = result
+    if len(parsed_cache) > PARSED_CACHE_SIZE:
+        parsed_cache.popitem(last=False)
+    return result
+
+
 def scrape_text(url: str) -> str:
     """Scrape text from a webpage
 
@@ -143,17 +206,21 @@ def scrape_text(url: str) -> str:
     if not response:
         return "Error: Could not get response"
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    text, _ = parse_page(url, response.text)
+    return text
 
-    for script in soup(["script", "style"]):
-        script.extract()
 
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
+def parse_page(url: str, html: str) -> tuple[str, list[tuple[str, str]]]:
+    """Extract the text and hyperlinks of a webpage, parsing it only once
 
-    return text
+    Args:
+        url (str): The URL of the page
+        html (str): The HTML of the page
+
+    Returns:
+        tuple[str, list[tuple[str, str]]]: The text and hyperlinks of the page
+    """
+    return memoize_parsed("page", url, html, lambda: extract_page(html, url))
 
 
 def scrape_links(url: str) -> str | list[str]:
@@ -170,13 +237,8 @@ def scrape_links(url: str) -> str | list[str]:
         return error_message
     if not response:
         return "Error: Could not get response"
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    hyperlinks = extract_hyperlinks(soup, url)
 
+    _, hyperlinks = parse_page(url, response.text)
     return format_hyperlinks(hyperlinks)
 
 
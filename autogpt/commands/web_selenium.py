@@ -1,59 +1,232 @@
 """Selenium web scraping module."""
 from __future__ import annotations
 
-from selenium import webdriver
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
-import autogpt.processing.text as summary
-from bs4 import BeautifulSoup
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.safari.options import Options as SafariOptions
+import atexit
+import functools
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from autogpt.config import Config
 from sys import platform
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from selenium.common.exceptions import WebDriverException
+
+import autogpt.processing.text as summary
+from autogpt.commands.command import command
+from autogpt.config import Config
+from autogpt.logs import logger
+from autogpt.processing.html import extract_page, format_hyperlinks
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 FILE_DIR = Path(__file__).parent.parent
 CFG = Config()
 
+# URL patterns of resources text-only mode doesn't download in Chrome. Images
+# are already skipped by type, through the blink settings. The extension has
+# to end the path, as pages like www.movies.com must still load.
+FONT_EXTENSIONS = "woff woff2 ttf otf eot".split()
+MEDIA_EXTENSIONS = "mp4 webm ogg mp3 wav m4a avi mov".split()
+BLOCKED_URL_PATTERNS = [
+    pattern
+    for extension in FONT_EXTENSIONS + MEDIA_EXTENSIONS
+    for pattern in (f"*.{extension}", f"*.{extension}?*", f"*.{extension}#*")
+]
+# Firefox preferences that keep images, fonts and media from loading
+FIREFOX_TEXT_ONLY_PREFERENCES = {
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "media.preload.default": 0,
+    "media.preload.auto": 0,
+}
+
+# JavaScript measuring a loaded page with the Resource Timing API
+PAGE_STATS_SCRIPT = """
+const entries = performance.getEntriesByType("navigation")
+    .concat(performance.getEntriesByType("resource"));
+return [
+    entries.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    entries.length,
+    document.images.length + document.querySelectorAll("video, audio").length,
+];
+"""
+# JavaScript returning a value that changes while the DOM is still being built
+DOM_SIZE_SCRIPT = (
+    "return document.getElementsByTagName('*').length"
+    " + ':' + (document.body ? document.body.innerText.length : 0);"
+)
+
+
+@dataclass
+class PageLoadStats:
+    """How long a page took to load and how much was downloaded for it"""
+
+    load_time: float
+    transferred_bytes: int
+    requests: int
+    # The images, videos and audio text-only mode didn't download
+    skipped_media: int = 0
+
+    def __str__(self) -> str:
+        text = (
+            f"loaded in {self.load_time:.2f}s, {self.requests} requests,"
+            f" {self.transferred_bytes / 1024:.0f} KB transferred"
+        )
+        if self.skipped_media:
+            text += f", {self.skipped_media} images and media not downloaded"
+        return text
 
-def browse_website(url: str, question: str) -> tuple[str, WebDriver]:
-    """Browse a website and return the answer and links to the user
+
+class WebDriverPool:
+    """A pool of long-lived web drivers, reused across pages
+
+    Drivers are checked for health before they are handed out, cleaned of
+    cookies and storage when they are given back, and replaced after they
+    have loaded a given number of pages.
+    """
+
+    def __init__(
+        self,
+        create_driver: Callable[[], WebDriver],
+        size: int = 1,
+        max_pages: int = 20,
+    ) -> None:
+        """Initialize the pool
+
+        Args:
+            create_driver (Callable[[], WebDriver]): Function launching a new driver
+            size (int): The maximum number of drivers in use at the same time
+            max_pages (int): The number of pages after which a driver is replaced.
+                0 means drivers are never replaced.
+        """
+        self.create_driver = create_driver
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(max(size, 1))
+        self._lock = threading.Lock()
+        # Idle drivers and the number of pages each has loaded
+        self._idle: list[tuple[WebDriver, int]] = []
+
+    @contextmanager
+    def driver(self) -> Iterator[WebDriver]:
+        """Borrow a driver from the pool, waiting for one if all are in use
+
+        Yields:
+            WebDriver: A healthy driver with no cookies or storage
+        """
+        with self._slots:
+            driver, pages = self._take()
+            try:
+                yield driver
+            except BaseException:
+                # The driver may be left in any state, so don't reuse it
+                self._quit(driver)
+                raise
+            self._give_back(driver, pages + 1)
+
+    def close(self) -> None:
+        """Quit all idle drivers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._quit(driver)
+
+    def _take(self) -> tuple[WebDriver, int]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                driver, pages = self._idle.pop()
+            if self._is_healthy(driver):
+                return driver, pages
+            self._quit(driver)
+        return self.create_driver(), 0
+
+    def _give_back(self, driver: WebDriver, pages: int) -> None:
+        if self.max_pages and pages >= self.max_pages:
+            self._quit(driver)
+            return
+        try:
+            self._reset(driver)
+        except WebDriverException:
+            self._quit(driver)
+            return
+        with self._lock:
+            self._idle.append((driver, pages))
+
+    @staticmethod
+    def _is_healthy(driver: WebDriver) -> bool:
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _reset(driver: WebDriver) -> None:
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Clear the cookies and storage of every site visited, not only of
+            # the current page
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"}
+            )
+        else:
+            # Without CDP only the origin of the current page can be cleared
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); }"
+                " catch (e) {}"
+            )
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def get_driver_path(browser: str) -> str:
+    """Get the path of the driver binary, downloading it on the first call only
 
     Args:
-        url (str): The url of the website to browse
-        question (str): The question asked by the user
+        browser (str): "chrome" or "firefox"
 
     Returns:
-        Tuple[str, WebDriver]: The answer and links to the user and the webdriver
+        str: The path of the driver binary
     """
-    driver, text = scrape_text_with_selenium(url)
-    add_header(driver)
-    summary_text = summary.summarize_text(url, text, question, driver)
-    links = scrape_links_with_selenium(driver, url)
+    if browser == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
 
-    # Limit links to 5
-    if len(links) > 5:
-        links = links[:5]
-    close_browser(driver)
-    return f"Answer gathered from website: {summary_text} \n \n Links: {links}", driver
+        return GeckoDriverManager().install()
 
+    from webdriver_manager.chrome import ChromeDriverManager
 
-def scrape_text_with_selenium(url: str) -> tuple[WebDriver, str]:
-    """Scrape text from a website using selenium
+    return ChromeDriverManager().install()
 
-    Args:
-        url (str): The url of the website to scrape
+
+def create_driver() -> WebDriver:
+    """Launch a new web driver for the configured browser
 
     Returns:
-        Tuple[WebDriver, str]: The webdriver and the text scraped from the website
+        WebDriver: The new driver
     """
+    # selenium.webdriver imports the bindings of every browser, so it is only
+    # imported once a browser is needed
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+    from selenium.webdriver.safari.options import Options as SafariOptions
+
     logging.getLogger("selenium").setLevel(logging.CRITICAL)
 
     options_available = {
@@ -66,41 +239,167 @@ def scrape_text_with_selenium(url: str) -> tuple[WebDriver, str]:
     options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.5615.49 Safari/537.36"
     )
+    if CFG.selenium_text_only:
+        # Hand the page over once the DOM is parsed instead of fully loaded
+        options.page_load_strategy = "eager"
 
     if CFG.selenium_web_browser == "firefox":
-        driver = webdriver.Firefox(
-            executable_path=GeckoDriverManager().install(), options=options
+        if CFG.selenium_text_only:
+            for name, value in FIREFOX_TEXT_ONLY_PREFERENCES.items():
+                options.set_preference(name, value)
+        return webdriver.Firefox(
+            service=FirefoxService(get_driver_path("firefox")), options=options
         )
     elif CFG.selenium_web_browser == "safari":
         # Requires a bit more setup on the users end
         # See https://developer.apple.com/documentation/webkit/testing_with_webdriver_in_safari
-        driver = webdriver.Safari(options=options)
-    else:
-        if platform == "linux" or platform == "linux2":
-            options.add_argument("--disable-dev-shm-usage")
+        return webdriver.Safari(options=options)
+
+    if platform == "linux" or platform == "linux2":
+        options.add_argument("--disable-dev-shm-usage")
+        # A fixed port can only be used by one browser at a time
+        if CFG.selenium_pool_size == 1:
             options.add_argument("--remote-debugging-port=9222")
-        options.add_argument("--no-sandbox")
-        driver = webdriver.Chrome(
-            executable_path=ChromeDriverManager().install(), options=options
+    options.add_argument("--no-sandbox")
+    if CFG.selenium_text_only:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
         )
+    driver = webdriver.Chrome(
+        service=ChromeService(get_driver_path("chrome")), options=options
+    )
+    if CFG.selenium_text_only:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+driver_pool = WebDriverPool(
+    create_driver, CFG.selenium_pool_size, CFG.selenium_max_pages_per_driver
+)
+atexit.register(driver_pool.close)
+
+
+@command(
+    "browse_website",
+    "Browse Website",
+    {"url": "<url>", "question": "<what_you_want_to_find_on_website>"},
+)
+def browse_website(url: str, question: str) -> str:
+    """Browse a website and return the answer and links to the user
+
+    Args:
+        url (str): The url of the website to browse
+        question (str): The question asked by the user
+
+    Returns:
+        str: The answer and links to the user
+    """
+    with driver_pool.driver() as driver:
+        text, links, stats = scrape_page(driver, url)
+        add_header(driver)
+        summary_text = summary.summarize_text(url, text, question, driver)
+
+    # Limit links to 5
+    if len(links) > 5:
+        links = links[:5]
+    result = f"Answer gathered from website: {summary_text} \n \n Links: {links}"
+    if stats is not None:
+        result += f" \n \n Page {stats}"
+    return result
+
+
+def scrape_text_with_selenium(url: str) -> tuple[WebDriver, str]:
+    """Scrape text from a website using a new selenium driver
+
+    The driver is not taken from the pool, the caller has to close it.
+
+    Args:
+        url (str): The url of the website to scrape
+
+    Returns:
+        Tuple[WebDriver, str]: The webdriver and the text scraped from the website
+    """
+    driver = create_driver()
+    text, _, _ = scrape_page(driver, url)
+    return driver, text
+
+
+def scrape_page(
+    driver: WebDriver, url: str
+) -> tuple[str, list[str], PageLoadStats | None]:
+    """Load a website and scrape its text and links
+
+    Args:
+        driver (WebDriver): The webdriver to load the website with
+        url (str): The url of the website to scrape
+
+    Returns:
+        Tuple[str, List[str], PageLoadStats | None]: The text scraped from the
+            website, the links found on it and what loading it took
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    started = time.monotonic()
     driver.get(url)
 
     WebDriverWait(driver, 10).until(
         EC.presence_of_element_located((By.TAG_NAME, "body"))
     )
+    if CFG.selenium_text_only:
+        # With the eager strategy scripts may still be adding content
+        wait_for_stable_dom(driver)
+    stats = get_page_load_stats(driver, time.monotonic() - started)
+    if stats is not None:
+        logger.debug(f"Browsed {url}: {stats}")
 
     # Get the HTML content directly from the browser's DOM
     page_source = driver.execute_script("return document.body.outerHTML;")
-    soup = BeautifulSoup(page_source, "html.parser")
+    text, hyperlinks = extract_page(page_source, url)
+    return text, format_hyperlinks(hyperlinks), stats
 
-    for script in soup(["script", "style"]):
-        script.extract()
 
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
-    return driver, text
+def wait_for_stable_dom(
+    driver: WebDriver, timeout: float = 5.0, interval: float = 0.25
+) -> None:
+    """Wait until the DOM stops changing, or until the timeout runs out
+
+    Args:
+        driver (WebDriver): The webdriver showing the page
+        timeout (float): The maximum number of seconds to wait
+        interval (float): The number of seconds the DOM has to stay unchanged
+    """
+    deadline = time.monotonic() + timeout
+    previous = driver.execute_script(DOM_SIZE_SCRIPT)
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        current = driver.execute_script(DOM_SIZE_SCRIPT)
+        if current == previous:
+            return
+        previous = current
+
+
+def get_page_load_stats(driver: WebDriver, load_time: float) -> PageLoadStats | None:
+    """Measure the requests made for the current page
+
+    Args:
+        driver (WebDriver): The webdriver showing the page
+        load_time (float): The number of seconds the page took to load
+
+    Returns:
+        PageLoadStats | None: The statistics, or None if the browser can't tell
+    """
+    try:
+        transferred_bytes, requests, media = driver.execute_script(PAGE_STATS_SCRIPT)
+    except (WebDriverException, TypeError, ValueError):
+        return None
+    skipped_media = int(media) if CFG.selenium_text_only else 0
+    return PageLoadStats(
+        load_time, int(transferred_bytes), int(requests), skipped_media
+    )
 
 
 def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
@@ -113,12 +412,7 @@ def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
         List[str]: The links scraped from the website
     """
     page_source = driver.page_source
-    soup = BeautifulSoup(page_source, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    hyperlinks = extract_hyperlinks(soup, url)
+    _, hyperlinks = extract_page(page_source, url)
 
     return format_hyperlinks(hyperlinks)
 
@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import json
+from autogpt.commands.command import command
 from autogpt.llm_utils import call_ai_function
 
 
-def write_tests(code: str, focus: list[str]) -> str:
+@command(
+    "write_tests",
+    "Write Tests",
+    {"code": "<full_code_string>", "focus": "<list_of_focus_areas>"},
+)
+def write_tests(code: str, focus: list[str] | None = None) -> str:
     """
     A function that takes in code and focus topics and returns a response from create
       chat completion api call.
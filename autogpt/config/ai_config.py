@@ -37,6 +37,8 @@ class AIConfig:
         self.ai_name = ai_name
         self.ai_role = ai_role
         self.ai_goals = ai_goals
+        self._full_prompt = None
+        self._full_prompt_key = None
 
     # Soon this will go in a folder where it remembers more stuff about the run(s)
     SAVE_FILE = os.path.join(os.path.dirname(__file__), "..", "ai_settings.yaml")
@@ -92,6 +94,9 @@ class AIConfig:
         """
         Returns a prompt to the user with the class information in an organized fashion.
 
+        The prompt is rendered once and cached until the configuration or the
+        available commands change.
+
         Parameters:
             None
 
@@ -99,6 +104,44 @@ class AIConfig:
             full_prompt (str): A string containing the initial prompt for the user
               including the ai_name, ai_role and ai_goals.
         """
+        key = self._full_prompt_cache_key()
+        if self._full_prompt is None or key != self._full_prompt_key:
+            self._full_prompt = self._render_full_prompt()
+            self._full_prompt_key = key
+        return self._full_prompt
+
+    def count_full_prompt_tokens(self, model: str) -> int:
+        """
+        Returns the number of tokens of the full prompt, sent as a system message.
+
+        Parameters:
+            model (str): The name of the model to count tokens for.
+
+        Returns:
+            int: The number of tokens, counted once per prompt and model.
+        """
+        from autogpt.token_counter import count_static_message_tokens
+
+        return count_static_message_tokens(
+            "system", self.construct_full_prompt(), model
+        )
+
+    def _full_prompt_cache_key(self) -> tuple:
+        from autogpt.commands.command import COMMAND_REGISTRY
+        from autogpt.config.config import Config
+
+        cfg = Config()
+        return (
+            self.ai_name,
+            self.ai_role,
+            tuple(self.ai_goals),
+            COMMAND_REGISTRY.version,
+            # Commands are enabled and disabled by the configuration
+            tuple(command.name for command in COMMAND_REGISTRY.enabled_commands(cfg)),
+            cfg.max_parallel_commands,
+        )
+
+    def _render_full_prompt(self) -> str:
 
         prompt_start = (
             "Your decisions must always be made independently without"
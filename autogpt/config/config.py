@@ -27,19 +27,46 @@ class Config(metaclass=Singleton):
         self.allow_downloads = False
 
         self.selenium_web_browser = os.getenv("USE_WEB_BROWSER", "chrome")
+        self.selenium_pool_size = int(os.getenv("SELENIUM_POOL_SIZE", 1))
+        self.selenium_max_pages_per_driver = int(
+            os.getenv("SELENIUM_MAX_PAGES_PER_DRIVER", 20)
+        )
+        self.selenium_text_only = (
+            os.getenv("SELENIUM_TEXT_ONLY", "True") == "True"
+        )
+        self.playwright_max_contexts = int(os.getenv("PLAYWRIGHT_MAX_CONTEXTS", 4))
         self.ai_settings_file = os.getenv("AI_SETTINGS_FILE", "ai_settings.yaml")
         self.fast_llm_model = os.getenv("FAST_LLM_MODEL", "gpt-3.5-turbo")
         self.smart_llm_model = os.getenv("SMART_LLM_MODEL", "gpt-4")
         self.fast_token_limit = int(os.getenv("FAST_TOKEN_LIMIT", 4000))
         self.smart_token_limit = int(os.getenv("SMART_TOKEN_LIMIT", 8000))
         self.browse_chunk_max_length = int(os.getenv("BROWSE_CHUNK_MAX_LENGTH", 8192))
+        self.read_file_max_length = int(os.getenv("READ_FILE_MAX_LENGTH", 8000))
 
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.temperature = float(os.getenv("TEMPERATURE", "1"))
         self.use_azure = os.getenv("USE_AZURE") == "True"
+        # Where execute_python_file runs files: "docker" or "local"
+        self.execute_python_sandbox = os.getenv("EXECUTE_PYTHON_SANDBOX", "docker")
+        self.sandbox_image = os.getenv("SANDBOX_IMAGE", "python:3-alpine")
+        self.sandbox_pool_size = int(os.getenv("SANDBOX_POOL_SIZE", 1))
+        self.sandbox_cpus = float(os.getenv("SANDBOX_CPUS", 1))
+        self.sandbox_memory = os.getenv("SANDBOX_MEMORY", "512m")
+        self.sandbox_timeout = float(os.getenv("SANDBOX_TIMEOUT", 60))
         self.execute_local_commands = (
             os.getenv("EXECUTE_LOCAL_COMMANDS", "False") == "True"
         )
+        # The number of commands the AI may ask for at once, run concurrently
+        self.max_parallel_commands = int(os.getenv("MAX_PARALLEL_COMMANDS", 1))
+        self.execute_shell_timeout = float(os.getenv("EXECUTE_SHELL_TIMEOUT", 60))
+        self.max_background_jobs = int(os.getenv("MAX_BACKGROUND_JOBS", 4))
+        # Limits on the output of executed code and shell commands
+        self.execute_output_max_tokens = int(
+            os.getenv("EXECUTE_OUTPUT_MAX_TOKENS", 1000)
+        )
+        self.execute_output_max_bytes = int(
+            os.getenv("EXECUTE_OUTPUT_MAX_BYTES", 10 * 1024 * 1024)
+        )
 
         if self.use_azure:
             self.load_azure_config()
@@ -65,6 +92,7 @@ class Config(metaclass=Singleton):
 
         self.pinecone_api_key = os.getenv("PINECONE_API_KEY")
         self.pinecone_region = os.getenv("PINECONE_ENV")
+        self.pinecone_namespace = os.getenv("PINECONE_NAMESPACE", "")
 
         self.weaviate_host = os.getenv("WEAVIATE_HOST")
         self.weaviate_port = os.getenv("WEAVIATE_PORT")
@@ -75,10 +103,20 @@ class Config(metaclass=Singleton):
         self.weaviate_embedded_path = os.getenv("WEAVIATE_EMBEDDED_PATH")
         self.weaviate_api_key = os.getenv("WEAVIATE_API_KEY", None)
         self.use_weaviate_embedded = os.getenv("USE_WEAVIATE_EMBEDDED", "False") == "True"
+        self.weaviate_batch_size = int(os.getenv("WEAVIATE_BATCH_SIZE", "100"))
+        self.weaviate_flush_interval = float(os.getenv("WEAVIATE_FLUSH_INTERVAL", "5"))
 
         # milvus configuration, e.g., localhost:19530.
         self.milvus_addr = os.getenv("MILVUS_ADDR", "localhost:19530")
         self.milvus_collection = os.getenv("MILVUS_COLLECTION", "autogpt")
+        self.milvus_insert_batch_size = int(
+            os.getenv("MILVUS_INSERT_BATCH_SIZE", "100")
+        )
+        self.milvus_flush_interval = float(os.getenv("MILVUS_FLUSH_INTERVAL", "5"))
+        self.milvus_search_ef = int(os.getenv("MILVUS_SEARCH_EF", "64"))
+        self.milvus_consistency_level = os.getenv(
+            "MILVUS_CONSISTENCY_LEVEL", "Session"
+        )
 
         self.image_provider = os.getenv("IMAGE_PROVIDER")
         self.huggingface_api_token = os.getenv("HUGGINGFACE_API_TOKEN")
@@ -94,14 +132,36 @@ class Config(metaclass=Singleton):
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) AppleWebKit/537.36"
             " (KHTML, like Gecko) Chrome/83.0.4103.97 Safari/537.36",
         )
+        # On-disk cache for web pages, revalidated with ETag / Last-Modified
+        self.http_cache_dir = os.getenv(
+            "HTTP_CACHE_DIR", os.path.join(os.getcwd(), ".http_cache")
+        )
+        self.http_cache_max_size = int(os.getenv("HTTP_CACHE_MAX_SIZE", 100))
+        # Limits for fetching several pages at once with browse_websites
+        self.browse_max_connections = int(os.getenv("BROWSE_MAX_CONNECTIONS", 10))
+        self.browse_max_connections_per_host = int(
+            os.getenv("BROWSE_MAX_CONNECTIONS_PER_HOST", 2)
+        )
+        self.browse_timeout = float(os.getenv("BROWSE_TIMEOUT", 20))
         self.redis_host = os.getenv("REDIS_HOST", "localhost")
         self.redis_port = os.getenv("REDIS_PORT", "6379")
         self.redis_password = os.getenv("REDIS_PASSWORD", "")
         self.wipe_redis_on_start = os.getenv("WIPE_REDIS_ON_START", "True") == "True"
+        self.redis_max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "10"))
+        self.redis_vector_type = os.getenv("REDIS_VECTOR_TYPE", "FLOAT32").upper()
+        self.redis_hnsw_m = int(os.getenv("REDIS_HNSW_M", "16"))
+        self.redis_hnsw_ef_construction = int(
+            os.getenv("REDIS_HNSW_EF_CONSTRUCTION", "200")
+        )
+        self.redis_hnsw_ef_runtime = int(os.getenv("REDIS_HNSW_EF_RUNTIME", "10"))
         self.memory_index = os.getenv("MEMORY_INDEX", "auto-gpt")
         # Note that indexes must be created on db 0 in redis, this is not configurable.
 
         self.memory_backend = os.getenv("MEMORY_BACKEND", "local")
+        self.hybrid_memory_search = (
+            os.getenv("HYBRID_MEMORY_SEARCH", "True") == "True"
+        )
+        self.memory_min_similarity = float(os.getenv("MEMORY_MIN_SIMILARITY", "0"))
         # Initialize the OpenAI API client
         openai.api_key = self.openai_api_key
 
@@ -0,0 +1,256 @@
+"""On-disk HTTP response cache with conditional revalidation"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+# Headers that describe the stored body and must not be taken from a 304 response
+BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+class CachedResponse:
+    """A response stored in the cache"""
+
+    def __init__(self, cache: HTTPCache, key: str, metadata: dict) -> None:
+        self.cache = cache
+        self.key = key
+        self.metadata = metadata
+
+    @property
+    def headers(self) -> CaseInsensitiveDict:
+        return CaseInsensitiveDict(self.metadata["headers"])
+
+    def is_fresh(self) -> bool:
+        """Whether the response can be used without asking the server
+
+        Returns:
+            bool: True if the response is younger than its Cache-Control max-age
+        """
+        max_age = _max_age(self.headers)
+        if max_age is None:
+            return False
+        return time.time() - self.metadata["stored_at"] < max_age
+
+    def validators(self) -> dict[str, str]:
+        """Build the headers of a conditional request for this response
+
+        Returns:
+            dict[str, str]: If-None-Match and/or If-Modified-Since headers
+        """
+        headers = self.headers
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> Response:
+        """Rebuild a requests Response from the cached data
+
+        Returns:
+            Response: The cached response
+        """
+        response = Response()
+        response.status_code = self.metadata["status_code"]
+        response.headers = self.headers
+        response.encoding = self.metadata["encoding"]
+        response.url = self.metadata["url"]
+        response._content = self.cache.read_body(self.key)
+        return response
+
+
+class HTTPCache:
+    """
+    A size-bounded on-disk cache for HTTP GET responses.
+
+    Every response is stored as a JSON metadata file and a body file named after
+    the hash of the URL. The mtime of the body file records when the entry was
+    last used, and the least recently used entries are evicted once the total
+    size of the bodies exceeds max_size bytes.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int) -> None:
+        """
+        Initialize the cache. The directory is only created when the first
+        response is stored.
+
+        Args:
+            directory (str | Path): The directory to store the responses in
+            max_size (int): The maximum total size of the cached bodies, in bytes.
+                0 disables the cache.
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Look up the cached response for a URL
+
+        Args:
+            url (str): The requested URL
+
+        Returns:
+            CachedResponse | None: The cached response, if there is one
+        """
+        if not self.enabled:
+            return None
+        key = _key(url)
+        try:
+            with open(self._metadata_path(key), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            self._touch(key)
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(self, key, metadata)
+
+    def store(self, url: str, response: Response) -> None:
+        """Store a response if it can be revalidated or reused
+
+        Args:
+            url (str): The requested URL
+            response (Response): The response to store
+        """
+        if not self.enabled or response.status_code != 200:
+            return
+        headers = response.headers
+        if not isinstance(headers, Mapping):
+            return
+        cache_control = str(headers.get("Cache-Control", "")).lower()
+        if "no-store" in cache_control:
+            return
+        if not (
+            "ETag" in headers or "Last-Modified" in headers or _max_age(headers)
+        ):
+            return
+        body = response.content
+        if not isinstance(body, bytes) or len(body) > self.max_size:
+            return
+
+        key = _key(url)
+        metadata = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": dict(headers),
+            "encoding": response.encoding,
+            "stored_at": time.time(),
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            size = self._current_size() - self._body_size(key)
+            with open(self._body_path(key), "wb") as f:
+                f.write(body)
+            self._touch(key)
+            self._write_metadata(key, metadata)
+            self._size = size + len(body)
+            self._evict(keep=key)
+
+    def revalidated(self, entry: CachedResponse, response: Response) -> None:
+        """Refresh a cached response after the server answered 304 Not Modified
+
+        Args:
+            entry (CachedResponse): The cached response that was revalidated
+            response (Response): The 304 response
+        """
+        headers = entry.metadata["headers"]
+        if isinstance(response.headers, Mapping):
+            lower_names = {name.lower(): name for name in headers}
+            for name, value in response.headers.items():
+                if name.lower() in BODY_HEADERS:
+                    continue
+                headers.pop(lower_names.get(name.lower(), name), None)
+                headers[name] = value
+        entry.metadata["stored_at"] = time.time()
+        with self._lock:
+            self._write_metadata(entry.key, entry.metadata)
+
+    def read_body(self, key: str) -> bytes:
+        with open(self._body_path(key), "rb") as f:
+            return f.read()
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            if self.directory.exists():
+                for path in self.directory.iterdir():
+                    if path.suffix in {".json", ".body"}:
+                        path.unlink()
+            self._size = 0
+
+    def _evict(self, keep: str) -> None:
+        if self._size <= self.max_size:
+            return
+        bodies = sorted(
+            self.directory.glob("*.body"), key=lambda path: path.stat().st_mtime_ns
+        )
+        for body in bodies:
+            if self._size <= self.max_size:
+                break
+            if body.stem == keep:
+                continue
+            self._size -= body.stat().st_size
+            body.unlink()
+            self._metadata_path(body.stem).unlink(missing_ok=True)
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(
+                path.stat().st_size for path in self.directory.glob("*.body")
+            )
+        return self._size
+
+    def _body_size(self, key: str) -> int:
+        try:
+            return self._body_path(key).stat().st_size
+        except OSError:
+            return 0
+
+    def _touch(self, key: str) -> None:
+        # Set the time explicitly, the implicit file times can be too coarse to
+        # order entries used in quick succession
+        now = time.time_ns()
+        os.utime(self._body_path(key), ns=(now, now))
+
+    def _write_metadata(self, key: str, metadata: dict) -> None:
+        temporary_path = self._metadata_path(key).with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(temporary_path, self._metadata_path(key))
+
+    def _metadata_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _max_age(headers: Mapping) -> int | None:
+    """Get the max-age of a response, None if it must always be revalidated"""
+    cache_control = str(headers.get("Cache-Control", "")).lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return None
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-age":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
@@ -1,9 +1,28 @@
+import functools
 import json
+from pathlib import Path
+
 from jsonschema import Draft7Validator
 from autogpt.config import Config
 from autogpt.logs import logger
 
 CFG = Config()
+SCHEMA_DIR = Path(__file__).parent.parent / "json_schemas"
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(schema_name: str) -> Draft7Validator:
+    """Load a JSON schema and create its validator, once per schema
+
+    Args:
+        schema_name (str): The name of the schema file, without its extension
+
+    Returns:
+        Draft7Validator: The validator of the schema
+    """
+    with open(SCHEMA_DIR / f"{schema_name}.json", "r") as f:
+        schema = json.load(f)
+    return Draft7Validator(schema)
 
 
 def validate_json(json_object: object, schema_name: object) -> object:
@@ -12,9 +31,7 @@ def validate_json(json_object: object, schema_name: object) -> object:
     :param schema_name:
     :type json_object: object
     """
-    with open(f"autogpt/json_schemas/{schema_name}.json", "r") as f:
-        schema = json.load(f)
-    validator = Draft7Validator(schema)
+    validator = get_validator(schema_name)
 
     if errors := sorted(validator.iter_errors(json_object), key=lambda e: e.path):
         logger.error("The JSON object is invalid.")
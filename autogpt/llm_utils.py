@@ -139,21 +139,36 @@ def create_chat_completion(
 
 def create_embedding_with_ada(text) -> list:
     """Create an embedding with text-ada-002 using the OpenAI SDK"""
+    return create_embeddings_with_ada([text])[0]
+
+
+def create_embeddings_with_ada(texts: list[str]) -> list[list[float]]:
+    """Create the embeddings of several texts with text-ada-002 in one request
+
+    Args:
+        texts (list[str]): The texts, at most 2048
+
+    Returns:
+        list[list[float]]: The embedding of every text, in the same order
+    """
     num_retries = 10
     for attempt in range(num_retries):
         backoff = 2 ** (attempt + 2)
         try:
             if CFG.use_azure:
-                return openai.Embedding.create(
-                    input=[text],
+                response = openai.Embedding.create(
+                    input=texts,
                     engine=CFG.get_azure_deployment_id_for_model(
                         "text-embedding-ada-002"
                     ),
-                )["data"][0]["embedding"]
+                )
             else:
-                return openai.Embedding.create(
-                    input=[text], model="text-embedding-ada-002"
-                )["data"][0]["embedding"]
+                response = openai.Embedding.create(
+                    input=texts, model="text-embedding-ada-002"
+                )
+            # The embeddings may come back in any order
+            data = sorted(response["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
         except RateLimitError:
             pass
         except APIError as e:
@@ -1,26 +1,40 @@
 """Logging module for Auto-GPT."""
-import json
+import atexit
 import logging
 import os
+import queue
 import random
 import re
+import sys
 import time
 from logging import LogRecord
-import traceback
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING
 
 from colorama import Fore, Style
 
 from autogpt.speech import say_text
 from autogpt.config import Config, Singleton
 
+if TYPE_CHECKING:
+    from autogpt.agent.reply import Thoughts
+
 CFG = Config()
 
+# activity.log is written in batches of this many records, or more often when
+# records come in slowly
+FILE_BATCH_SIZE = 100
+FILE_FLUSH_INTERVAL = 1.0
+
 
 class Logger(metaclass=Singleton):
     """
     Logger that handle titles in different colors.
     Outputs logs in console, activity.log, and errors.log
     For console handler: simulates typing
+
+    Records are put on a queue and written by a background thread, so logging
+    never waits for the typing animation or for the disk.
     """
 
     def __init__(self):
@@ -39,15 +53,17 @@ class Logger(metaclass=Singleton):
         self.typing_console_handler = TypingConsoleHandler()
         self.typing_console_handler.setLevel(logging.INFO)
         self.typing_console_handler.setFormatter(console_formatter)
+        self.typing_console_handler.addFilter(lambda record: record.name == "TYPER")
 
         # Create a handler for console without typing simulation
         self.console_handler = ConsoleHandler()
         self.console_handler.setLevel(logging.DEBUG)
         self.console_handler.setFormatter(console_formatter)
+        self.console_handler.addFilter(lambda record: record.name == "LOGGER")
 
         # Info handler in activity.log
-        self.file_handler = logging.FileHandler(
-            os.path.join(log_dir, log_file), 'a', 'utf-8'
+        self.file_handler = BatchingFileHandler(
+            os.path.join(log_dir, log_file), FILE_BATCH_SIZE, FILE_FLUSH_INTERVAL
         )
         self.file_handler.setLevel(logging.DEBUG)
         info_formatter = AutoGptFormatter(
@@ -66,18 +82,46 @@ class Logger(metaclass=Singleton):
         )
         error_handler.setFormatter(error_formatter)
 
+        # Both loggers share one queue, so their output stays in order
+        self.queue = queue.Queue()
+        queue_handler = QueueHandler(self.queue)
+        self.listener = QueueListener(
+            self.queue,
+            self.typing_console_handler,
+            self.console_handler,
+            self.file_handler,
+            error_handler,
+            respect_handler_level=True,
+        )
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.close)
+
         self.typing_logger = logging.getLogger("TYPER")
-        self.typing_logger.addHandler(self.typing_console_handler)
-        self.typing_logger.addHandler(self.file_handler)
-        self.typing_logger.addHandler(error_handler)
+        self.typing_logger.addHandler(queue_handler)
         self.typing_logger.setLevel(logging.DEBUG)
 
         self.logger = logging.getLogger("LOGGER")
-        self.logger.addHandler(self.console_handler)
-        self.logger.addHandler(self.file_handler)
-        self.logger.addHandler(error_handler)
+        self.logger.addHandler(queue_handler)
         self.logger.setLevel(logging.DEBUG)
 
+    def flush(self):
+        """Wait until everything logged so far is written
+
+        Call this before reading input, so the prompt isn't printed in the
+        middle of the output.
+        """
+        if self._listening:
+            self.queue.join()
+        self.file_handler.flush()
+
+    def close(self):
+        """Write what is left in the queue and stop the background thread"""
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        self.file_handler.flush()
+
     def typewriter_log(
             self, title="", title_color="", content="", speak_text=False, level=logging.INFO
     ):
@@ -146,6 +190,13 @@ class TypingConsoleHandler(logging.StreamHandler):
         max_typing_speed = 0.01
 
         msg = self.format(record)
+        if CFG.continuous_mode or not sys.stdout.isatty():
+            # Nobody is watching the animation, print the message at once
+            try:
+                print(msg, flush=True)
+            except Exception:
+                self.handleError(record)
+            return
         try:
             words = msg.split()
             for i, word in enumerate(words):
@@ -171,6 +222,49 @@ class ConsoleHandler(logging.StreamHandler):
             self.handleError(record)
 
 
+class BatchingFileHandler(logging.FileHandler):
+    """File handler that writes records in batches instead of one at a time
+
+    The batch is written once it is full, when an error is logged, or when a
+    record comes in after the flush interval has passed.
+    """
+
+    def __init__(self, filename, batch_size=100, flush_interval=1.0):
+        super().__init__(filename, "a", "utf-8")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batch = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, record) -> None:
+        try:
+            self.batch.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if (
+            len(self.batch) >= self.batch_size
+            or record.levelno >= logging.ERROR
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.batch and self.stream:
+                self.stream.write("".join(self.batch))
+                self.batch.clear()
+            super().flush()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
 class AutoGptFormatter(logging.Formatter):
     """
     Allows to handle custom placeholders 'title_color' and 'message_no_color'.
@@ -202,133 +296,22 @@ def remove_color_codes(s: str) -> str:
 logger = Logger()
 
 
-def print_assistant_thoughts(ai_name, assistant_reply):
-    """Prints the assistant's thoughts to the console"""
-    from autogpt.json_fixes.bracket_termination import (
-        attempt_to_fix_json_by_finding_outermost_brackets,
-    )
-    from autogpt.json_fixes.parsing import fix_and_parse_json
-
-    try:
-        try:
-            # Parse and print Assistant response
-            assistant_reply_json = fix_and_parse_json(assistant_reply)
-        except json.JSONDecodeError:
-            logger.error("Error: Invalid JSON in assistant thoughts\n", assistant_reply)
-            assistant_reply_json = attempt_to_fix_json_by_finding_outermost_brackets(
-                assistant_reply
-            )
-            if isinstance(assistant_reply_json, str):
-                assistant_reply_json = fix_and_parse_json(assistant_reply_json)
-
-        # Check if assistant_reply_json is a string and attempt to parse
-        # it into a JSON object
-        if isinstance(assistant_reply_json, str):
-            try:
-                assistant_reply_json = json.loads(assistant_reply_json)
-            except json.JSONDecodeError:
-                logger.error("Error: Invalid JSON\n", assistant_reply)
-                assistant_reply_json = (
-                    attempt_to_fix_json_by_finding_outermost_brackets(
-                        assistant_reply_json
-                    )
-                )
-
-        assistant_thoughts_reasoning = None
-        assistant_thoughts_plan = None
-        assistant_thoughts_speak = None
-        assistant_thoughts_criticism = None
-        if not isinstance(assistant_reply_json, dict):
-            assistant_reply_json = {}
-        assistant_thoughts = assistant_reply_json.get("thoughts", {})
-        assistant_thoughts_text = assistant_thoughts.get("text")
-
-        if assistant_thoughts:
-            assistant_thoughts_reasoning = assistant_thoughts.get("reasoning")
-            assistant_thoughts_plan = assistant_thoughts.get("plan")
-            assistant_thoughts_criticism = assistant_thoughts.get("criticism")
-            assistant_thoughts_speak = assistant_thoughts.get("speak")
-
-        logger.typewriter_log(
-            f"{ai_name.upper()} THOUGHTS:", Fore.YELLOW, f"{assistant_thoughts_text}"
-        )
-        logger.typewriter_log(
-            "REASONING:", Fore.YELLOW, f"{assistant_thoughts_reasoning}"
-        )
+def print_assistant_thoughts(ai_name: str, thoughts: "Thoughts") -> None:
+    """Print the thoughts of the AI, and say them in speak mode
 
-        if assistant_thoughts_plan:
-            logger.typewriter_log("PLAN:", Fore.YELLOW, "")
-            # If it's a list, join it into a string
-            if isinstance(assistant_thoughts_plan, list):
-                assistant_thoughts_plan = "\n".join(assistant_thoughts_plan)
-            elif isinstance(assistant_thoughts_plan, dict):
-                assistant_thoughts_plan = str(assistant_thoughts_plan)
-
-            # Split the input_string using the newline character and dashes
-            lines = assistant_thoughts_plan.split("\n")
-            for line in lines:
-                line = line.lstrip("- ")
-                logger.typewriter_log("- ", Fore.GREEN, line.strip())
-
-        logger.typewriter_log(
-            "CRITICISM:", Fore.YELLOW, f"{assistant_thoughts_criticism}"
-        )
-        # Speak the assistant's thoughts
-        if CFG.speak_mode and assistant_thoughts_speak:
-            say_text(assistant_thoughts_speak)
-        else:
-            logger.typewriter_log("SPEAK:", Fore.YELLOW, f"{assistant_thoughts_speak}")
-
-        return assistant_reply_json
-    except json.decoder.JSONDecodeError:
-        logger.error("Error: Invalid JSON\n", assistant_reply)
-        if CFG.speak_mode:
-            say_text(
-                "I have received an invalid JSON response from the OpenAI API."
-                " I cannot ignore this response."
-            )
-
-    # All other errors, return "Error: + error message"
-    except Exception:
-        call_stack = traceback.format_exc()
-        logger.error("Error: \n", call_stack)
-
-
-def print_assistant_thoughts(ai_name: object, assistant_reply_json_valid: object) -> None:
-    assistant_thoughts_reasoning = None
-    assistant_thoughts_plan = None
-    assistant_thoughts_speak = None
-    assistant_thoughts_criticism = None
-
-    assistant_thoughts = assistant_reply_json_valid.get("thoughts", {})
-    assistant_thoughts_text = assistant_thoughts.get("text")
-    if assistant_thoughts:
-        assistant_thoughts_reasoning = assistant_thoughts.get("reasoning")
-        assistant_thoughts_plan = assistant_thoughts.get("plan")
-        assistant_thoughts_criticism = assistant_thoughts.get("criticism")
-        assistant_thoughts_speak = assistant_thoughts.get("speak")
-    logger.typewriter_log(
-        f"{ai_name.upper()} THOUGHTS:", Fore.YELLOW, f"{assistant_thoughts_text}"
-    )
+    Args:
+        ai_name (str): The name of the AI
+        thoughts (Thoughts): The thoughts of an already parsed reply
+    """
     logger.typewriter_log(
-        "REASONING:", Fore.YELLOW, f"{assistant_thoughts_reasoning}"
+        f"{ai_name.upper()} THOUGHTS:", Fore.YELLOW, f"{thoughts.text}"
     )
-    if assistant_thoughts_plan:
+    logger.typewriter_log("REASONING:", Fore.YELLOW, f"{thoughts.reasoning}")
+    if thoughts.plan:
         logger.typewriter_log("PLAN:", Fore.YELLOW, "")
-        # If it's a list, join it into a string
-        if isinstance(assistant_thoughts_plan, list):
-            assistant_thoughts_plan = "\n".join(assistant_thoughts_plan)
-        elif isinstance(assistant_thoughts_plan, dict):
-            assistant_thoughts_plan = str(assistant_thoughts_plan)
-
-        # Split the input_string using the newline character and dashes
-        lines = assistant_thoughts_plan.split("\n")
-        for line in lines:
-            line = line.lstrip("- ")
-            logger.typewriter_log("- ", Fore.GREEN, line.strip())
-    logger.typewriter_log(
-        "CRITICISM:", Fore.YELLOW, f"{assistant_thoughts_criticism}"
-    )
+        for line in thoughts.plan_lines():
+            logger.typewriter_log("- ", Fore.GREEN, line)
+    logger.typewriter_log("CRITICISM:", Fore.YELLOW, f"{thoughts.criticism}")
     # Speak the assistant's thoughts
-    if CFG.speak_mode and assistant_thoughts_speak:
-        say_text(assistant_thoughts_speak)
+    if CFG.speak_mode and thoughts.speak:
+        say_text(thoughts.speak)
@@ -1,46 +1,49 @@
+import importlib
+
 from autogpt.memory.local import LocalCache
 from autogpt.memory.no_memory import NoMemory
 
-# List of supported memory backends
-# Add a backend to this list if the import attempt is successful
-supported_memory = ["local", "no_memory"]
-
-try:
-    from autogpt.memory.redismem import RedisMemory
-
-    supported_memory.append("redis")
-except ImportError:
-    # print("Redis not installed. Skipping import.")
-    RedisMemory = None
+# Memory backends that need a client library, with the module and the class of
+# the backend. Client libraries are slow to import, so a backend is only
+# imported once it is used.
+OPTIONAL_BACKENDS = {
+    "redis": ("autogpt.memory.redismem", "RedisMemory"),
+    "pinecone": ("autogpt.memory.pinecone", "PineconeMemory"),
+    "weaviate": ("autogpt.memory.weaviate", "WeaviateMemory"),
+    "milvus": ("autogpt.memory.milvus", "MilvusMemory"),
+}
 
-try:
-    from autogpt.memory.pinecone import PineconeMemory
 
-    supported_memory.append("pinecone")
-except ImportError:
-    # print("Pinecone not installed. Skipping import.")
-    PineconeMemory = None
+def load_backend(name: str):
+    """Import the class of an optional memory backend
 
-try:
-    from autogpt.memory.weaviate import WeaviateMemory
+    Args:
+        name (str): The name of the backend, e.g. "redis"
 
-    supported_memory.append("weaviate")
-except ImportError:
-    # print("Weaviate not installed. Skipping import.")
-    WeaviateMemory = None
+    Returns:
+        type | None: The class of the backend, None if its client library is
+            not installed
+    """
+    module_name, class_name = OPTIONAL_BACKENDS[name]
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except ImportError:
+        return None
 
-try:
-    from autogpt.memory.milvus import MilvusMemory
 
-    supported_memory.append("milvus")
-except ImportError:
-    # print("pymilvus not installed. Skipping import.")
-    MilvusMemory = None
+def __getattr__(name: str):
+    # Keep `from autogpt.memory import RedisMemory` working without importing
+    # every backend up front
+    for backend, (_, class_name) in OPTIONAL_BACKENDS.items():
+        if name == class_name:
+            return load_backend(backend)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_memory(cfg, init=False):
     memory = None
     if cfg.memory_backend == "pinecone":
+        PineconeMemory = load_backend("pinecone")
         if not PineconeMemory:
             print(
                 "Error: Pinecone is not installed. Please install pinecone"
@@ -51,6 +54,7 @@ def get_memory(cfg, init=False):
             if init:
                 memory.clear()
     elif cfg.memory_backend == "redis":
+        RedisMemory = load_backend("redis")
         if not RedisMemory:
             print(
                 "Error: Redis is not installed. Please install redis-py to"
@@ -59,12 +63,14 @@ def get_memory(cfg, init=False):
         else:
             memory = RedisMemory(cfg)
     elif cfg.memory_backend == "weaviate":
+        WeaviateMemory = load_backend("weaviate")
         if not WeaviateMemory:
             print("Error: Weaviate is not installed. Please install weaviate-client to"
                   " use Weaviate as a memory backend.")
         else:
             memory = WeaviateMemory(cfg)
     elif cfg.memory_backend == "milvus":
+        MilvusMemory = load_backend("milvus")
         if not MilvusMemory:
             print(
                 "Error: Milvus sdk is not installed."
@@ -79,11 +85,18 @@ def get_memory(cfg, init=False):
         memory = LocalCache(cfg)
         if init:
             memory.clear()
+
+    if cfg.hybrid_memory_search and not isinstance(memory, NoMemory):
+        from autogpt.memory.hybrid import HybridMemory
+
+        memory = HybridMemory(cfg, memory)
     return memory
 
 
 def get_supported_memory_backends():
-    return supported_memory
+    return ["local", "no_memory"] + [
+        name for name in OPTIONAL_BACKENDS if load_backend(name) is not None
+    ]
 
 
 __all__ = [
@@ -26,6 +26,17 @@ class MemoryProviderSingleton(AbstractSingleton):
     def add(self, data):
         pass
 
+    def add_many(self, texts):
+        """Add several texts, which backends may embed and store in batches
+
+        Args:
+            texts (list[str]): The texts to add
+
+        Returns:
+            list[str]: The result of adding every text, in the same order
+        """
+        return [self.add(text) for text in texts]
+
     @abc.abstractmethod
     def get(self, data):
         pass
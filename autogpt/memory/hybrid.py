@@ -0,0 +1,186 @@
+"""Memory that combines keyword search with the vector search of a backend"""
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from autogpt.memory.base import MemoryProviderSingleton
+from autogpt.permanent_memory.sqlite3_store import MemoryDB
+
+# The constant of reciprocal rank fusion, dampening the weight of top ranks
+RRF_K = 60
+# Texts sharing this fraction of their words are considered the same memory
+DUPLICATE_SIMILARITY = 0.9
+# Long queries, like the recent message history, are cut to their last terms
+MAX_QUERY_TERMS = 32
+# Words too common to tell memories apart, including the keys of messages
+STOP_WORDS = set(
+    "the and for are but not you your with this that from have has was were will"
+    " can all any its into than then them they what when where which who why how"
+    " role content system user assistant".split()
+)
+WORD = re.compile(r"\w+")
+# A single term like a file name, a URL or a job ID, looked up exactly
+IDENTIFIER = re.compile(r"^(?=.*[\d_./:-])[\w./:-]+$")
+
+
+class HybridMemory(MemoryProviderSingleton):
+    """Finds relevant memories with both keyword and vector search
+
+    Every memory is added to the vector backend and to a SQLite FTS5 index.
+    Both are queried in parallel and their rankings are combined with
+    reciprocal rank fusion, dropping near-identical texts. Looking up an
+    identifier that the keyword index knows doesn't need an embedding at all.
+    """
+
+    def __init__(self, cfg, backend, db: MemoryDB | None = None) -> None:
+        """Initialize the memory
+
+        Args:
+            cfg: Config object
+            backend: The memory backend used for vector search
+            db (MemoryDB, optional): The keyword index. Defaults to the
+                mem.sqlite3 database in the working directory.
+        """
+        self.backend = backend
+        self.db = db or MemoryDB()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vector-search"
+        )
+
+    def add(self, text: str):
+        result = self.backend.add(text)
+        if result:
+            self.db.insert(text)
+        return result
+
+    def add_many(self, texts: list[str]) -> list:
+        results = self.backend.add_many(texts)
+        self.db.insert_many(text for text, result in zip(texts, results) if result)
+        return results
+
+    def get(self, data: str) -> list[Any] | None:
+        return self.get_relevant(data, 1)
+
+    def clear(self) -> str:
+        # Keyword search only looks at the current session, so starting a new
+        # one forgets the memories while keeping the database as a history
+        self.db.session_id = int(self.db.get_max_session_id()) + 1
+        return self.backend.clear()
+
+    def get_relevant(self, text: str, k: int = 5) -> list[Any]:
+        """Get the memories most relevant to a text
+
+        Args:
+            text (str): The text to find memories for
+            k (int): The number of memories to return
+
+        Returns:
+            list: The memories, most relevant first
+        """
+        if IDENTIFIER.match(text.strip()):
+            matches = self.keyword_search(phrase_query(text.strip()), k)
+            if matches:
+                return matches
+
+        # Fetch more candidates than needed, as the rankings overlap
+        vector_search = self._executor.submit(self.backend.get_relevant, text, 2 * k)
+        keyword_matches = self.keyword_search(keyword_query(text), 2 * k)
+        vector_matches = vector_search.result() or []
+        ranked = reciprocal_rank_fusion([vector_matches, keyword_matches])
+        return deduplicate(ranked)[:k]
+
+    def keyword_search(self, query: str, limit: int) -> list[str]:
+        """Search the keyword index of the current session
+
+        Args:
+            query (str): The FTS5 query
+            limit (int): The maximum number of matches
+
+        Returns:
+            list[str]: The matching memories, best first
+        """
+        if not query:
+            return []
+        return self.db.search_ranked(query, limit)
+
+    def get_stats(self):
+        return self.backend.get_stats()
+
+
+def keyword_query(text: str) -> str:
+    """Build an FTS5 query matching any of the distinctive words of a text
+
+    Args:
+        text (str): The text
+
+    Returns:
+        str: The query, empty if the text has no distinctive words
+    """
+    terms = []
+    # The end of a long text, like a message history, is the most recent
+    for word in reversed(WORD.findall(text.lower())):
+        if len(word) < 3 or word in STOP_WORDS or word in terms:
+            continue
+        terms.append(word)
+        if len(terms) == MAX_QUERY_TERMS:
+            break
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def phrase_query(text: str) -> str:
+    """Build an FTS5 query matching a text exactly, as a phrase
+
+    Args:
+        text (str): The text
+
+    Returns:
+        str: The query
+    """
+    return '"' + text.replace('"', '""') + '"'
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = RRF_K) -> list[str]:
+    """Combine rankings, scoring every text by the sum of 1 / (k + rank)
+
+    Args:
+        rankings (list[list[str]]): The rankings, best first
+        k (int): The constant dampening the weight of the top ranks
+
+    Returns:
+        list[str]: The texts of all rankings, best first
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, text in enumerate(ranking, start=1):
+            scores[text] = scores.get(text, 0.0) + 1 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def deduplicate(
+    texts: list[str], similarity: float = DUPLICATE_SIMILARITY
+) -> list[str]:
+    """Drop texts that are nearly identical to a text ranked above them
+
+    Args:
+        texts (list[str]): The texts, best first
+        similarity (float): The Jaccard similarity of their words above which
+            two texts are considered the same
+
+    Returns:
+        list[str]: The texts without near duplicates
+    """
+    kept: list[tuple[str, set[str]]] = []
+    for text in texts:
+        words = set(WORD.findall(text.lower()))
+        if any(_jaccard(words, other) >= similarity for _, other in kept):
+            continue
+        kept.append((text, words))
+    return [text for text, _ in kept]
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
@@ -1,4 +1,7 @@
 """ Milvus memory storage provider."""
+import atexit
+import threading
+
 from pymilvus import (
     connections,
     FieldSchema,
@@ -7,11 +10,25 @@ from pymilvus import (
     Collection,
 )
 
-from autogpt.memory.base import MemoryProviderSingleton, get_ada_embedding
+from autogpt.llm_utils import create_embeddings_with_ada
+from autogpt.logs import logger
+from autogpt.memory.base import MemoryProviderSingleton
+
+INDEX_PARAMS = {
+    "metric_type": "IP",
+    "index_type": "HNSW",
+    "params": {"M": 8, "efConstruction": 64},
+}
 
 
 class MilvusMemory(MemoryProviderSingleton):
-    """Milvus memory storage provider."""
+    """Milvus memory storage provider.
+
+    Added texts are buffered and inserted together, with a single embedding
+    request and a single insert, once milvus_insert_batch_size texts are
+    buffered or milvus_flush_interval seconds after the first one. Searches
+    insert the buffered texts first, so they always find every added text.
+    """
 
     def __init__(self, cfg) -> None:
         """Construct a milvus memory storage connection.
@@ -19,6 +36,7 @@ class MilvusMemory(MemoryProviderSingleton):
         Args:
             cfg (Config): Auto-GPT global config.
         """
+        self.cfg = cfg
         # connect to milvus server.
         connections.connect(address=cfg.milvus_addr)
         fields = [
@@ -30,20 +48,29 @@ class MilvusMemory(MemoryProviderSingleton):
         # create collection if not exist and load it.
         self.milvus_collection = cfg.milvus_collection
         self.schema = CollectionSchema(fields, "auto-gpt memory storage")
-        self.collection = Collection(self.milvus_collection, self.schema)
+        self.collection = self._create_collection()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _create_collection(self) -> Collection:
+        """Create the collection and its index if they don't exist, and load it.
+
+        Returns:
+            Collection: The collection.
+        """
+        collection = Collection(
+            self.milvus_collection,
+            self.schema,
+            consistency_level=self.cfg.milvus_consistency_level,
+        )
         # create index if not exist.
-        if not self.collection.has_index():
-            self.collection.release()
-            self.collection.create_index(
-                "embeddings",
-                {
-                    "metric_type": "IP",
-                    "index_type": "HNSW",
-                    "params": {"M": 8, "efConstruction": 64},
-                },
-                index_name="embeddings",
-            )
-        self.collection.load()
+        if not collection.has_index():
+            collection.release()
+            collection.create_index("embeddings", INDEX_PARAMS, index_name="embeddings")
+        collection.load()
+        return collection
 
     def add(self, data) -> str:
         """Add an embedding of data into memory.
@@ -54,13 +81,55 @@ class MilvusMemory(MemoryProviderSingleton):
         Returns:
             str: log.
         """
-        embedding = get_ada_embedding(data)
-        result = self.collection.insert([[embedding], [data]])
-        _text = (
-            "Inserting data into memory at primary key: "
-            f"{result.primary_keys[0]}:\n data: {data}"
-        )
-        return _text
+        return self.add_many([data])[0]
+
+    def add_many(self, texts: list[str]) -> list[str]:
+        """Buffer texts for insertion, inserting full batches right away.
+
+        Args:
+            texts (list[str]): The raw texts to construct embedding indexes.
+
+        Returns:
+            list[str]: A log for every text.
+        """
+        with self._lock:
+            self._buffer.extend(texts)
+            full = len(self._buffer) >= self.cfg.milvus_insert_batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(
+                    self.cfg.milvus_flush_interval, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return [
+            f"Buffered data for insertion into memory:\n data: {text}"
+            for text in texts
+        ]
+
+    def flush(self) -> None:
+        """Insert the buffered texts, in batches of milvus_insert_batch_size.
+
+        A batch leaves the buffer once it is inserted, so texts that fail to be
+        embedded or inserted are kept for the next flush.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch_size = self.cfg.milvus_insert_batch_size
+            while self._buffer:
+                batch = self._buffer[:batch_size]
+                self.collection.insert([create_embeddings_with_ada(batch), batch])
+                del self._buffer[: len(batch)]
+
+    def _flush_in_background(self) -> None:
+        """Flush from the timer thread, where errors would otherwise be lost."""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("Error inserting into Milvus: ", str(e))
 
     def get(self, data):
         """Return the most relevant data in memory.
@@ -75,18 +144,10 @@ class MilvusMemory(MemoryProviderSingleton):
         Returns:
             str: log.
         """
-        self.collection.drop()
-        self.collection = Collection(self.milvus_collection, self.schema)
-        self.collection.create_index(
-            "embeddings",
-            {
-                "metric_type": "IP",
-                "index_type": "HNSW",
-                "params": {"M": 8, "efConstruction": 64},
-            },
-            index_name="embeddings",
-        )
-        self.collection.load()
+        with self._lock:
+            self._buffer = []
+            self.collection.drop()
+            self.collection = self._create_collection()
         return "Obliviated"
 
     def get_relevant(self, data: str, num_relevant: int = 5):
@@ -99,23 +160,41 @@ class MilvusMemory(MemoryProviderSingleton):
         Returns:
             list: The top-k relevant data.
         """
-        # search the embedding and return the most relevant text.
-        embedding = get_ada_embedding(data)
+        return self.get_relevant_many([data], num_relevant)[0]
+
+    def get_relevant_many(self, texts: list[str], num_relevant: int = 5) -> list:
+        """Return the top-k relevant data of several texts, in a single search.
+
+        Args:
+            texts (list[str]): The texts to compare to.
+            num_relevant (int, optional): The max number of relevant data of
+                every text. Defaults to 5.
+
+        Returns:
+            list[list[str]]: The top-k relevant data of every text.
+        """
+        self.flush()
+        embeddings = create_embeddings_with_ada(texts)
         search_params = {
-            "metrics_type": "IP",
-            "params": {"nprobe": 8},
+            "metric_type": INDEX_PARAMS["metric_type"],
+            # HNSW looks at ef candidates, which can't be fewer than the results
+            "params": {"ef": max(self.cfg.milvus_search_ef, num_relevant)},
         }
         result = self.collection.search(
-            [embedding],
+            embeddings,
             "embeddings",
             search_params,
             num_relevant,
             output_fields=["raw_text"],
+            consistency_level=self.cfg.milvus_consistency_level,
         )
-        return [item.entity.value_of_field("raw_text") for item in result[0]]
+        return [
+            [item.entity.value_of_field("raw_text") for item in hits] for hits in result
+        ]
 
     def get_stats(self) -> str:
         """
         Returns: The stats of the milvus cache.
         """
+        self.flush()
         return f"Entities num: {self.collection.num_entities}"
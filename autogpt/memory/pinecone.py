@@ -1,9 +1,28 @@
+import hashlib
+
 import pinecone
 from colorama import Fore, Style
 
 from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
-from autogpt.llm_utils import create_embedding_with_ada
+from autogpt.llm_utils import create_embeddings_with_ada
+
+# The number of vectors embedded and upserted per request
+UPSERT_BATCH_SIZE = 100
+# The number of upsert requests sent in parallel
+UPSERT_THREADS = 4
+
+
+def vector_id(text: str) -> str:
+    """Get the id of the vector of a text, the same for the same text
+
+    Args:
+        text (str): The text
+
+    Returns:
+        str: The id
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
 class PineconeMemory(MemoryProviderSingleton):
@@ -15,11 +34,9 @@ class PineconeMemory(MemoryProviderSingleton):
         metric = "cosine"
         pod_type = "p1"
         table_name = "auto-gpt"
-        # this assumes we don't start with memory.
-        # for now this works.
-        # we'll need a more complicated and robust system if we want to start with
-        #  memory.
-        self.vec_num = 0
+        # Vectors are stored under the hash of their text, so memories of
+        # previous runs are neither overwritten nor duplicated
+        self.namespace = cfg.pinecone_namespace
 
         try:
             pinecone.whoami()
@@ -41,21 +58,40 @@ class PineconeMemory(MemoryProviderSingleton):
             pinecone.create_index(
                 table_name, dimension=dimension, metric=metric, pod_type=pod_type
             )
-        self.index = pinecone.Index(table_name)
+        self.index = pinecone.Index(table_name, pool_threads=UPSERT_THREADS)
 
     def add(self, data):
-        vector = create_embedding_with_ada(data)
-        # no metadata here. We may wish to change that long term.
-        self.index.upsert([(str(self.vec_num), vector, {"raw_text": data})])
-        _text = f"Inserting data into memory at index: {self.vec_num}:\n data: {data}"
-        self.vec_num += 1
-        return _text
+        return self.add_many([data])[0]
+
+    def add_many(self, texts):
+        """
+        Adds texts to the memory, upserting their vectors in parallel batches.
+        :param texts: The texts to add.
+        :return: A message for every text.
+        """
+        requests = []
+        for i in range(0, len(texts), UPSERT_BATCH_SIZE):
+            batch = texts[i : i + UPSERT_BATCH_SIZE]
+            vectors = [
+                (vector_id(text), vector, {"raw_text": text})
+                for text, vector in zip(batch, create_embeddings_with_ada(batch))
+            ]
+            # Embed the next batch while this one is being upserted
+            requests.append(
+                self.index.upsert(vectors, namespace=self.namespace, async_req=True)
+            )
+        for request in requests:
+            request.get()
+        return [
+            f"Inserting data into memory at id: {vector_id(text)}:\n data: {text}"
+            for text in texts
+        ]
 
     def get(self, data):
         return self.get_relevant(data, 1)
 
     def clear(self):
-        self.index.delete(deleteAll=True)
+        self.index.delete(delete_all=True, namespace=self.namespace)
         return "Obliviated"
 
     def get_relevant(self, data, num_relevant=5):
@@ -64,11 +100,15 @@ class PineconeMemory(MemoryProviderSingleton):
         :param data: The data to compare to.
         :param num_relevant: The number of relevant data to return. Defaults to 5
         """
-        query_embedding = create_embedding_with_ada(data)
+        query_embedding = create_embeddings_with_ada([data])[0]
         results = self.index.query(
-            query_embedding, top_k=num_relevant, include_metadata=True
+            query_embedding,
+            top_k=num_relevant,
+            namespace=self.namespace,
+            include_metadata=True,
         )
-        sorted_results = sorted(results.matches, key=lambda x: x.score)
+        # The higher the cosine similarity, the more relevant
+        sorted_results = sorted(results.matches, key=lambda x: x.score, reverse=True)
         return [str(item["metadata"]["raw_text"]) for item in sorted_results]
 
     def get_stats(self):
@@ -1,6 +1,8 @@
 """Redis memory provider."""
 from __future__ import annotations
 
+import asyncio
+import functools
 from typing import Any
 
 import numpy as np
@@ -12,16 +14,196 @@ from redis.commands.search.query import Query
 
 from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
-from autogpt.llm_utils import create_embedding_with_ada
+from autogpt.llm_utils import create_embeddings_with_ada
 
-SCHEMA = [
-    TextField("data"),
-    VectorField(
-        "embedding",
-        "HNSW",
-        {"TYPE": "FLOAT32", "DIM": 1536, "DISTANCE_METRIC": "COSINE"},
-    ),
-]
+# The numpy type of every vector type the index can store
+VECTOR_TYPES = {"FLOAT32": np.float32, "FLOAT16": np.float16}
+# The dimension of the embeddings
+DIMENSION = 1536
+# The number of texts embedded per request by add_many
+EMBEDDING_BATCH_SIZE = 100
+# FT.INFO sizes in megabytes reported by get_stats
+INDEX_SIZES = {
+    "vector_index_mb": "vector_index_sz_mb",
+    "text_index_mb": "inverted_sz_mb",
+    "doc_table_mb": "doc_table_size_mb",
+    "key_table_mb": "key_table_size_mb",
+}
+
+
+def index_fields(cfg) -> list:
+    """Get the fields of the index, with the configured HNSW parameters
+
+    Args:
+        cfg: The config object.
+
+    Returns:
+        list: The fields
+    """
+    return [
+        TextField("data"),
+        VectorField(
+            "embedding",
+            "HNSW",
+            {
+                "TYPE": cfg.redis_vector_type,
+                "DIM": DIMENSION,
+                "DISTANCE_METRIC": "COSINE",
+                "M": cfg.redis_hnsw_m,
+                "EF_CONSTRUCTION": cfg.redis_hnsw_ef_construction,
+                "EF_RUNTIME": cfg.redis_hnsw_ef_runtime,
+            },
+        ),
+    ]
+
+
+def index_definition(cfg) -> IndexDefinition:
+    """Get the definition of the index, covering the hashes of the memory
+
+    Args:
+        cfg: The config object.
+
+    Returns:
+        IndexDefinition: The definition
+    """
+    return IndexDefinition(prefix=[f"{cfg.memory_index}:"], index_type=IndexType.HASH)
+
+
+def embed_texts(
+    texts: list[str], dtype=np.float32, batch_size: int = EMBEDDING_BATCH_SIZE
+) -> list:
+    """Embed texts in batches, as the bytes Redis stores
+
+    Args:
+        texts (list[str]): The texts
+        dtype: The numpy type of the stored vectors
+        batch_size (int): The number of texts embedded per request
+
+    Returns:
+        list[bytes]: The embedding of every text
+    """
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        vectors.extend(create_embeddings_with_ada(texts[i : i + batch_size]))
+    return [np.array(vector).astype(dtype).tobytes() for vector in vectors]
+
+
+@functools.lru_cache(maxsize=None)
+def knn_query(num_relevant: int) -> Query:
+    """Get the query of the texts nearest to the $vector parameter
+
+    The HNSW search explores $ef_runtime candidates, at least num_relevant.
+
+    Args:
+        num_relevant (int): The number of texts to find
+
+    Returns:
+        Query: The query
+    """
+    base_query = (
+        f"*=>[KNN {num_relevant} @embedding $vector "
+        "EF_RUNTIME $ef_runtime AS vector_score]"
+    )
+    return (
+        Query(base_query)
+        .return_fields("data", "vector_score")
+        .sort_by("vector_score")
+        .paging(0, num_relevant)
+        .dialect(2)
+    )
+
+
+def query_params(cfg, vector: bytes, num_relevant: int) -> dict:
+    """Get the parameters of a KNN query
+
+    Args:
+        cfg: The config object.
+        vector (bytes): The vector to find the nearest texts of
+        num_relevant (int): The number of texts to find
+
+    Returns:
+        dict: The parameters
+    """
+    return {
+        "vector": vector,
+        "ef_runtime": max(cfg.redis_hnsw_ef_runtime, num_relevant),
+    }
+
+
+def scored_results(results, min_similarity: float) -> list[tuple[str, float]]:
+    """Get the texts of search results with their cosine similarity
+
+    Args:
+        results: The results of a KNN query
+        min_similarity (float): The similarity below which results are dropped
+
+    Returns:
+        list[tuple[str, float]]: The texts and their similarity, best first
+    """
+    scored = []
+    for result in results.docs:
+        # The cosine distance is 1 - the cosine similarity
+        similarity = 1 - float(result.vector_score)
+        if similarity >= min_similarity:
+            scored.append((result.data, similarity))
+    return scored
+
+
+def memory_stats(cfg, info: dict) -> dict:
+    """Get the size metrics of the index from its FT.INFO
+
+    Args:
+        cfg: The config object.
+        info (dict): The FT.INFO of the index
+
+    Returns:
+        dict: The number of documents, the bytes of every vector and the size of
+            the parts of the index, to plan the capacity of Redis
+    """
+    num_docs = int(info.get("num_docs", 0))
+    stats = {
+        "num_docs": num_docs,
+        "vector_type": cfg.redis_vector_type,
+        "bytes_per_vector": DIMENSION
+        * np.dtype(VECTOR_TYPES[cfg.redis_vector_type]).itemsize,
+        "hnsw": {
+            "m": cfg.redis_hnsw_m,
+            "ef_construction": cfg.redis_hnsw_ef_construction,
+            "ef_runtime": cfg.redis_hnsw_ef_runtime,
+        },
+    }
+    for name, field in INDEX_SIZES.items():
+        stats[name] = float(info.get(field) or 0)
+    stats["index_mb"] = sum(stats[name] for name in INDEX_SIZES)
+    # Including the HNSW graph, which grows with M
+    stats["vector_index_bytes_per_doc"] = (
+        stats["vector_index_mb"] * 1024 * 1024 / num_docs if num_docs else 0
+    )
+    return stats
+
+
+def insert_many(pipe, memory_index: str, start: int, texts: list[str], vectors):
+    """Queue the HSETs of texts to a pipeline, under consecutive keys
+
+    Args:
+        pipe: The Redis pipeline
+        memory_index (str): The name of the index
+        start (int): The number of the first key
+        texts (list[str]): The texts
+        vectors (list[bytes]): The embedding of every text
+
+    Returns:
+        list[str]: The message of every inserted text
+    """
+    results = []
+    for vec_num, (text, vector) in enumerate(zip(texts, vectors), start):
+        pipe.hset(
+            f"{memory_index}:{vec_num}", mapping={b"data": text, "embedding": vector}
+        )
+        results.append(
+            f"Inserting data into memory at index: {vec_num}:\n" f"data: {text}"
+        )
+    return results
 
 
 class RedisMemory(MemoryProviderSingleton):
@@ -37,7 +219,13 @@ class RedisMemory(MemoryProviderSingleton):
         redis_host = cfg.redis_host
         redis_port = cfg.redis_port
         redis_password = cfg.redis_password
-        self.dimension = 1536
+        self.dimension = DIMENSION
+        if cfg.redis_vector_type not in VECTOR_TYPES:
+            raise ValueError(
+                f"Unsupported Redis vector type {cfg.redis_vector_type}, use one of "
+                + ", ".join(VECTOR_TYPES)
+            )
+        self.dtype = VECTOR_TYPES[cfg.redis_vector_type]
         self.redis = redis.Redis(
             host=redis_host,
             port=redis_port,
@@ -65,12 +253,12 @@ class RedisMemory(MemoryProviderSingleton):
 
         if cfg.wipe_redis_on_start:
             self.redis.flushall()
+        self.index = self.redis.ft(f"{cfg.memory_index}")
         try:
-            self.redis.ft(f"{cfg.memory_index}").create_index(
-                fields=SCHEMA,
-                definition=IndexDefinition(
-                    prefix=[f"{cfg.memory_index}:"], index_type=IndexType.HASH
-                ),
+            # The parameters of an existing index don't change, it has to be
+            # wiped first
+            self.index.create_index(
+                fields=index_fields(cfg), definition=index_definition(cfg)
             )
         except Exception as e:
             print("Error creating Redis search index: ", e)
@@ -86,20 +274,31 @@ class RedisMemory(MemoryProviderSingleton):
 
         Returns: Message indicating that the data has been added.
         """
-        if "Command Error:" in data:
-            return ""
-        vector = create_embedding_with_ada(data)
-        vector = np.array(vector).astype(np.float32).tobytes()
-        data_dict = {b"data": data, "embedding": vector}
-        pipe = self.redis.pipeline()
-        pipe.hset(f"{self.cfg.memory_index}:{self.vec_num}", mapping=data_dict)
-        _text = (
-            f"Inserting data into memory at index: {self.vec_num}:\n" f"data: {data}"
+        return self.add_many([data])[0]
+
+    def add_many(self, texts: list[str]) -> list[str]:
+        """
+        Adds data points to the memory, embedding them in batches and writing
+        them in a single pipeline.
+
+        Args:
+            texts: The data to add.
+
+        Returns: A message for every data point, empty if it wasn't added.
+        """
+        to_add = [text for text in texts if "Command Error:" not in text]
+        if not to_add:
+            return [""] * len(texts)
+        vectors = embed_texts(to_add, self.dtype)
+        # Reserve the keys atomically, as other agents may share the index
+        end = self.redis.incrby(f"{self.cfg.memory_index}-vec_num", len(to_add))
+        pipe = self.redis.pipeline(transaction=False)
+        added = iter(
+            insert_many(pipe, self.cfg.memory_index, end - len(to_add), to_add, vectors)
         )
-        self.vec_num += 1
-        pipe.set(f"{self.cfg.memory_index}-vec_num", self.vec_num)
         pipe.execute()
-        return _text
+        self.vec_num = end
+        return ["" if "Command Error:" in text else next(added) for text in texts]
 
     def get(self, data: str) -> list[Any] | None:
         """
@@ -130,27 +329,164 @@ class RedisMemory(MemoryProviderSingleton):
 
         Returns: A list of the most relevant data.
         """
-        query_embedding = create_embedding_with_ada(data)
-        base_query = f"*=>[KNN {num_relevant} @embedding $vector AS vector_score]"
-        query = (
-            Query(base_query)
-            .return_fields("data", "vector_score")
-            .sort_by("vector_score")
-            .dialect(2)
+        return [text for text, _ in self.get_relevant_with_scores(data, num_relevant)]
+
+    def get_relevant_with_scores(
+        self, data: str, num_relevant: int = 5, min_similarity: float | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Returns the data most relevant to the given data, with its similarity.
+        Args:
+            data: The data to compare to.
+            num_relevant: The maximum number of relevant data to return.
+            min_similarity: The cosine similarity below which data isn't
+                relevant. Defaults to the memory_min_similarity setting.
+
+        Returns: The most relevant data and its similarity, best first.
+        """
+        if min_similarity is None:
+            min_similarity = self.cfg.memory_min_similarity
+        query_vector = embed_texts([data], self.dtype)[0]
+        try:
+            results = self.index.search(
+                knn_query(num_relevant),
+                query_params=query_params(self.cfg, query_vector, num_relevant),
+            )
+        except redis.RedisError as e:
+            logger.error("Error calling Redis search: ", str(e))
+            return []
+        return scored_results(results, min_similarity)
+
+    def get_stats(self) -> dict:
+        """
+        Returns: The number of memories and the size of the index.
+        """
+        return memory_stats(self.cfg, self.index.info())
+
+
+class AsyncRedisMemory:
+    """The Redis memory for agents sharing an event loop
+
+    The agents share a pool of connections to the index of the Redis memory.
+    Embeddings are requested in a worker thread, so they don't block the loop.
+    """
+
+    def __init__(self, cfg, max_connections: int | None = None):
+        """
+        Initializes the connection pool, without connecting yet.
+
+        Args:
+            cfg: The config object.
+            max_connections: The maximum number of open connections.
+                Defaults to the redis_max_connections setting.
+        """
+        import redis.asyncio
+
+        self.cfg = cfg
+        self.dtype = VECTOR_TYPES[cfg.redis_vector_type]
+        self.pool = redis.asyncio.ConnectionPool(
+            host=cfg.redis_host,
+            port=cfg.redis_port,
+            password=cfg.redis_password,
+            db=0,  # Cannot be changed
+            max_connections=max_connections or cfg.redis_max_connections,
         )
-        query_vector = np.array(query_embedding).astype(np.float32).tobytes()
+        self.redis = redis.asyncio.Redis(connection_pool=self.pool)
+        self.index = self.redis.ft(f"{cfg.memory_index}")
 
+    async def create_index(self) -> None:
+        """
+        Creates the index of the memory, if it doesn't exist yet.
+        """
         try:
-            results = self.redis.ft(f"{self.cfg.memory_index}").search(
-                query, query_params={"vector": query_vector}
+            await self.index.create_index(
+                fields=index_fields(self.cfg), definition=index_definition(self.cfg)
             )
-        except Exception as e:
-            print("Error calling Redis search: ", e)
-            return None
-        return [result.data for result in results.docs]
+        except redis.ResponseError as e:
+            if "Index already exists" not in str(e):
+                raise
+
+    async def add(self, data: str) -> str:
+        """
+        Adds a data point to the memory.
+
+        Args:
+            data: The data to add.
+
+        Returns: Message indicating that the data has been added.
+        """
+        return (await self.add_many([data]))[0]
+
+    async def add_many(self, texts: list[str]) -> list[str]:
+        """
+        Adds data points to the memory, embedding them in batches and writing
+        them in a single pipeline.
+
+        Args:
+            texts: The data to add.
+
+        Returns: A message for every data point, empty if it wasn't added.
+        """
+        to_add = [text for text in texts if "Command Error:" not in text]
+        if not to_add:
+            return [""] * len(texts)
+        vectors = await asyncio.to_thread(embed_texts, to_add, self.dtype)
+        end = await self.redis.incrby(f"{self.cfg.memory_index}-vec_num", len(to_add))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            added = iter(
+                insert_many(
+                    pipe, self.cfg.memory_index, end - len(to_add), to_add, vectors
+                )
+            )
+            await pipe.execute()
+        return ["" if "Command Error:" in text else next(added) for text in texts]
+
+    async def get_relevant(self, data: str, num_relevant: int = 5) -> list[Any]:
+        """
+        Returns all the data in the memory that is relevant to the given data.
+        Args:
+            data: The data to compare to.
+            num_relevant: The number of relevant data to return.
+
+        Returns: A list of the most relevant data.
+        """
+        scored = await self.get_relevant_with_scores(data, num_relevant)
+        return [text for text, _ in scored]
+
+    async def get_relevant_with_scores(
+        self, data: str, num_relevant: int = 5, min_similarity: float | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Returns the data most relevant to the given data, with its similarity.
+        Args:
+            data: The data to compare to.
+            num_relevant: The maximum number of relevant data to return.
+            min_similarity: The cosine similarity below which data isn't
+                relevant. Defaults to the memory_min_similarity setting.
+
+        Returns: The most relevant data and its similarity, best first.
+        """
+        if min_similarity is None:
+            min_similarity = self.cfg.memory_min_similarity
+        query_vector = (await asyncio.to_thread(embed_texts, [data], self.dtype))[0]
+        try:
+            results = await self.index.search(
+                knn_query(num_relevant),
+                query_params=query_params(self.cfg, query_vector, num_relevant),
+            )
+        except redis.RedisError as e:
+            logger.error("Error calling Redis search: ", str(e))
+            return []
+        return scored_results(results, min_similarity)
+
+    async def get_stats(self) -> dict:
+        """
+        Returns: The number of memories and the size of the index.
+        """
+        return memory_stats(self.cfg, await self.index.info())
 
-    def get_stats(self):
+    async def close(self) -> None:
         """
-        Returns: The stats of the memory index.
+        Closes all connections of the pool.
         """
-        return self.redis.ft(f"{self.cfg.memory_index}").info()
+        await self.pool.disconnect()
@@ -1,6 +1,10 @@
-from autogpt.config import Config
-from autogpt.memory.base import MemoryProviderSingleton, get_ada_embedding
-import uuid
+import atexit
+import functools
+import threading
+
+from autogpt.llm_utils import create_embeddings_with_ada
+from autogpt.logs import logger
+from autogpt.memory.base import MemoryProviderSingleton
 import weaviate
 from weaviate import Client
 from weaviate.embedded import EmbeddedOptions
@@ -20,8 +24,23 @@ def default_schema(weaviate_index):
     }
 
 
+@functools.lru_cache(maxsize=256)
+def cached_embedding(text):
+    # Agents keep asking about the same recent messages
+    return tuple(create_embeddings_with_ada([text])[0])
+
+
 class WeaviateMemory(MemoryProviderSingleton):
+    """Weaviate memory storage provider.
+
+    Objects are added to a long-lived batch of the client, which sends them
+    once it is full, weaviate_flush_interval seconds after the first object
+    or before a search. An object's uuid is derived from its text, so texts
+    already in the memory aren't embedded or sent again.
+    """
+
     def __init__(self, cfg):
+        self.cfg = cfg
         auth_credentials = self._build_auth_credentials(cfg)
 
         url = f'{cfg.weaviate_protocol}://{cfg.weaviate_host}:{cfg.weaviate_port}'
@@ -40,6 +59,13 @@ class WeaviateMemory(MemoryProviderSingleton):
         self.index = WeaviateMemory.format_classname(cfg.memory_index)
         self._create_schema()
 
+        self.client.batch.configure(batch_size=cfg.weaviate_batch_size, dynamic=True)
+        # The uuids of the objects added since the last flush
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
     @staticmethod
     def format_classname(index):
         # weaviate uses capitalised index names
@@ -63,27 +89,81 @@ class WeaviateMemory(MemoryProviderSingleton):
             return None
 
     def add(self, data):
-        vector = get_ada_embedding(data)
-
-        doc_uuid = generate_uuid5(data, self.index)
-        data_object = {
-            'raw_text': data
+        return self.add_many([data])[0]
+
+    def add_many(self, texts):
+        uuids = [generate_uuid5(text, self.index) for text in texts]
+        with self._lock:
+            known = self._pending | self._existing_uuids(uuids)
+            new = {}
+            for text, doc_uuid in zip(texts, uuids):
+                if doc_uuid not in known:
+                    new.setdefault(doc_uuid, text)
+            vectors = create_embeddings_with_ada(list(new.values())) if new else []
+
+            for (doc_uuid, text), vector in zip(new.items(), vectors):
+                self.client.batch.add_data_object(
+                    uuid=doc_uuid,
+                    data_object={'raw_text': text},
+                    class_name=self.index,
+                    vector=vector
+                )
+            self._pending.update(new)
+            if new and self._timer is None:
+                self._timer = threading.Timer(
+                    self.cfg.weaviate_flush_interval, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+
+        return [
+            f"Inserting data into memory at uuid: {doc_uuid}:\n data: {text}"
+            if doc_uuid in new
+            else f"Data already in memory at uuid: {doc_uuid}:\n data: {text}"
+            for text, doc_uuid in zip(texts, uuids)
+        ]
+
+    def _existing_uuids(self, uuids):
+        # A single query for all uuids, instead of checking them one by one
+        where = {
+            'operator': 'Or',
+            'operands': [
+                {'path': ['id'], 'operator': 'Equal', 'valueText': doc_uuid}
+                for doc_uuid in set(uuids)
+            ]
+        }
+        results = self.client.query.get(self.index, ['_additional { id }']) \
+                      .with_where(where) \
+                      .with_limit(len(uuids)) \
+                      .do()
+        if 'errors' in results:
+            # Treat every uuid as unknown: at worst a text is written again
+            logger.error("Error querying Weaviate: ", str(results['errors']))
+            return set()
+        return {
+            item['_additional']['id'] for item in results['data']['Get'][self.index]
         }
 
-        with self.client.batch as batch:
-            batch.add_data_object(
-                uuid=doc_uuid,
-                data_object=data_object,
-                class_name=self.index,
-                vector=vector
-            )
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.client.batch.flush()
+            self._pending = set()
 
-        return f"Inserting data into memory at uuid: {doc_uuid}:\n data: {data}"
+    def _flush_in_background(self):
+        # Errors raised on the timer thread would otherwise be lost
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("Error flushing the Weaviate batch: ", str(e))
 
     def get(self, data):
         return self.get_relevant(data, 1)
 
     def clear(self):
+        self.flush()
         self.client.schema.delete_all()
 
         # weaviate does not yet have a neat way to just remove the items in an index
@@ -94,7 +174,8 @@ class WeaviateMemory(MemoryProviderSingleton):
         return 'Obliterated'
 
     def get_relevant(self, data, num_relevant=5):
-        query_embedding = get_ada_embedding(data)
+        self.flush()
+        query_embedding = list(cached_embedding(data))
         try:
             results = self.client.query.get(self.index, ['raw_text']) \
                           .with_near_vector({'vector': query_embedding, 'certainty': 0.7}) \
@@ -111,6 +192,7 @@ class WeaviateMemory(MemoryProviderSingleton):
             return []
 
     def get_stats(self):
+        self.flush()
         result = self.client.query.aggregate(self.index) \
                      .with_meta_count() \
                      .do()
@@ -1,121 +1,271 @@
 import os
+import queue
 import sqlite3
+import threading
+from concurrent.futures import Future
+
+# Statements are constant strings so that sqlite3 prepares each of them once
+CREATE_TABLE = "CREATE VIRTUAL TABLE IF NOT EXISTS text USING FTS5 \
+    (session UNINDEXED, key UNINDEXED, block);"
+SELECT_MAX_SESSION = "SELECT MAX(session) FROM text;"
+SELECT_MAX_KEY = "SELECT MAX(key) FROM text WHERE session = ?;"
+INSERT = "REPLACE INTO text(session, key, block) VALUES (?, ?, ?);"
+DELETE = "DELETE FROM text WHERE session = ? AND key = ?;"
+SELECT_SESSION = "SELECT block FROM text WHERE session = ?;"
+SEARCH = "SELECT block FROM text WHERE block MATCH ? \
+    ORDER BY bm25(text) LIMIT ?;"
+SEARCH_SESSION = "SELECT block FROM text WHERE block MATCH ? AND session = ? \
+    ORDER BY bm25(text) LIMIT ?;"
+
+# The number of rows written per transaction by insert_many
+INSERT_BATCH_SIZE = 500
+# The number of queued writes the writer thread commits together
+WRITE_BATCH_SIZE = 64
+# How long a connection waits for a lock held by another one
+BUSY_TIMEOUT_MS = 5000
+
+
+def escape_query(text):
+    """Turn a text into an FTS5 query matching all of its words
+
+    Every word is quoted, so that quotes and FTS5 operators in the text are
+    matched literally instead of making the query invalid.
+
+    Args:
+        text (str): The text to search for
+
+    Returns:
+        str: The FTS5 query
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
 
 
 class MemoryDB:
+    """The permanent memory, a SQLite FTS5 table of texts
+
+    The database is opened on first use. Every thread reads through its own
+    connection, which WAL mode lets run in parallel with each other and with
+    the single writer thread. Writes are queued to that thread, which commits
+    the writes queued at the same time in one transaction.
+    """
+
     def __init__(self, db=None):
         self.db_file = db
         if db is None:  # No db filename supplied...
             self.db_file = f"{os.getcwd()}/mem.sqlite3"  # Use default filename
-        # Get the db connection object, making the file and tables if needed.
-        try:
-            self.cnx = sqlite3.connect(self.db_file)
-        except Exception as e:
-            print("Exception connecting to memory database file:", e)
-            self.cnx = None
-        finally:
-            if self.cnx is None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._writes = queue.Queue()
+        self._writer = None
+        # An in-memory db is private to its connection, so all threads share one
+        self._shared_cnx = None
+        self._session_id = None
+        self._next_key = 0
+
+    def connect(self):
+        cnx = sqlite3.connect(self.db_file, check_same_thread=False)
+        # Readers don't block the writer, and a commit doesn't wait for the
+        # disk; a power loss may lose the last commits but can't corrupt the db
+        cnx.execute("PRAGMA journal_mode=WAL;")
+        cnx.execute("PRAGMA synchronous=NORMAL;")
+        cnx.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+        return cnx
+
+    def _start(self):
+        """Open the database and start the writer thread, once"""
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is not None:
+                return
+            # Get the db connection object, making the file and tables if needed.
+            try:
+                cnx = self.connect()
+            except Exception as e:
+                print("Exception connecting to memory database file:", e)
                 # As last resort, open in dynamic memory. Won't be persistent.
                 self.db_file = ":memory:"
-            self.cnx = sqlite3.connect(self.db_file)
-            self.cnx.execute(
-                "CREATE VIRTUAL TABLE \
-                IF NOT EXISTS text USING FTS5 \
-                (session, \
-                 key, \
-                 block);"
+                cnx = self.connect()
+            if self.db_file == ":memory:":
+                self._shared_cnx = cnx
+            self._connections.append(cnx)
+            cnx.execute(CREATE_TABLE)
+            cnx.commit()
+            if self._session_id is None:
+                max_id = cnx.execute(SELECT_MAX_SESSION).fetchone()[0]
+                self._session_id = (max_id or 0) + 1
+            max_key = cnx.execute(SELECT_MAX_KEY, (self._session_id,)).fetchone()[0]
+            self._next_key = 0 if max_key is None else int(max_key) + 1
+            self._writer = threading.Thread(
+                target=self._write_queued, args=(cnx,), name="memory-db", daemon=True
             )
-            self.session_id = int(self.get_max_session_id()) + 1
-            self.cnx.commit()
+            self._writer.start()
 
     def get_cnx(self):
-        if self.cnx is None:
-            self.cnx = sqlite3.connect(self.db_file)
-        return self.cnx
+        """Get the connection the current thread reads through"""
+        self._start()
+        if self._shared_cnx is not None:
+            return self._shared_cnx
+        cnx = getattr(self._local, "cnx", None)
+        if cnx is None:
+            cnx = self._local.cnx = self.connect()
+            with self._lock:
+                self._connections.append(cnx)
+        return cnx
+
+    def _read(self, cmd_str, params=()):
+        cnx = self.get_cnx()
+        if cnx is self._shared_cnx:
+            with self._lock:
+                return cnx.execute(cmd_str, params).fetchall()
+        return cnx.execute(cmd_str, params).fetchall()
+
+    def _write(self, write):
+        """Run a write on the writer thread and wait for it to be committed
+
+        Args:
+            write (Callable[[sqlite3.Connection], None]): The write
+
+        Returns:
+            The result of the write
+        """
+        self._start()
+        done = Future()
+        self._writes.put((write, done))
+        return done.result()
+
+    def _write_queued(self, cnx):
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if self._shared_cnx is not None:
+                with self._lock:
+                    self._commit(cnx, batch)
+            else:
+                self._commit(cnx, batch)
+            if stop:
+                return
+
+    @staticmethod
+    def _commit(cnx, batch):
+        try:
+            with cnx:
+                results = [write(cnx) for write, _ in batch]
+        except Exception:
+            # Find the failing writes by committing each on its own
+            for write, done in batch:
+                try:
+                    with cnx:
+                        done.set_result(write(cnx))
+                except Exception as e:
+                    done.set_exception(e)
+        else:
+            for (_, done), result in zip(batch, results):
+                done.set_result(result)
+
+    # The session new texts are inserted into. Changing it picks up its keys.
+    @property
+    def session_id(self):
+        self._start()
+        return self._session_id
+
+    @session_id.setter
+    def session_id(self, session_id):
+        max_key = self._read(SELECT_MAX_KEY, (session_id,))[0][0]
+        with self._lock:
+            self._session_id = session_id
+            self._next_key = 0 if max_key is None else int(max_key) + 1
 
     # Get the highest session id. Initially 0.
     def get_max_session_id(self):
-        id = None
-        cmd_str = f"SELECT MAX(session) FROM text;"
-        cnx = self.get_cnx()
-        max_id = cnx.execute(cmd_str).fetchone()[0]
+        max_id = self._read(SELECT_MAX_SESSION)[0][0]
         if max_id is None:  # New db, session 0
-            id = 0
-        else:
-            id = max_id
-        return id
+            return 0
+        return max_id
 
     # Get next key id for inserting text into db.
     def get_next_key(self):
-        next_key = None
-        cmd_str = f"SELECT MAX(key) FROM text \
-            where session = {self.session_id};"
-        cnx = self.get_cnx()
-        next_key = cnx.execute(cmd_str).fetchone()[0]
-        if next_key is None:  # First key
-            next_key = 0
-        else:
-            next_key = int(next_key) + 1
-        return next_key
+        self._start()
+        return self._next_key
 
     # Insert new text into db.
     def insert(self, text=None):
         if text is not None:
-            key = self.get_next_key()
-            session_id = self.session_id
-            cmd_str = f"REPLACE INTO text(session, key, block) \
-                VALUES (?, ?, ?);"
-            cnx = self.get_cnx()
-            cnx.execute(cmd_str, (session_id, key, text))
-            cnx.commit()
+            self.insert_many([text])
+
+    # Insert texts into db, writing a transaction per batch.
+    def insert_many(self, texts, batch_size=INSERT_BATCH_SIZE):
+        self._start()
+        texts = list(texts)
+        for i in range(0, len(texts), batch_size):
+            with self._lock:
+                session_id, key = self._session_id, self._next_key
+                self._next_key += len(texts[i : i + batch_size])
+            rows = [
+                (session_id, key + j, text)
+                for j, text in enumerate(texts[i : i + batch_size])
+            ]
+            self._write(lambda cnx, rows=rows: cnx.executemany(INSERT, rows))
 
     # Overwrite text at key.
     def overwrite(self, key, text):
-        self.delete_memory(key)
         session_id = self.session_id
-        cmd_str = f"REPLACE INTO text(session, key, block) \
-            VALUES (?, ?, ?);"
-        cnx = self.get_cnx()
-        cnx.execute(cmd_str, (session_id, key, text))
-        cnx.commit()
+
+        def overwrite(cnx):
+            cnx.execute(DELETE, (session_id, key))
+            cnx.execute(INSERT, (session_id, key, text))
+
+        self._write(overwrite)
+        with self._lock:
+            self._next_key = max(self._next_key, int(key) + 1)
 
     def delete_memory(self, key, session_id=None):
         session = session_id
         if session is None:
             session = self.session_id
-        cmd_str = f"DELETE FROM text WHERE session = {session} AND key = {key};"
-        cnx = self.get_cnx()
-        cnx.execute(cmd_str)
-        cnx.commit()
+        self._write(lambda cnx: cnx.execute(DELETE, (session, key)))
 
-    def search(self, text):
-        cmd_str = f"SELECT * FROM text('{text}')"
-        cnx = self.get_cnx()
-        rows = cnx.execute(cmd_str).fetchall()
-        lines = []
-        for r in rows:
-            lines.append(r[2])
-        return lines
+    # Get the texts of all sessions containing all words of a text, best first.
+    def search(self, text, limit=10):
+        query = escape_query(text)
+        if not query:
+            return []
+        return [r[0] for r in self._read(SEARCH, (query, limit))]
+
+    # Get the best matches of an FTS5 query in a session, best first.
+    def search_ranked(self, query, limit=10, session_id=None):
+        session = session_id
+        if session is None:
+            session = self.session_id
+        return [r[0] for r in self._read(SEARCH_SESSION, (query, session, limit))]
 
     # Get entire session text. If no id supplied, use current session id.
     def get_session(self, id=None):
         if id is None:
             id = self.session_id
-        cmd_str = f"SELECT * FROM text where session = {id}"
-        cnx = self.get_cnx()
-        rows = cnx.execute(cmd_str).fetchall()
-        lines = []
-        for r in rows:
-            lines.append(r[2])
-        return lines
+        return [r[0] for r in self._read(SELECT_SESSION, (id,))]
 
-    # Commit and close the database connection.
+    # Commit the queued writes and close the database connections.
     def quit(self):
-        self.cnx.commit()
-        self.cnx.close()
-
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        with self._lock:
+            for cnx in self._connections:
+                cnx.close()
+            self._connections = []
+            self._local = threading.local()
+            self._shared_cnx = None
+            self._writer = None
 
-permanent_memory = MemoryDB()
 
 # Remember us fondly, children of our minds
 # Forgive us our faults, our tantrums, our fears
@@ -0,0 +1,193 @@
+"""Background processes started by the agent, with their output in log files"""
+from __future__ import annotations
+
+import logging
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import IO
+
+from autogpt.processing.output import READ_SIZE, kill_process
+
+
+class TooManyJobs(Exception):
+    """Raised when starting a job while the maximum number of jobs are running"""
+
+
+@dataclass
+class Job:
+    """A background process and the log file its output goes to"""
+
+    id: int
+    command_line: str
+    process: subprocess.Popen
+    log_path: Path
+    started: float = field(default_factory=time.time)
+    ended: float | None = None
+    killed: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self.process.poll() is None
+
+    def describe(self) -> str:
+        """Describe the state of the job
+
+        Returns:
+            str: The description
+        """
+        if self.running:
+            state = f"running for {time.time() - self.started:.0f}s"
+        elif self.killed:
+            state = "killed"
+        else:
+            duration = (self.ended or time.time()) - self.started
+            state = (
+                f"exited with code {self.process.returncode} after {duration:.0f}s"
+            )
+        return (
+            f"Job {self.id} (PID {self.process.pid}) `{self.command_line}` is {state}."
+            f" Output is logged to '{self.log_path.parent.name}/{self.log_path.name}'."
+        )
+
+
+class ProcessManager:
+    """Starts background jobs and keeps track of them
+
+    The output of every job is written to a log file that is rotated once it
+    grows too large, so a long-running job can't fill the disk.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_jobs: int = 4,
+        max_log_bytes: int = 1024 * 1024,
+        log_backups: int = 2,
+    ) -> None:
+        """Initialize the manager
+
+        Args:
+            log_dir (Path): The directory to write the logs of jobs to
+            max_jobs (int): The maximum number of jobs running at the same time
+            max_log_bytes (int): The size at which a log file is rotated
+            log_backups (int): The number of rotated log files to keep per job
+        """
+        self.log_dir = log_dir
+        self.max_jobs = max_jobs
+        self.max_log_bytes = max_log_bytes
+        self.log_backups = log_backups
+        self.jobs: dict[int, Job] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def start(self, command_line: str, cwd: Path) -> Job:
+        """Start a shell command in the background
+
+        Args:
+            command_line (str): The command line to execute
+            cwd (Path): The directory to execute the command in
+
+        Returns:
+            Job: The started job
+
+        Raises:
+            TooManyJobs: If the maximum number of jobs are already running
+        """
+        with self._lock:
+            running = sum(job.running for job in self.jobs.values())
+            if running >= self.max_jobs:
+                raise TooManyJobs(
+                    f"{running} jobs are already running, wait for one to finish"
+                    " or kill one before starting another"
+                )
+            job_id = self._next_id
+            self._next_id += 1
+
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            log_path = self.log_dir / f"job-{job_id}.log"
+            process = subprocess.Popen(
+                command_line,
+                shell=True,
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            job = Job(job_id, command_line, process, log_path)
+            self.jobs[job_id] = job
+
+        threading.Thread(
+            target=self._log_output,
+            args=(job, process.stdout),
+            name=f"job-{job_id}",
+            daemon=True,
+        ).start()
+        return job
+
+    def get(self, job_id: int | str) -> Job:
+        """Get a job by its ID
+
+        Args:
+            job_id (int | str): The ID of the job
+
+        Returns:
+            Job: The job
+
+        Raises:
+            KeyError: If there is no job with the ID
+        """
+        try:
+            return self.jobs[int(job_id)]
+        except (KeyError, ValueError):
+            raise KeyError(f"No job with ID {job_id}") from None
+
+    def kill(self, job_id: int | str) -> Job:
+        """Kill a job and the processes it started
+
+        Args:
+            job_id (int | str): The ID of the job
+
+        Returns:
+            Job: The job
+        """
+        job = self.get(job_id)
+        if job.running:
+            job.killed = True
+            kill_process(job.process)
+            job.process.wait()
+        return job
+
+    def kill_all(self) -> None:
+        """Kill all running jobs"""
+        for job_id, job in list(self.jobs.items()):
+            if job.running:
+                self.kill(job_id)
+
+    def _log_output(self, job: Job, stream: IO[bytes]) -> None:
+        handler = RotatingFileHandler(
+            job.log_path,
+            maxBytes=self.max_log_bytes,
+            backupCount=self.log_backups,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        # Output is written as it comes, not as one record per line
+        handler.terminator = ""
+        try:
+            with stream:
+                while data := stream.readline(READ_SIZE):
+                    handler.emit(
+                        logging.makeLogRecord(
+                            {"msg": data.decode("utf-8", errors="replace")}
+                        )
+                    )
+                    handler.flush()
+            job.process.wait()
+            job.ended = time.time()
+        finally:
+            handler.close()
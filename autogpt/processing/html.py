@@ -1,8 +1,79 @@
 """HTML processing functions"""
 from __future__ import annotations
 
+import re
+from typing import TYPE_CHECKING
+
+import lxml.html
+from lxml import etree
 from requests.compat import urljoin
-from bs4 import BeautifulSoup
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Elements whose content is never part of the readable text of a page
+BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "canvas",
+    "iframe",
+    "object",
+    "embed",
+)
+
+# Line boundaries as recognized by str.splitlines(), and pairs of spaces
+PHRASE_SEPARATOR = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]| {2}")
+
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+
+
+def extract_page(html: str, base_url: str) -> tuple[str, list[tuple[str, str]]]:
+    """Parse a page once and extract both its text and its hyperlinks
+
+    Args:
+        html (str): The HTML of the page
+        base_url (str): The base URL to resolve relative links against
+
+    Returns:
+        tuple[str, list[tuple[str, str]]]: The text of the page and the
+            (link text, link URL) pairs of its hyperlinks
+    """
+    try:
+        document = lxml.html.document_fromstring(
+            html.encode("utf-8", errors="replace"), parser=HTML_PARSER
+        )
+    except (etree.ParserError, ValueError):
+        # Raised for documents without any content
+        return "", []
+
+    etree.strip_elements(
+        document, etree.ProcessingInstruction, *BOILERPLATE_TAGS, with_tail=False
+    )
+
+    hyperlinks = [
+        (link.text_content(), urljoin(base_url, link.get("href")))
+        for link in document.iter("a")
+        if link.get("href") is not None
+    ]
+
+    return normalize_text("".join(document.itertext())), hyperlinks
+
+
+def normalize_text(text: str) -> str:
+    """Put every phrase of a text on its own line, dropping blank ones
+
+    Args:
+        text (str): The raw text content of a page
+
+    Returns:
+        str: The normalized text
+    """
+    return "\n".join(
+        phrase for phrase in map(str.strip, PHRASE_SEPARATOR.split(text)) if phrase
+    )
 
 
 def extract_hyperlinks(soup: BeautifulSoup, base_url: str) -> list[tuple[str, str]]:
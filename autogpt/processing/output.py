@@ -0,0 +1,236 @@
+"""Bounded capture of the output of processes"""
+from __future__ import annotations
+
+import codecs
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import IO
+
+import tiktoken
+
+# The number of bytes read from a pipe at once
+READ_SIZE = 64 * 1024
+# The number of bytes kept per token of output budget, with room to spare
+BYTES_PER_TOKEN = 8
+# How long the output of a killed session may take to be closed
+KILL_GRACE_PERIOD = 1.0
+
+
+class HeadTailBuffer:
+    """Keeps the first and the last bytes written to it, dropping the middle"""
+
+    def __init__(self, head_size: int, tail_size: int) -> None:
+        """Initialize the buffer
+
+        Args:
+            head_size (int): The number of bytes to keep from the start
+            tail_size (int): The number of bytes to keep from the end
+        """
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """Add data to the buffer
+
+        Args:
+            data (bytes): The data
+        """
+        self.total += len(data)
+        if len(self._head) < self.head_size:
+            room = self.head_size - len(self._head)
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self._tail += data[-self.tail_size :] if self.tail_size else b""
+        if len(self._tail) > self.tail_size:
+            del self._tail[: len(self._tail) - self.tail_size]
+
+    @property
+    def dropped(self) -> int:
+        """The number of bytes that were dropped from the middle"""
+        return self.total - len(self._head) - len(self._tail)
+
+    def decode(self) -> str:
+        """Decode the kept bytes, marking where bytes were dropped
+
+        Returns:
+            str: The decoded text
+        """
+        if not self.dropped:
+            return bytes(self._head + self._tail).decode("utf-8", "replace")
+
+        # Don't produce replacement characters for sequences cut in half
+        head = codecs.getincrementaldecoder("utf-8")("replace").decode(
+            bytes(self._head)
+        )
+        tail = bytes(self._tail)
+        start = 0
+        while start < min(len(tail), 3) and tail[start] & 0xC0 == 0x80:
+            start += 1
+        tail = tail[start:].decode("utf-8", "replace")
+        return f"{head}\n... {self.dropped} bytes of output omitted ...\n{tail}"
+
+
+@dataclass
+class CapturedOutput:
+    """The output of a process and how it ended"""
+
+    returncode: int | None
+    stdout: HeadTailBuffer
+    stderr: HeadTailBuffer
+    # Why the process was killed, if it was
+    killed_reason: str | None = None
+
+
+def capture_process(
+    process: subprocess.Popen,
+    timeout: float | None,
+    max_bytes: int,
+    buffer_size: int,
+) -> CapturedOutput:
+    """Read the output of a process until it ends, keeping memory use bounded
+
+    The process is killed if it runs for longer than the timeout or writes more
+    than the maximum amount of output. It should be started in a new session
+    so that its children are killed along with it. Children left running in
+    the background that keep the output open are killed at the timeout too.
+
+    Args:
+        process (subprocess.Popen): The process, with its stdout and stderr piped
+        timeout (float | None): The number of seconds the process may run for
+        max_bytes (int): The amount of output after which the process is killed
+        buffer_size (int): The number of bytes kept from the start and from the
+            end of each stream
+
+    Returns:
+        CapturedOutput: The captured output
+    """
+    captured = CapturedOutput(
+        None,
+        HeadTailBuffer(buffer_size, buffer_size),
+        HeadTailBuffer(buffer_size, buffer_size),
+    )
+    lock = threading.Lock()
+    # Set once the output is returned, while readers may still be blocked
+    stopped = threading.Event()
+
+    def read(stream: IO[bytes] | None, buffer: HeadTailBuffer) -> None:
+        if stream is None:
+            return
+        with stream:
+            while data := stream.read1(READ_SIZE):
+                with lock:
+                    if stopped.is_set():
+                        return
+                    buffer.write(data)
+                    total = captured.stdout.total + captured.stderr.total
+                    if total > max_bytes and not captured.killed_reason:
+                        captured.killed_reason = (
+                            f"Process killed after writing more than {max_bytes}"
+                            " bytes of output"
+                        )
+                        kill_process(process)
+
+    readers = [
+        threading.Thread(target=read, args=(process.stdout, captured.stdout)),
+        threading.Thread(target=read, args=(process.stderr, captured.stderr)),
+    ]
+    for reader in readers:
+        reader.daemon = True
+        reader.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        with lock:
+            captured.killed_reason = (
+                f"Process killed after running for {timeout} seconds"
+            )
+        kill_process(process)
+        process.wait()
+
+    # Children in the background may still hold the pipes open
+    if not join_all(readers, deadline):
+        with lock:
+            captured.killed_reason = captured.killed_reason or (
+                f"Background processes killed after running for {timeout} seconds"
+            )
+        kill_process(process)
+        join_all(readers, time.monotonic() + KILL_GRACE_PERIOD)
+    with lock:
+        stopped.set()
+
+    captured.returncode = process.returncode
+    return captured
+
+
+def join_all(threads: list[threading.Thread], deadline: float | None) -> bool:
+    """Wait for threads to end, until a deadline
+
+    Args:
+        threads (list[threading.Thread]): The threads
+        deadline (float | None): The time.monotonic() to wait until, None to
+            wait for as long as it takes
+
+    Returns:
+        bool: Whether all threads ended
+    """
+    for thread in threads:
+        thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+    return not any(thread.is_alive() for thread in threads)
+
+
+def kill_process(process: subprocess.Popen) -> None:
+    """Kill a process and, where possible, the other processes of its session
+
+    Args:
+        process (subprocess.Popen): The process
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        # Already gone, or not the leader of its own session
+        process.kill()
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Shorten a text to a number of tokens, keeping its start and its end
+
+    Args:
+        text (str): The text
+        max_tokens (int): The maximum number of tokens to keep
+        model (str): The model whose tokenizer to count tokens with
+
+    Returns:
+        str: The text, with its middle replaced by a note if it was too long
+    """
+    # Texts this short can't be over the limit
+    if len(text) <= max_tokens:
+        return text
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+
+    head = max_tokens // 2
+    tail = max_tokens - head
+    return (
+        encoding.decode(tokens[:head])
+        + f"\n... {len(tokens) - max_tokens} tokens of output omitted ...\n"
+        + encoding.decode(tokens[-tail:] if tail else [])
+    )
@@ -1,12 +1,15 @@
 """Text processing functions"""
-from typing import Generator, Optional, Dict
-from selenium.webdriver.remote.webdriver import WebDriver
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generator, Optional, Dict
 from autogpt.memory import get_memory
 from autogpt.config import Config
 from autogpt.llm_utils import create_chat_completion
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 CFG = Config()
-MEMORY = get_memory(CFG)
 
 
 def split_text(text: str, max_length: int = 8192) -> Generator[str, None, None]:
@@ -59,6 +62,8 @@ def summarize_text(
     text_length = len(text)
     print(f"Text length: {text_length} characters")
 
+    # The memory is only connected to once something is summarized
+    memory = get_memory(CFG)
     summaries = []
     chunks = list(split_text(text))
     scroll_ratio = 1 / len(chunks)
@@ -70,7 +75,7 @@ def summarize_text(
 
         memory_to_add = f"Source: {url}\n" f"Raw content part#{i + 1}: {chunk}"
 
-        MEMORY.add(memory_to_add)
+        memory.add(memory_to_add)
 
         print(f"Summarizing chunk {i + 1} / {len(chunks)}")
         messages = [create_message(chunk, question)]
@@ -84,7 +89,7 @@ def summarize_text(
 
         memory_to_add = f"Source: {url}\n" f"Content summary part#{i + 1}: {summary}"
 
-        MEMORY.add(memory_to_add)
+        memory.add(memory_to_add)
 
     print(f"Summarized {len(chunks)} chunks.")
 
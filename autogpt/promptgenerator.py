@@ -31,6 +31,25 @@ class PromptGenerator:
             "command": {"name": "command name", "args": {"arg name": "value"}},
         }
 
+    def set_max_commands(self, max_commands: int) -> None:
+        """
+        Set how many commands the AI may respond with at once. With more than one,
+            the response format asks for a list of commands, which are executed
+            concurrently.
+
+        Args:
+            max_commands (int): The maximum number of commands per response.
+        """
+        if max_commands <= 1 or "commands" in self.response_format:
+            return
+        command = self.response_format.pop("command")
+        self.response_format["commands"] = [command]
+        self.add_constraint(
+            f"You may respond with up to {max_commands} commands at once. They are"
+            " executed at the same time, so only combine commands that don't depend"
+            " on each other's results."
+        )
+
     def add_constraint(self, constraint: str) -> None:
         """
         Add a constraint to the constraints list.
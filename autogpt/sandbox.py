@@ -0,0 +1,298 @@
+"""Sandboxes that run Python files from the workspace"""
+from __future__ import annotations
+
+import abc
+import os
+import subprocess
+import sys
+import threading
+
+import docker
+from docker.errors import DockerException, ImageNotFound
+
+from autogpt.config import Config
+from autogpt.processing.output import (
+    BYTES_PER_TOKEN,
+    HeadTailBuffer,
+    capture_process,
+)
+from autogpt.workspace import WORKSPACE_PATH
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Exit codes of a process killed by `timeout -s KILL` or by a SIGKILL
+KILLED_EXIT_CODES = (124, 137, -9)
+
+
+class Sandbox(abc.ABC):
+    """A place to run Python files from the workspace"""
+
+    def __init__(
+        self,
+        timeout: float = 60,
+        cpus: float = 1.0,
+        memory: str = "512m",
+        max_output_bytes: int = 10 * 1024 * 1024,
+        output_buffer_size: int = 8000,
+    ) -> None:
+        """Initialize the sandbox
+
+        Args:
+            timeout (float): The number of seconds a file may run for
+            cpus (float): The number of CPUs a file may use
+            memory (str): The amount of memory a file may use, e.g. "512m"
+            max_output_bytes (int): The amount of output after which a file is
+                killed
+            output_buffer_size (int): The number of bytes of output kept from the
+                start and from the end of a run
+        """
+        self.timeout = timeout
+        self.cpus = cpus
+        self.memory = memory
+        self.max_output_bytes = max_output_bytes
+        self.output_buffer_size = output_buffer_size
+
+    @abc.abstractmethod
+    def run(self, file: str) -> tuple[int, str]:
+        """Run a Python file
+
+        Args:
+            file (str): The path of the file, relative to the workspace
+
+        Returns:
+            tuple[int, str]: The exit code and the output of the file. If the file
+                was killed the output ends with the reason.
+        """
+
+    def close(self) -> None:
+        """Release the resources held by the sandbox"""
+
+
+class LocalSandbox(Sandbox):
+    """Runs files in a subprocess, limited with resource limits where available"""
+
+    def run(self, file: str) -> tuple[int, str]:
+        process = subprocess.Popen(
+            [sys.executable, file],
+            cwd=WORKSPACE_PATH,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            preexec_fn=self._limit_resources if resource else None,
+            start_new_session=True,
+        )
+        captured = capture_process(
+            process, self.timeout, self.max_output_bytes, self.output_buffer_size
+        )
+        output = captured.stdout.decode()
+        if captured.killed_reason:
+            output = f"{output}\n{captured.killed_reason}"
+        return captured.returncode, output
+
+    def _limit_resources(self) -> None:
+        cpu_seconds = int(self.timeout * max(self.cpus, 1)) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        memory = parse_memory(self.memory)
+        if memory:
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+class DockerSandboxPool(Sandbox):
+    """Runs files in a pool of long-lived containers
+
+    Containers are started once and files are run in them with `exec_run`, so
+    a run costs a process start instead of a container start. The workspace is
+    mounted read-only and a container is cleaned up after every run. Containers
+    that can't be cleaned up are replaced.
+    """
+
+    def __init__(
+        self,
+        image: str = "python:3-alpine",
+        size: int = 1,
+        **limits,
+    ) -> None:
+        """Initialize the pool, whose containers are started when first needed
+
+        Args:
+            image (str): The Docker image to run files in
+            size (int): The maximum number of containers to keep running
+            **limits: The limits of the sandbox, see Sandbox
+        """
+        super().__init__(**limits)
+        self.image = image
+        self._client = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(size, 1))
+        self._idle = []
+
+    def run(self, file: str) -> tuple[int, str]:
+        with self._slots:
+            container = self._take()
+            try:
+                exit_code, output, killed_reason = self._exec(container, file)
+            except BaseException:
+                self._remove(container)
+                raise
+            self._give_back(container)
+
+        if exit_code in KILLED_EXIT_CODES and not killed_reason:
+            killed_reason = (
+                f"Process killed after running for {self.timeout} seconds"
+                " or running out of memory"
+            )
+        if killed_reason:
+            output = f"{output}\n{killed_reason}"
+        return exit_code, output
+
+    def _exec(self, container, file: str) -> tuple[int | None, str, str | None]:
+        api = self.client.api
+        exec_id = api.exec_create(
+            container.id,
+            ["timeout", "-s", "KILL", str(int(self.timeout)), "python", file],
+            workdir="/workspace",
+        )["Id"]
+
+        buffer = HeadTailBuffer(self.output_buffer_size, self.output_buffer_size)
+        killed_reason = None
+        for chunk in api.exec_start(exec_id, stream=True):
+            if killed_reason:
+                # Drain what was written before the kill, until the stream ends
+                continue
+            buffer.write(chunk)
+            if buffer.total > self.max_output_bytes:
+                killed_reason = (
+                    f"Process killed after writing more than {self.max_output_bytes}"
+                    " bytes of output"
+                )
+                container.exec_run(["sh", "-c", "kill -9 -1"], user="root")
+        exit_code = api.exec_inspect(exec_id)["ExitCode"]
+        return exit_code, buffer.decode(), killed_reason
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for container in idle:
+            self._remove(container)
+
+    @property
+    def client(self) -> docker.DockerClient:
+        if self._client is None:
+            self._client = docker.from_env()
+            self._pull_image()
+        return self._client
+
+    def _pull_image(self) -> None:
+        try:
+            self._client.images.get(self.image)
+            print(f"Image '{self.image}' found locally")
+        except ImageNotFound:
+            print(f"Image '{self.image}' not found locally, pulling from Docker Hub")
+            # Use the low-level API to stream the pull response
+            low_level_client = docker.APIClient()
+            for line in low_level_client.pull(self.image, stream=True, decode=True):
+                # Print the status and progress, if available
+                status = line.get("status")
+                progress = line.get("progress")
+                if status and progress:
+                    print(f"{status}: {progress}")
+                elif status:
+                    print(status)
+
+    def _take(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                container = self._idle.pop()
+            try:
+                container.reload()
+                if container.status == "running":
+                    return container
+            except DockerException:
+                pass
+            self._remove(container)
+        return self._start()
+
+    def _start(self):
+        return self.client.containers.run(
+            self.image,
+            ["sleep", "infinity"],
+            volumes={
+                os.path.abspath(WORKSPACE_PATH): {
+                    "bind": "/workspace",
+                    "mode": "ro",
+                }
+            },
+            working_dir="/workspace",
+            nano_cpus=int(self.cpus * 1e9),
+            mem_limit=self.memory,
+            detach=True,
+            auto_remove=True,
+        )
+
+    def _give_back(self, container) -> None:
+        try:
+            # Kill everything but the sleep keeping the container alive, and
+            # remove files the previous run left behind
+            container.exec_run(
+                ["sh", "-c", "kill -9 -1; rm -rf /tmp/* /tmp/.[!.]* /root/*"],
+                user="root",
+            )
+        except DockerException:
+            self._remove(container)
+            return
+        with self._lock:
+            self._idle.append(container)
+
+    @staticmethod
+    def _remove(container) -> None:
+        try:
+            container.remove(force=True)
+        except DockerException:
+            pass
+
+
+def parse_memory(memory: str) -> int:
+    """Parse a Docker style amount of memory, like "512m", into bytes
+
+    Args:
+        memory (str): The amount of memory, with an optional b, k, m or g suffix
+
+    Returns:
+        int: The number of bytes, 0 if no amount is given
+    """
+    if not memory:
+        return 0
+    units = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+    memory = memory.strip().lower()
+    if memory[-1] in units:
+        return int(float(memory[:-1]) * units[memory[-1]])
+    return int(memory)
+
+
+def create_sandbox(config: Config, local: bool = False) -> Sandbox:
+    """Create the sandbox selected in the configuration
+
+    Args:
+        config (Config): The configuration
+        local (bool): Run files in a subprocess whatever the configuration says,
+            e.g. because Auto-GPT itself already runs in a container
+
+    Returns:
+        Sandbox: The sandbox
+    """
+    limits = {
+        "timeout": config.sandbox_timeout,
+        "cpus": config.sandbox_cpus,
+        "memory": config.sandbox_memory,
+        "max_output_bytes": config.execute_output_max_bytes,
+        "output_buffer_size": config.execute_output_max_tokens * BYTES_PER_TOKEN,
+    }
+    if local or config.execute_python_sandbox == "local":
+        return LocalSandbox(**limits)
+    return DockerSandboxPool(
+        config.sandbox_image, size=config.sandbox_pool_size, **limits
+    )
@@ -1,25 +1,17 @@
 """ Text to speech module """
-from autogpt.config import Config
+from __future__ import annotations
 
+import functools
 import threading
 from threading import Semaphore
-from autogpt.speech.brian import BrianSpeech
-from autogpt.speech.macos_tts import MacOSTTS
-from autogpt.speech.gtts import GTTSVoice
-from autogpt.speech.eleven_labs import ElevenLabsSpeech
+from typing import TYPE_CHECKING
+
+from autogpt.config import Config
 
+if TYPE_CHECKING:
+    from autogpt.speech.base import VoiceBase
 
 CFG = Config()
-DEFAULT_VOICE_ENGINE = GTTSVoice()
-VOICE_ENGINE = None
-if CFG.elevenlabs_api_key:
-    VOICE_ENGINE = ElevenLabsSpeech()
-elif CFG.use_mac_os_tts == "True":
-    VOICE_ENGINE = MacOSTTS()
-elif CFG.use_brian_tts == "True":
-    VOICE_ENGINE = BrianSpeech()
-else:
-    VOICE_ENGINE = GTTSVoice()
 
 
 QUEUE_SEMAPHORE = Semaphore(
@@ -27,15 +19,53 @@ QUEUE_SEMAPHORE = Semaphore(
 )  # The amount of sounds to queue before blocking the main thread
 
 
+@functools.lru_cache(maxsize=None)
+def get_default_voice_engine() -> VoiceBase:
+    """Get the voice engine used when the configured one fails
+
+    Returns:
+        VoiceBase: The gTTS voice engine
+    """
+    from autogpt.speech.gtts import GTTSVoice
+
+    return GTTSVoice()
+
+
+@functools.lru_cache(maxsize=None)
+def get_voice_engine() -> VoiceBase:
+    """Get the configured voice engine, importing it on first use
+
+    The engines import audio libraries, so they are only loaded once something
+    is said.
+
+    Returns:
+        VoiceBase: The voice engine
+    """
+    if CFG.elevenlabs_api_key:
+        from autogpt.speech.eleven_labs import ElevenLabsSpeech
+
+        return ElevenLabsSpeech()
+    elif CFG.use_mac_os_tts == "True":
+        from autogpt.speech.macos_tts import MacOSTTS
+
+        return MacOSTTS()
+    elif CFG.use_brian_tts == "True":
+        from autogpt.speech.brian import BrianSpeech
+
+        return BrianSpeech()
+    return get_default_voice_engine()
+
+
 def say_text(text: str, voice_index: int = 0) -> None:
     """Speak the given text using the given voice index"""
 
     def speak() -> None:
-        success = VOICE_ENGINE.say(text, voice_index)
-        if not success:
-            DEFAULT_VOICE_ENGINE.say(text)
-
-        QUEUE_SEMAPHORE.release()
+        try:
+            success = get_voice_engine().say(text, voice_index)
+            if not success:
+                get_default_voice_engine().say(text)
+        finally:
+            QUEUE_SEMAPHORE.release()
 
     QUEUE_SEMAPHORE.acquire(True)
     thread = threading.Thread(target=speak)
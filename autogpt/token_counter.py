@@ -1,10 +1,15 @@
 """Functions for counting the number of tokens in a message or string."""
 from __future__ import annotations
 
+import functools
+
 import tiktoken
 
 from autogpt.logs import logger
 
+# Every reply is primed with <|start|>assistant<|message|>
+REPLY_PRIMING_TOKENS = 3
+
 
 def count_message_tokens(
     messages: list[dict[str, str]], model: str = "gpt-3.5-turbo-0301"
@@ -54,10 +59,28 @@ def count_message_tokens(
             num_tokens += len(encoding.encode(value))
             if key == "name":
                 num_tokens += tokens_per_name
-    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+    num_tokens += REPLY_PRIMING_TOKENS
     return num_tokens
 
 
+@functools.lru_cache(maxsize=32)
+def count_static_message_tokens(role: str, content: str, model: str) -> int:
+    """
+    Returns the number of tokens used by a message that is sent on every turn,
+    like the system prompt. The message is only tokenized the first time.
+
+    Args:
+        role (str): The role of the message sender.
+        content (str): The content of the message.
+        model (str): The name of the model to use for tokenization.
+
+    Returns:
+        int: The number of tokens used by the message, as counted by
+            count_message_tokens for a list of this message alone.
+    """
+    return count_message_tokens([{"role": role, "content": content}], model)
+
+
 def count_string_tokens(string: str, model_name: str) -> int:
     """
     Returns the number of tokens in a text string.
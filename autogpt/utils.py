@@ -3,6 +3,10 @@ from colorama import Fore
 
 
 def clean_input(prompt: str = ""):
+    from autogpt.logs import logger
+
+    # Let the output logged so far finish before prompting
+    logger.flush()
     try:
         return input(prompt)
     except KeyboardInterrupt:
@@ -0,0 +1,249 @@
+"""Incrementally maintained index of the files in the workspace"""
+from __future__ import annotations
+
+import bisect
+import fnmatch
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from autogpt.workspace import WORKSPACE_PATH
+
+DEFAULT_SEARCH_LIMIT = 100
+
+
+class WorkspaceIndex:
+    """
+    An in-memory listing of the files in the workspace.
+
+    The index is built with a single walk of the workspace and afterwards kept up
+    to date in two ways: file commands report their changes through add() and
+    remove(), and a periodic rescan compares directory mtimes so that changes made
+    outside of the file commands (shell commands, git clones, ...) are picked up by
+    re-listing only the directories that actually changed.
+
+    Hidden files and directories (starting with ".") are not indexed.
+    """
+
+    def __init__(self, root: str | Path = WORKSPACE_PATH, rescan_interval: float = 2.0):
+        """
+        Initialize the index. Nothing is read from disk until the first search.
+
+        Args:
+            root (str | Path): The directory to index
+            rescan_interval (float): Minimum number of seconds between two mtime
+                rescans of the directory tree
+        """
+        self.root = Path(root)
+        self.rescan_interval = rescan_interval
+        self._lock = threading.RLock()
+        # relative directory path -> (mtime_ns, file names, subdirectory names)
+        self._dirs: dict[str, tuple[int, set[str], set[str]]] = {}
+        self._sorted_files: list[str] | None = None
+        self._built = False
+        self._last_scan = 0.0
+
+    def add(self, path: str | Path) -> None:
+        """Record that a file was created or written
+
+        Args:
+            path (str | Path): Absolute path of the file
+        """
+        relative = self._relative(path)
+        if relative is None or not self._built:
+            return
+        directory, name = _split(relative)
+        if _is_hidden(relative):
+            return
+        with self._lock:
+            self._ensure_dir(directory)
+            files = self._dirs[directory][1]
+            if name not in files:
+                files.add(name)
+                self._sorted_files = None
+
+    def remove(self, path: str | Path) -> None:
+        """Record that a file was deleted
+
+        Args:
+            path (str | Path): Absolute path of the file
+        """
+        relative = self._relative(path)
+        if relative is None or not self._built:
+            return
+        directory, name = _split(relative)
+        with self._lock:
+            entry = self._dirs.get(directory)
+            if entry and name in entry[1]:
+                entry[1].discard(name)
+                self._sorted_files = None
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date with the disk
+
+        The first call walks the whole tree. Later calls only stat the known
+        directories and re-list those whose mtime changed, at most once every
+        rescan_interval seconds unless force is set.
+
+        Args:
+            force (bool): Rescan even if the rescan interval has not elapsed
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._built:
+                self._dirs = {}
+                self._scan_tree("")
+                self._built = True
+                self._sorted_files = None
+            elif force or now - self._last_scan >= self.rescan_interval:
+                for directory in list(self._dirs):
+                    if directory not in self._dirs:
+                        # Dropped while rescanning a parent directory
+                        continue
+                    try:
+                        mtime = os.stat(self._absolute(directory)).st_mtime_ns
+                    except OSError:
+                        self._drop_tree(directory)
+                        continue
+                    if mtime != self._dirs[directory][0]:
+                        self._rescan_dir(directory)
+            else:
+                return
+            self._last_scan = time.monotonic()
+
+    def search(
+        self,
+        directory: str = "",
+        pattern: str | None = None,
+        offset: int = 0,
+        limit: int | None = DEFAULT_SEARCH_LIMIT,
+    ) -> tuple[list[str], int]:
+        """Search the index
+
+        Args:
+            directory (str): Only return files below this directory, relative to
+                the root of the index
+            pattern (str, optional): Glob pattern, matched against the file name,
+                or against the relative path if the pattern contains a "/"
+            offset (int): Number of matching files to skip
+            limit (int, optional): Maximum number of files to return, None for all
+
+        Returns:
+            tuple[list[str], int]: The page of matching relative paths, sorted, and
+                the total number of matches
+        """
+        self.refresh()
+        with self._lock:
+            if self._sorted_files is None:
+                self._sorted_files = sorted(
+                    f"{directory}/{name}" if directory else name
+                    for directory, (_, files, _) in self._dirs.items()
+                    for name in files
+                )
+            files = self._sorted_files
+
+        prefix = directory.strip("/")
+        if prefix and prefix != ".":
+            prefix += "/"
+            start = bisect.bisect_left(files, prefix)
+            end = bisect.bisect_left(files, prefix[:-1] + chr(ord("/") + 1))
+            files = files[start:end]
+
+        if pattern and pattern != "*":
+            regex = re.compile(fnmatch.translate(pattern))
+            if "/" in pattern:
+                files = [f for f in files if regex.match(f)]
+            else:
+                files = [f for f in files if regex.match(f.rsplit("/", 1)[-1])]
+
+        total = len(files)
+        end = None if limit is None else offset + limit
+        return files[offset:end], total
+
+    def _relative(self, path: str | Path) -> str | None:
+        try:
+            relative = Path(path).resolve().relative_to(self.root.resolve())
+        except ValueError:
+            return None
+        return relative.as_posix()
+
+    def _absolute(self, directory: str) -> Path:
+        return self.root / directory if directory else self.root
+
+    def _ensure_dir(self, directory: str) -> None:
+        if directory in self._dirs:
+            return
+        parent, name = _split(directory)
+        if directory:
+            self._ensure_dir(parent)
+            self._dirs[parent][2].add(name)
+        # An mtime of 0 makes the next refresh list the directory from disk
+        self._dirs[directory] = (0, set(), set())
+
+    def _scan_tree(self, directory: str) -> None:
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            pending.extend(
+                _join(current, name) for name in self._list_dir(current) or ()
+            )
+
+    def _list_dir(self, directory: str) -> set[str] | None:
+        """List a single directory into the index and return its subdirectories"""
+        path = self._absolute(directory)
+        files, subdirs = set(), set()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.add(entry.name)
+                    elif entry.is_file():
+                        files.add(entry.name)
+        except OSError:
+            return None
+        self._dirs[directory] = (mtime, files, subdirs)
+        self._sorted_files = None
+        return subdirs
+
+    def _rescan_dir(self, directory: str) -> None:
+        old_subdirs = self._dirs[directory][2]
+        subdirs = self._list_dir(directory)
+        if subdirs is None:
+            self._drop_tree(directory)
+            return
+        for name in old_subdirs - subdirs:
+            self._drop_tree(_join(directory, name))
+        for name in subdirs - old_subdirs:
+            self._scan_tree(_join(directory, name))
+
+    def _drop_tree(self, directory: str) -> None:
+        prefix = f"{directory}/"
+        for known in list(self._dirs):
+            if known == directory or known.startswith(prefix):
+                del self._dirs[known]
+        if directory:
+            parent, name = _split(directory)
+            if parent in self._dirs:
+                self._dirs[parent][2].discard(name)
+        self._sorted_files = None
+
+
+def _split(relative: str) -> tuple[str, str]:
+    directory, _, name = relative.rpartition("/")
+    return directory, name
+
+
+def _join(directory: str, name: str) -> str:
+    return f"{directory}/{name}" if directory else name
+
+
+def _is_hidden(relative: str) -> bool:
+    return any(part.startswith(".") for part in relative.split("/"))
+
+
+WORKSPACE_INDEX = WorkspaceIndex()
@@ -0,0 +1,105 @@
+"""Compare the lxml page extraction with the previous BeautifulSoup extraction.
+
+Usage:
+    python -m benchmark.benchmark_html_extraction [CORPUS_DIR] [--repeat N]
+
+CORPUS_DIR should contain saved pages (*.html, *.htm), e.g. saved with
+`curl -o page.html <url>`. Without a corpus, synthetic pages are generated.
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from autogpt.processing.html import (
+    extract_hyperlinks,
+    extract_page,
+    format_hyperlinks,
+)
+
+
+def extract_with_beautifulsoup(html: str, base_url: str) -> tuple[str, list[str]]:
+    """The extraction scrape_text and scrape_links used to do, one parse each"""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = "\n".join(chunk for chunk in chunks if chunk)
+
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    links = format_hyperlinks(extract_hyperlinks(soup, base_url))
+    return text, links
+
+
+def extract_with_lxml(html: str, base_url: str) -> tuple[str, list[str]]:
+    text, hyperlinks = extract_page(html, base_url)
+    return text, format_hyperlinks(hyperlinks)
+
+
+def synthetic_corpus(num_pages: int = 20) -> list[str]:
+    random.seed(0)
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+    pages = []
+    for _ in range(num_pages):
+        sections = []
+        for i in range(200):
+            sentence = " ".join(random.choices(words, k=30))
+            sections.append(
+                f"<div class='row'><h2>Section {i}</h2><p>{sentence}</p>"
+                f"<a href='/page/{i}'>Link {i}</a>"
+                f"<script>track({i});</script></div>"
+            )
+        pages.append(
+            "<html><head><style>.row { margin: 0 }</style></head><body>"
+            + "".join(sections)
+            + "</body></html>"
+        )
+    return pages
+
+
+def load_corpus(directory: Path) -> list[str]:
+    return [
+        path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(directory.iterdir())
+        if path.suffix in {".html", ".htm"}
+    ]
+
+
+def run(pages: list[str], extract, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(page, "https://example.com/")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", type=Path, help="Directory of pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+        print(f"Loaded {len(pages)} pages from {args.corpus}")
+    else:
+        pages = synthetic_corpus()
+        print(f"No corpus given, using {len(pages)} synthetic pages")
+    size = sum(len(page) for page in pages)
+    print(f"Corpus size: {size / 1024 / 1024:.2f} MB, {args.repeat} rounds")
+
+    old = run(pages, extract_with_beautifulsoup, args.repeat)
+    new = run(pages, extract_with_lxml, args.repeat)
+    print(f"BeautifulSoup (html.parser, 2 parses): {old:.3f}s")
+    print(f"lxml (single parse):                   {new:.3f}s")
+    print(f"Speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
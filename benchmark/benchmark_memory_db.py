@@ -0,0 +1,84 @@
+"""Compare inserting memories with MemoryDB.insert_many and per-row commits.
+
+Usage:
+    python -m benchmark.benchmark_memory_db [--rows N] [--searches N]
+
+The previous store looked up the next key with SELECT MAX(key) and committed
+every row, in the default rollback journal mode with full fsyncs. Searches
+are then run from a growing number of threads, each reading through its own
+connection.
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from autogpt.permanent_memory.sqlite3_store import MemoryDB
+
+
+def insert_previously(path: Path, texts: list[str]) -> None:
+    cnx = sqlite3.connect(path)
+    cnx.execute("CREATE VIRTUAL TABLE text USING FTS5 (session, key, block);")
+    for text in texts:
+        key = cnx.execute("SELECT MAX(key) FROM text where session = 1;").fetchone()[0]
+        key = 0 if key is None else int(key) + 1
+        cnx.execute(
+            "REPLACE INTO text(session, key, block) VALUES (?, ?, ?);", (1, key, text)
+        )
+        cnx.commit()
+    cnx.close()
+
+
+def insert_many(path: Path, texts: list[str]) -> None:
+    db = MemoryDB(str(path))
+    db.insert_many(texts)
+    db.quit()
+
+
+def search_throughput(path: Path, threads: int, searches: int) -> float:
+    db = MemoryDB(str(path))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # Open the connection of every thread before timing
+        list(executor.map(db.search, ["memory"] * threads))
+        start = time.perf_counter()
+        list(executor.map(db.search, [f"file_{i}" for i in range(searches)]))
+        elapsed = time.perf_counter() - start
+    db.quit()
+    return searches / elapsed
+
+
+def run(insert, path: Path, texts: list[str]) -> float:
+    start = time.perf_counter()
+    insert(path, texts)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--searches", type=int, default=2000)
+    args = parser.parse_args()
+
+    texts = [
+        f"Memory {i}: the result of command number {i} was written to file_{i}.txt"
+        for i in range(args.rows)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        old = run(insert_previously, Path(directory) / "old.sqlite3", texts)
+        new = run(insert_many, Path(directory) / "new.sqlite3", texts)
+        print(f"{args.rows} rows")
+        print(f"Per-row commits: {old * 1e6 / args.rows:8.1f}us per row")
+        print(f"insert_many:     {new * 1e6 / args.rows:8.1f}us per row")
+        print(f"Speedup: {old / new:.1f}x")
+
+        for threads in (1, 2, 4, 8):
+            rate = search_throughput(
+                Path(directory) / "new.sqlite3", threads, args.searches
+            )
+            print(f"{threads} reader threads: {rate:8.0f} searches/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the insert and query throughput of the Redis memory.
+
+Usage:
+    docker run -d -p 6379:6379 redis/redis-stack-server:latest
+    python -m benchmark.benchmark_redis_memory [--texts N] [--queries N]
+
+Connects to the Redis configured with REDIS_HOST and REDIS_PORT, which needs
+the search module of redis-stack (fakeredis doesn't implement it). Its memory
+index is wiped. Embeddings are random vectors, so only Redis is measured.
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+# The agent package has to be imported before the memory, which imports it
+import autogpt.agent  # noqa: F401
+from autogpt.config import Config
+from autogpt.memory import redismem
+from autogpt.memory.redismem import AsyncRedisMemory, RedisMemory
+
+
+def random_embeddings(texts: list[str]) -> list[list[float]]:
+    return np.random.rand(len(texts), 1536).tolist()
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+async def query_concurrently(memory: AsyncRedisMemory, queries: list[str]) -> None:
+    await asyncio.gather(*(memory.get_relevant(query, 10) for query in queries))
+    await memory.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    redismem.create_embeddings_with_ada = random_embeddings
+    cfg = Config()
+    cfg.wipe_redis_on_start = True
+    memory = RedisMemory(cfg)
+    texts = [f"Memory {i}: the result of command number {i}" for i in range(args.texts)]
+    queries = [f"command number {i}" for i in range(args.queries)]
+
+    one_by_one = timed(lambda: [memory.add(text) for text in texts])
+    memory.clear()
+    memory.index.create_index(
+        fields=redismem.index_fields(cfg), definition=redismem.index_definition(cfg)
+    )
+    batched = timed(memory.add_many, texts)
+    print(f"{args.texts} texts")
+    print(f"add:      {args.texts / one_by_one:8.0f} texts/s")
+    print(f"add_many: {args.texts / batched:8.0f} texts/s")
+
+    sequential = timed(lambda: [memory.get_relevant(query, 10) for query in queries])
+    concurrent = timed(
+        lambda: asyncio.run(query_concurrently(AsyncRedisMemory(cfg), queries))
+    )
+    print(f"{args.queries} queries")
+    print(f"RedisMemory:      {args.queries / sequential:8.0f} queries/s")
+    print(f"AsyncRedisMemory: {args.queries / concurrent:8.0f} queries/s")
+    print(memory.get_stats())
+
+
+if __name__ == "__main__":
+    main()
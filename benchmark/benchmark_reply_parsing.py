@@ -0,0 +1,73 @@
+"""Compare parsing a reply with AssistantReply with the previous per-step parsing.
+
+Usage:
+    python -m benchmark.benchmark_reply_parsing [--repeat N]
+
+The previous pipeline loaded the JSON schema from disk and built a validator
+on every step, then walked the parsed reply again to find its commands.
+"""
+import argparse
+import json
+import time
+
+from jsonschema import Draft7Validator
+
+# The agent package has to be imported before autogpt.app, which it imports
+from autogpt.agent.reply import AssistantReply
+from autogpt.app import get_commands
+from autogpt.json_fixes.master_json_fix_method import fix_json_using_multiple_techniques
+from autogpt.json_validation.validate_json import SCHEMA_DIR
+
+SCHEMA = "llm_response_format_1"
+REPLY = json.dumps(
+    {
+        "thoughts": {
+            "text": "I need to find out what the latest release is",
+            "reasoning": "The changelog lists the releases",
+            "plan": "- read the changelog\n- summarize it\n- write the summary",
+            "criticism": "I should have read the changelog first",
+            "speak": "I will read the changelog",
+        },
+        "command": {
+            "name": "read_file",
+            "args": {"filename": "CHANGELOG.md", "start_line": 1, "end_line": 50},
+        },
+    }
+)
+
+
+def parse_previously(reply: str):
+    reply_json = fix_json_using_multiple_techniques(reply)
+    with open(SCHEMA_DIR / f"{SCHEMA}.json", "r") as f:
+        validator = Draft7Validator(json.load(f))
+    sorted(validator.iter_errors(reply_json), key=lambda e: e.path)
+    return get_commands(reply_json)
+
+
+def parse_once(reply: str):
+    return AssistantReply.parse(reply, SCHEMA).commands
+
+
+def run(parse, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(REPLY)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    assert parse_previously(REPLY) == parse_once(REPLY)
+    old = run(parse_previously, args.repeat)
+    new = run(parse_once, args.repeat)
+    print(f"{args.repeat} replies")
+    print(f"Previous parsing: {old * 1e6 / args.repeat:8.1f}us per reply")
+    print(f"AssistantReply:   {new * 1e6 / args.repeat:8.1f}us per reply")
+    print(f"Speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
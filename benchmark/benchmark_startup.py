@@ -0,0 +1,101 @@
+"""Measure how long importing Auto-GPT takes, using `python -X importtime`.
+
+Usage:
+    python -m benchmark.benchmark_startup [--module autogpt.__main__] [--repeat N]
+        [--top N] [--budget SECONDS]
+
+Every round imports the module in a fresh interpreter, so the numbers are those
+of a cold start. Exits with status 1 if the median is over the budget.
+
+The command modules themselves are imported at startup, since importing them
+registers the commands listed in the prompt. What is deferred to the first use
+of a command are the heavy third party libraries below, which the command
+modules import inside the functions that need them.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Third party libraries that are only needed once the command using them runs,
+# and should not be imported at startup
+HEAVY_MODULES = [
+    "selenium.webdriver",
+    "webdriver_manager",
+    "playwright",
+    "docker",
+    "tweepy",
+    "googleapiclient",
+    "duckduckgo_search",
+    "PIL",
+    "gtts",
+    "playsound",
+    "git",
+    "bs4",
+    "redis",
+    "pinecone",
+    "weaviate",
+    "pymilvus",
+]
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and time every import it makes
+
+    Args:
+        module (str): The module to import
+
+    Returns:
+        dict[str, int]: The cumulative import time in microseconds of every
+            imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # A module is only imported once, its first entry is the one that counts
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="autogpt.__main__")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, help="Budget in seconds")
+    args = parser.parse_args()
+
+    rounds = [import_times(args.module) for _ in range(args.repeat)]
+    totals = [times[args.module] / 1e6 for times in rounds]
+    median = statistics.median(totals)
+    print(f"Importing {args.module}, {args.repeat} rounds")
+    print(f"Median: {median:.3f}s, min: {min(totals):.3f}s, max: {max(totals):.3f}s")
+
+    last = rounds[-1]
+    print("\nSlowest imports (cumulative, last round):")
+    top_level = {name: t for name, t in last.items() if "." not in name}
+    for name, t in sorted(top_level.items(), key=lambda i: -i[1])[: args.top]:
+        print(f"  {t / 1000:8.1f}ms  {name}")
+
+    commands = [name for name in last if name.startswith("autogpt.commands.")]
+    print(f"\nCommand modules imported at startup: {len(commands)}")
+    heavy = [name for name in HEAVY_MODULES if name in last]
+    print(f"Heavy modules imported at startup: {', '.join(heavy) or 'none'}")
+
+    if args.budget is not None and median > args.budget:
+        print(f"Over the budget of {args.budget:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,7 @@ def ingest_directory(directory, memory, args):
     :param memory: An object with an add() method to store the chunks in memory
     """
     try:
-        files = search_files(directory)
+        files = search_files(directory, limit=None)
         for file in files:
             ingest_file(file, memory, args.max_length, args.overlap)
     except Exception as e:
@@ -55,6 +55,7 @@ class TestWeaviateMemory(unittest.TestCase):
     def test_add(self):
         doc = 'You are a Titan name Thanos and you are looking for the Infinity Stones'
         self.memory.add(doc)
+        self.memory.flush()
         result = self.client.query.get(self.index, ['raw_text']).do()
         actual = result['data']['Get'][self.index]
 
@@ -0,0 +1,41 @@
+"""Fixtures shared by the unit tests"""
+import pytest
+
+from autogpt.config import Config
+from autogpt.config.singleton import Singleton
+
+
+def fake_embeddings(texts):
+    return [[0.5] * 1536 for _ in texts]
+
+
+@pytest.fixture
+def config():
+    """The global config, whose settings tests patch with mocker.patch.object"""
+    return Config()
+
+
+@pytest.fixture
+def new_singleton():
+    """Create singletons anew, restoring the previous instances after the test"""
+    saved = dict(Singleton._instances)
+
+    def create(cls, *args, **kwargs):
+        Singleton._instances.pop(cls, None)
+        return cls(*args, **kwargs)
+
+    yield create
+    Singleton._instances.clear()
+    Singleton._instances.update(saved)
+
+
+@pytest.fixture
+def patch_embeddings(mocker):
+    """Replace create_embeddings_with_ada in a module by constant embeddings"""
+
+    def patch(module):
+        return mocker.patch.object(
+            module, "create_embeddings_with_ada", side_effect=fake_embeddings
+        )
+
+    return patch
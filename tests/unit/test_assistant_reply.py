@@ -0,0 +1,60 @@
+"""Unit tests for parsing the replies of the AI"""
+import json
+
+from autogpt.agent.reply import AssistantReply, Thoughts
+from autogpt.json_validation.validate_json import get_validator
+
+REPLY = {
+    "thoughts": {
+        "text": "I should search",
+        "reasoning": "I need information",
+        "plan": "- search\n- read",
+        "criticism": "none",
+        "speak": "Searching",
+    },
+    "command": {"name": "google", "args": {"input": "auto-gpt"}},
+}
+
+
+def test_parse_reply():
+    reply = AssistantReply.parse(json.dumps(REPLY), "llm_response_format_1")
+
+    assert reply.json == REPLY
+    assert reply.thoughts.text == "I should search"
+    assert reply.thoughts.plan_lines() == ["search", "read"]
+    assert reply.thoughts.speak == "Searching"
+    assert reply.commands == [("google", {"input": "auto-gpt"})]
+    assert reply.command_names == ["google"]
+
+
+def test_parse_reply_with_text_around_json():
+    raw = f"Sure, here you go: {json.dumps(REPLY)} Hope that helps"
+    reply = AssistantReply.parse(raw, "llm_response_format_1")
+
+    assert reply.raw == raw
+    assert reply.commands == [("google", {"input": "auto-gpt"})]
+
+
+def test_parse_unparsable_reply(mocker):
+    mocker.patch(
+        "autogpt.agent.reply.fix_json_using_multiple_techniques", return_value={}
+    )
+    reply = AssistantReply.parse("not json at all", "llm_response_format_1")
+
+    assert reply.json == {}
+    assert reply.commands == []
+    assert reply.thoughts == Thoughts()
+
+
+def test_plan_as_list():
+    thoughts = Thoughts.from_json({"plan": ["- search", "- read"]})
+    assert thoughts.plan_lines() == ["search", "read"]
+    assert Thoughts.from_json("not a dict") == Thoughts()
+
+
+def test_validator_is_loaded_once(tmp_path, monkeypatch):
+    # Schemas are found whatever the working directory is
+    monkeypatch.chdir(tmp_path)
+    assert get_validator("llm_response_format_1") is get_validator(
+        "llm_response_format_1"
+    )
@@ -0,0 +1,135 @@
+"""Unit tests for the command registry"""
+from types import SimpleNamespace
+
+import pytest
+
+# The agent package has to be imported before autogpt.app, which it imports
+import autogpt.agent  # noqa: F401
+import autogpt.app as app
+from autogpt.commands.command import COMMAND_REGISTRY, CommandRegistry, command
+
+
+def test_decorator_registers_command():
+    registry = CommandRegistry()
+
+    @command(
+        "greet", "Greet", {"name": "<name>"}, aliases=("hello",), registry=registry
+    )
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    assert registry.version == 1
+    assert registry.get("greet").label == "Greet"
+    assert registry.get("HELLO") is registry.get("greet")
+    assert registry.get("missing") is None
+    # The function itself is left unchanged
+    assert greet("you") == "Hello you"
+
+
+def test_unknown_arguments_are_left_out():
+    registry = CommandRegistry()
+
+    @command("greet", "Greet", {"name": "<name>"}, registry=registry)
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    assert registry.call(registry.get("greet"), {"name": "you", "mood": "happy"}) == (
+        "Hello you"
+    )
+
+
+def test_enabled_commands():
+    registry = CommandRegistry()
+
+    @command("always", "Always", registry=registry)
+    def always() -> None:
+        pass
+
+    @command(
+        "sometimes",
+        "Sometimes",
+        enabled=lambda config: config.allowed,
+        registry=registry,
+    )
+    def sometimes() -> None:
+        pass
+
+    names = [c.name for c in registry.enabled_commands(SimpleNamespace(allowed=True))]
+    assert names == ["always", "sometimes"]
+    names = [c.name for c in registry.enabled_commands(SimpleNamespace(allowed=False))]
+    assert names == ["always"]
+
+
+def test_hooks_are_called():
+    registry = CommandRegistry()
+    calls = []
+    registry.add_hook(
+        lambda command, arguments, result, duration: calls.append(
+            (command.name, arguments, result, duration >= 0)
+        )
+    )
+
+    @command("double", "Double", {"n": "<n>"}, registry=registry)
+    def double(n: int) -> int:
+        return n * 2
+
+    registry.call(registry.get("double"), {"n": 2})
+    assert calls == [("double", {"n": 2}, 4, True)]
+
+
+def test_execute_command_uses_registry():
+    assert COMMAND_REGISTRY.get("search").name == "google"
+    assert COMMAND_REGISTRY.get("create_file").name == "write_to_file"
+    assert app.execute_command("do_nothing", {}) == "No action performed."
+    assert app.execute_command("no_such_command", {}).startswith("Unknown command")
+
+
+def test_execute_command_disabled(mocker):
+    mocker.patch.object(app.CFG, "execute_local_commands", False)
+    assert app.execute_command("execute_shell", {"command_line": "ls"}).startswith(
+        "You are not allowed to run local shell commands"
+    )
+
+
+def test_execute_command_returns_errors():
+    # Missing arguments are reported to the AI instead of raised
+    assert app.execute_command("delete_agent", {}).startswith("Error:")
+
+
+def test_argument_aliases():
+    registry = CommandRegistry()
+
+    @command(
+        "greet",
+        "Greet",
+        {"name": "<name>"},
+        arg_aliases={"who": "name"},
+        registry=registry,
+    )
+    def greet(name: str) -> str:
+        return f"Hello {name}"
+
+    assert registry.call(registry.get("greet"), {"who": "you"}) == "Hello you"
+
+
+def test_missing_arguments_are_reported_with_unknown_ones():
+    registry = CommandRegistry()
+
+    @command("greet", "Greet", {"name": "<name>"}, registry=registry)
+    def greet(name: str, greeting: str = "Hello") -> str:
+        return f"{greeting} {name}"
+
+    with pytest.raises(TypeError) as error:
+        registry.call(registry.get("greet"), {"person": "you"})
+    assert str(error.value) == (
+        "Command 'greet' is missing the arguments ['name'], and got unknown"
+        " arguments ['person']. Its arguments are ['name']"
+    )
+
+
+def test_earlier_argument_names_are_accepted(mocker):
+    delete_file = mocker.patch.object(
+        COMMAND_REGISTRY.get("delete_file"), "method", return_value="Deleted"
+    )
+    assert app.execute_command("delete_file", {"file": "notes.txt"}) == "Deleted"
+    delete_file.assert_called_once_with(filename="notes.txt")
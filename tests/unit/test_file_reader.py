@@ -0,0 +1,75 @@
+"""Unit tests for the streaming file reading functions"""
+import os
+
+import pytest
+
+from autogpt.commands.file_operations import (
+    head_file,
+    read_file,
+    read_file_bytes,
+    read_file_chunks,
+    read_file_lines,
+    search_in_file,
+    split_file,
+    tail_file,
+)
+from autogpt.workspace import path_in_workspace
+
+LINES = [f"line {i} {'needle' if i % 7 == 0 else 'hay'}\n" for i in range(1, 101)]
+CONTENT = "".join(LINES)
+
+
+@pytest.fixture
+def text_file():
+    filename = "test_file_reader.txt"
+    filepath = path_in_workspace(filename)
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(CONTENT)
+    yield filename
+    os.remove(filepath)
+
+
+@pytest.mark.parametrize("max_length,overlap", [(100, 0), (100, 20), (333, 50)])
+def test_read_file_chunks_matches_split_file(text_file, max_length, overlap):
+    expected = list(split_file(CONTENT, max_length=max_length, overlap=overlap))
+    chunks = list(read_file_chunks(text_file, max_length=max_length, overlap=overlap))
+    assert chunks == expected[: len(chunks)]
+    # Any chunk split_file yields after the last one is contained in it
+    assert all(extra in chunks[-1] for extra in expected[len(chunks) :])
+    assert chunks[-1].endswith(CONTENT[-overlap - 1 :])
+
+
+def test_read_file_chunks_short_file(text_file):
+    assert list(read_file_chunks(text_file, max_length=4000, overlap=4000)) == [
+        CONTENT
+    ]
+
+
+def test_read_file_truncates(text_file):
+    assert read_file(text_file) == CONTENT
+    truncated = read_file(text_file, max_length=50)
+    assert truncated.startswith(CONTENT[:50])
+    assert "Truncated after 50 characters" in truncated
+    assert read_file(text_file, max_length=len(CONTENT)) == CONTENT
+
+
+def test_read_file_lines(text_file):
+    assert read_file_lines(text_file, 3, 5) == "".join(LINES[2:5])
+    assert read_file_lines(text_file, 99) == "".join(LINES[98:])
+    assert head_file(text_file, 2) == "".join(LINES[:2])
+
+
+def test_tail_file(text_file):
+    assert tail_file(text_file, 3) == "".join(LINES[-3:])
+    assert tail_file(text_file, 1000) == CONTENT
+
+
+def test_read_file_bytes(text_file):
+    assert read_file_bytes(text_file, 7, 5) == CONTENT[7:12]
+    assert read_file_bytes(text_file, -9) == CONTENT[-9:]
+
+
+def test_search_in_file(text_file):
+    results = search_in_file(text_file, r"needle", max_results=3)
+    assert results == ["7: line 7 needle", "14: line 14 needle", "21: line 21 needle"]
+    assert search_in_file(text_file, "missing") == []
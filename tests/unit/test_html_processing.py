@@ -0,0 +1,62 @@
+"""Unit tests for the HTML extraction functions"""
+from autogpt.processing.html import extract_page, normalize_text
+
+
+def test_extract_page_text_and_links():
+    html = """
+        <html>
+            <head><title>Title</title><style>p { color: red; }</style></head>
+            <body>
+                <!-- a comment -->
+                <script>var hidden = "script";</script>
+                <noscript>Enable JavaScript</noscript>
+                <p>This is <b>bold</b> text.</p>
+                <a href="/about">About <i>us</i></a>
+                <a name="anchor">No href</a>
+                <a href="https://example.org/">Elsewhere</a>
+            </body>
+        </html>
+    """
+    text, links = extract_page(html, "https://example.com/index.html")
+    assert text == "Title\nThis is bold text.\nAbout us\nNo href\nElsewhere"
+    assert links == [
+        ("About us", "https://example.com/about"),
+        ("Elsewhere", "https://example.org/"),
+    ]
+
+
+def test_extract_page_keeps_tail_text_of_stripped_elements():
+    text, _ = extract_page("<p>before<script>x()</script> after</p>", "")
+    assert text == "before after"
+
+
+def test_extract_page_empty_documents():
+    assert extract_page("", "https://example.com") == ("", [])
+    assert extract_page("<html><body></body></html>", "https://example.com") == (
+        "",
+        [],
+    )
+
+
+def test_extract_page_with_encoding_declaration():
+    html = '<?xml version="1.0" encoding="iso-8859-1"?><html><body>café</body></html>'
+    assert extract_page(html, "")[0] == "café"
+
+
+def test_normalize_text():
+    text = "  one  two \n\n\t three\r\nfour   "
+    assert normalize_text(text) == "one\ntwo\nthree\nfour"
+
+
+def test_extract_page_strips_non_text_elements():
+    html = """
+        <body>
+            <template><p>Template</p></template>
+            <svg><title>Icon</title><text>Drawing</text></svg>
+            <canvas>Canvas fallback</canvas>
+            <iframe>Frame fallback</iframe>
+            <object data="movie.swf">Object fallback<embed src="movie.swf"></object>
+            <p>Content</p>
+        </body>
+    """
+    assert extract_page(html, "")[0] == "Content"
@@ -0,0 +1,105 @@
+"""Unit tests for the on-disk HTTP cache"""
+import pytest
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from autogpt.http_cache import HTTPCache
+
+
+def make_response(body: bytes, status_code: int = 200, **headers) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(tmp_path / "http", max_size=1024)
+
+
+def test_stores_and_rebuilds_response(cache):
+    cache.store("https://example.com/", make_response(b"<p>hi</p>", ETag='"v1"'))
+    entry = cache.get("https://example.com/")
+    assert entry is not None
+    assert entry.validators() == {"If-None-Match": '"v1"'}
+    assert not entry.is_fresh()
+    response = entry.to_response()
+    assert response.status_code == 200
+    assert response.text == "<p>hi</p>"
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_does_not_store_uncacheable_responses(cache):
+    cache.store("https://a.com/", make_response(b"no validators"))
+    cache.store("https://b.com/", make_response(b"x", Cache_Control="no-store"))
+    cache.store("https://c.com/", make_response(b"x", 404, ETag='"v1"'))
+    assert cache.get("https://a.com/") is None
+    assert cache.get("https://b.com/") is None
+    assert cache.get("https://c.com/") is None
+
+
+def test_max_age_freshness(cache):
+    cache.store(
+        "https://example.com/",
+        make_response(b"x", **{"Cache-Control": "public, max-age=60"}),
+    )
+    assert cache.get("https://example.com/").is_fresh()
+
+
+def test_revalidated_updates_headers(cache):
+    cache.store(
+        "https://example.com/",
+        make_response(b"body", ETag='"v1"', **{"Last-Modified": "yesterday"}),
+    )
+    entry = cache.get("https://example.com/")
+    cache.revalidated(entry, make_response(b"", 304, etag='"v2"'))
+
+    entry = cache.get("https://example.com/")
+    assert entry.validators() == {
+        "If-None-Match": '"v2"',
+        "If-Modified-Since": "yesterday",
+    }
+    assert entry.to_response().content == b"body"
+
+
+def test_evicts_least_recently_used(cache):
+    for name in ("a", "b", "c"):
+        cache.store(f"https://{name}.com/", make_response(b"x" * 400, ETag=name))
+    # Only two entries fit, so the least recently used one is evicted
+    assert cache.get("https://a.com/") is None
+    assert cache.get("https://b.com/") is not None
+    assert cache.get("https://c.com/") is not None
+
+    cache.get("https://b.com/")
+    cache.store("https://d.com/", make_response(b"x" * 400, ETag="d"))
+    assert cache.get("https://c.com/") is None
+    assert cache.get("https://b.com/") is not None
+
+
+def test_disabled_cache(tmp_path):
+    cache = HTTPCache(tmp_path / "http", max_size=0)
+    cache.store("https://example.com/", make_response(b"x", ETag='"v1"'))
+    assert cache.get("https://example.com/") is None
+    assert not (tmp_path / "http").exists()
+
+
+def test_get_response_revalidates(mocker, cache):
+    from autogpt.commands import web_requests
+
+    mocker.patch.object(web_requests, "http_cache", cache)
+    get = mocker.patch(
+        "requests.Session.get",
+        return_value=make_response(b"<p>page</p>", ETag='"v1"'),
+    )
+    response, error = web_requests.get_response("https://example.com/page")
+    assert error is None
+    assert response.text == "<p>page</p>"
+
+    get.return_value = make_response(b"", 304)
+    response, error = web_requests.get_response("https://example.com/page")
+    assert error is None
+    assert response.text == "<p>page</p>"
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
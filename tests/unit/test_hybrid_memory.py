@@ -0,0 +1,118 @@
+"""Unit tests for combining keyword and vector search of memories"""
+import pytest
+
+from autogpt.config import Config
+from autogpt.config.singleton import Singleton
+from autogpt.memory.hybrid import (
+    HybridMemory,
+    deduplicate,
+    keyword_query,
+    reciprocal_rank_fusion,
+)
+from autogpt.permanent_memory.sqlite3_store import MemoryDB
+
+
+class FakeBackend:
+    def __init__(self):
+        self.texts = []
+        self.queries = []
+
+    def add(self, text):
+        if "Command Error:" in text:
+            return ""
+        self.texts.append(text)
+        return f"Inserting data into memory at index: {len(self.texts) - 1}"
+
+    def add_many(self, texts):
+        return [self.add(text) for text in texts]
+
+    def get_relevant(self, text, k):
+        self.queries.append(text)
+        return list(reversed(self.texts))[:k]
+
+    def clear(self):
+        self.texts = []
+        return "Obliviated"
+
+    def get_stats(self):
+        return {"texts": len(self.texts)}
+
+
+@pytest.fixture
+def memory():
+    Singleton._instances.pop(HybridMemory, None)
+    memory = HybridMemory(Config(), FakeBackend(), MemoryDB(":memory:"))
+    yield memory
+    Singleton._instances.pop(HybridMemory, None)
+
+
+def test_identifier_lookup_skips_vector_search(memory):
+    memory.add("Wrote the summary to output/report_2023.md")
+    memory.add("Searched the web for the weather")
+
+    assert memory.get_relevant("output/report_2023.md", 5) == [
+        "Wrote the summary to output/report_2023.md"
+    ]
+    assert memory.backend.queries == []
+
+
+def test_unknown_identifier_falls_back_to_vector_search(memory):
+    memory.add("Searched the web for the weather")
+
+    assert memory.get_relevant("job_42", 5) == ["Searched the web for the weather"]
+    assert memory.backend.queries == ["job_42"]
+
+
+def test_results_are_fused_and_deduplicated(memory):
+    memory.add("The capital of France is Paris")
+    memory.add("Python is a programming language")
+    memory.add("the capital of france is paris")
+
+    relevant = memory.get_relevant("What is the capital of France?", 5)
+
+    assert relevant[0].lower() == "the capital of france is paris"
+    assert len(relevant) == 2
+
+
+def test_errors_are_not_indexed(memory):
+    memory.add("Command Error: unknown command")
+
+    assert memory.keyword_search(keyword_query("unknown command"), 5) == []
+
+
+def test_clear_forgets_keyword_index(memory):
+    memory.add("The capital of France is Paris")
+    memory.clear()
+
+    assert memory.keyword_search(keyword_query("Paris"), 5) == []
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]])
+
+    assert fused == ["b", "a", "d", "c"]
+
+
+def test_deduplicate_keeps_best_ranked():
+    texts = ["Paris is the capital", "paris is the capital!", "Rome"]
+
+    assert deduplicate(texts) == ["Paris is the capital", "Rome"]
+
+
+def test_keyword_query():
+    assert keyword_query("What is the weather in Paris") == (
+        '"paris" OR "weather"'
+    )
+    assert keyword_query("the and of") == ""
+
+
+def test_add_many_indexes_added_texts(memory):
+    results = memory.add_many(
+        ["The capital of France is Paris", "Command Error: unknown command"]
+    )
+
+    assert results[1] == ""
+    assert memory.keyword_search(keyword_query("Paris"), 5) == [
+        "The capital of France is Paris"
+    ]
+    assert memory.keyword_search(keyword_query("unknown command"), 5) == []
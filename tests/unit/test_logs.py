@@ -0,0 +1,62 @@
+"""Unit tests for the logging module"""
+import logging
+import time
+
+from autogpt.logs import BatchingFileHandler, TypingConsoleHandler, logger
+
+
+def make_record(message, level=logging.INFO):
+    return logging.makeLogRecord(
+        {"msg": message, "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+
+
+def test_batching_file_handler_writes_in_batches(tmp_path):
+    path = tmp_path / "activity.log"
+    handler = BatchingFileHandler(path, batch_size=3, flush_interval=60)
+
+    handler.handle(make_record("one"))
+    handler.handle(make_record("two"))
+    assert path.read_text() == ""
+
+    handler.handle(make_record("three"))
+    assert path.read_text() == "one\ntwo\nthree\n"
+
+    # Errors are written right away
+    handler.handle(make_record("four"))
+    handler.handle(make_record("oops", logging.ERROR))
+    assert path.read_text().endswith("four\noops\n")
+
+    handler.handle(make_record("five"))
+    handler.close()
+    assert path.read_text().endswith("five\n")
+
+
+def test_batching_file_handler_flush_interval(tmp_path):
+    path = tmp_path / "activity.log"
+    handler = BatchingFileHandler(path, batch_size=100, flush_interval=0)
+    handler.handle(make_record("one"))
+    assert path.read_text() == "one\n"
+    handler.close()
+
+
+def test_typing_skipped_without_terminal(mocker, capsys):
+    sleep = mocker.patch("autogpt.logs.time.sleep")
+    TypingConsoleHandler().handle(make_record("many words " * 100))
+    assert capsys.readouterr().out.strip() == ("many words " * 100).strip()
+    sleep.assert_not_called()
+
+
+def test_typewriter_log_does_not_block(mocker):
+    mocker.patch("autogpt.logs.sys.stdout.isatty", return_value=True)
+    mocker.patch("autogpt.logs.CFG.continuous_mode", False)
+    typing = mocker.patch.object(
+        logger.typing_console_handler, "emit", side_effect=lambda _: time.sleep(0.5)
+    )
+
+    start = time.perf_counter()
+    logger.typewriter_log("SYSTEM:", "", "a slow message")
+    assert time.perf_counter() - start < 0.25
+
+    logger.flush()
+    typing.assert_called_once()
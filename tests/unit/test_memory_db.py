@@ -0,0 +1,101 @@
+"""Unit tests for the SQLite memory database"""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from autogpt.permanent_memory.sqlite3_store import MemoryDB, escape_query
+
+
+def test_insert_many_numbers_keys_in_order():
+    db = MemoryDB(":memory:")
+    db.insert("first memory")
+    db.insert_many([f"memory {i}" for i in range(5)], batch_size=2)
+
+    assert db.get_next_key() == 6
+    assert db.get_session() == ["first memory"] + [f"memory {i}" for i in range(5)]
+
+
+def test_new_session_continues_from_its_keys(tmp_path):
+    path = str(tmp_path / "mem.sqlite3")
+    db = MemoryDB(path)
+    db.insert_many(["one", "two"])
+    db.quit()
+
+    db = MemoryDB(path)
+    assert db.session_id == 2
+    db.session_id = 1
+    assert db.get_next_key() == 2
+    db.insert("three")
+    assert db.get_session(1) == ["one", "two", "three"]
+
+
+def test_delete_and_overwrite():
+    db = MemoryDB(":memory:")
+    db.insert_many(["one", "two", "three"])
+    db.delete_memory(0)
+    db.overwrite(1, "TWO")
+
+    assert sorted(db.get_session()) == ["TWO", "three"]
+
+
+def test_search_is_ranked_and_escaped():
+    db = MemoryDB(":memory:")
+    db.insert_many(
+        [
+            "The weather is nice",
+            "Paris weather: the weather in Paris is rainy",
+            'He said "hello" OR goodbye',
+        ]
+    )
+
+    assert db.search("weather") == [
+        "Paris weather: the weather in Paris is rainy",
+        "The weather is nice",
+    ]
+    assert db.search('"hello" OR') == ['He said "hello" OR goodbye']
+    assert db.search("weather", limit=1) == [
+        "Paris weather: the weather in Paris is rainy"
+    ]
+    assert db.search("  ") == []
+
+
+def test_escape_query():
+    assert escape_query('say "hi" NOT') == '"say" """hi""" "NOT"'
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = tmp_path / "mem.sqlite3"
+    db = MemoryDB(str(path))
+    assert not path.exists()
+
+    db.insert("first memory")
+    assert path.exists()
+    db.quit()
+
+
+def test_concurrent_writes_and_reads(tmp_path):
+    db = MemoryDB(str(tmp_path / "mem.sqlite3"))
+
+    def add(i):
+        db.insert(f"memory number {i}")
+        return db.search(f"{i}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = list(executor.map(add, range(50)))
+
+    assert all(f"memory number {i}" in found[i] for i in range(50))
+    assert db.get_next_key() == 50
+    assert len(db.get_session()) == 50
+    db.quit()
+
+
+def test_failed_write_does_not_affect_others():
+    db = MemoryDB(":memory:")
+    db.insert("kept")
+
+    with pytest.raises(sqlite3.OperationalError):
+        db._write(lambda cnx: cnx.execute("INSERT INTO missing VALUES (1);"))
+    db.insert("also kept")
+
+    assert db.get_session() == ["kept", "also kept"]
@@ -0,0 +1,106 @@
+"""Unit tests for buffering and batching in the Milvus memory"""
+import pytest
+
+pytest.importorskip("pymilvus")
+from autogpt.memory import milvus  # noqa: E402
+
+
+@pytest.fixture
+def embeddings(patch_embeddings):
+    return patch_embeddings(milvus)
+
+
+@pytest.fixture
+def collection(mocker):
+    mocker.patch.object(milvus, "connections")
+    collection = mocker.MagicMock()
+    collection.search.return_value = [[]]
+    mocker.patch.object(milvus, "Collection", return_value=collection)
+    return collection
+
+
+@pytest.fixture
+def memory(collection, embeddings, config, new_singleton, mocker):
+    mocker.patch.multiple(
+        config,
+        milvus_insert_batch_size=3,
+        milvus_flush_interval=60,
+        milvus_search_ef=64,
+        milvus_consistency_level="Session",
+    )
+    memory = new_singleton(milvus.MilvusMemory, config)
+    yield memory
+    memory.clear()
+
+
+def test_adds_are_buffered_until_a_batch_is_full(memory, collection, embeddings):
+    memory.add("one")
+    memory.add("two")
+    collection.insert.assert_not_called()
+
+    memory.add("three")
+    collection.insert.assert_called_once()
+    assert collection.insert.call_args.args[0][1] == ["one", "two", "three"]
+    assert embeddings.call_count == 1
+
+
+def test_search_inserts_buffered_texts_first(memory, collection):
+    memory.add("one")
+    memory.get_relevant("query", 20)
+
+    collection.insert.assert_called_once()
+    kwargs = collection.search.call_args.kwargs
+    assert collection.search.call_args.args[2] == {
+        "metric_type": "IP",
+        "params": {"ef": 64},
+    }
+    assert kwargs["consistency_level"] == "Session"
+
+
+def test_search_ef_is_at_least_the_number_of_results(memory, collection):
+    memory.get_relevant("query", 100)
+
+    assert collection.search.call_args.args[2]["params"] == {"ef": 100}
+
+
+def test_batch_query_searches_once(memory, collection, embeddings, mocker):
+    hit = mocker.Mock()
+    hit.entity.value_of_field.return_value = "memory"
+    collection.search.return_value = [[hit], [hit, hit]]
+
+    assert memory.get_relevant_many(["a", "b"], 2) == [
+        ["memory"],
+        ["memory", "memory"],
+    ]
+    collection.search.assert_called_once()
+    assert len(collection.search.call_args.args[0]) == 2
+
+
+def test_buffer_is_flushed_after_interval(memory, collection, mocker):
+    mocker.patch.object(memory.cfg, "milvus_flush_interval", 0.01)
+    memory.add("one")
+    memory._timer.join()
+
+    collection.insert.assert_called_once()
+
+
+def test_texts_are_kept_when_insertion_fails(memory, collection):
+    collection.insert.side_effect = [RuntimeError("unavailable"), None, None]
+    with pytest.raises(RuntimeError):
+        memory.add_many(["one", "two", "three", "four"])
+
+    memory.flush()
+    inserted = [call.args[0][1] for call in collection.insert.call_args_list[1:]]
+    assert inserted == [["one", "two", "three"], ["four"]]
+
+
+def test_errors_of_interval_flush_are_logged(memory, collection, mocker):
+    error = mocker.patch.object(milvus.logger, "error")
+    mocker.patch.object(memory.cfg, "milvus_flush_interval", 0.01)
+    collection.insert.side_effect = RuntimeError("unavailable")
+    memory.add("one")
+    memory._timer.join()
+
+    error.assert_called_once()
+    assert memory._buffer == ["one"]
+    collection.insert.side_effect = None
@@ -0,0 +1,83 @@
+"""Unit tests for the bounded capture of process output"""
+import subprocess
+import sys
+import time
+
+from autogpt.processing import output
+from autogpt.processing.output import HeadTailBuffer, capture_process
+
+
+def test_buffer_keeps_everything_that_fits():
+    buffer = HeadTailBuffer(4, 4)
+    buffer.write(b"abc")
+    buffer.write(b"defgh")
+    assert buffer.dropped == 0
+    assert buffer.decode() == "abcdefgh"
+
+
+def test_buffer_keeps_head_and_tail():
+    buffer = HeadTailBuffer(3, 3)
+    for chunk in (b"ab", b"cdefg", b"hij"):
+        buffer.write(chunk)
+    assert buffer.total == 10
+    assert buffer.dropped == 4
+    assert buffer.decode() == "abc\n... 4 bytes of output omitted ...\nhij"
+
+
+def test_buffer_does_not_split_characters():
+    buffer = HeadTailBuffer(3, 3)
+    buffer.write("ééééé".encode())
+    assert buffer.decode() == "é\n... 4 bytes of output omitted ...\né"
+
+
+def test_capture_process_separates_streams():
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; print('out'); print('err', file=sys.stderr)",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    captured = capture_process(process, timeout=10, max_bytes=1000, buffer_size=100)
+    assert captured.returncode == 0
+    assert captured.killed_reason is None
+    assert captured.stdout.decode().strip() == "out"
+    assert captured.stderr.decode().strip() == "err"
+
+
+class FakeEncoding:
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def test_truncate_to_tokens(mocker):
+    mocker.patch.object(
+        output.tiktoken, "encoding_for_model", return_value=FakeEncoding()
+    )
+    text = " ".join(str(i) for i in range(10))
+    assert output.truncate_to_tokens(text, 20, "gpt-3.5-turbo") == text
+    assert output.truncate_to_tokens(text, 4, "gpt-3.5-turbo") == (
+        "0 1\n... 6 tokens of output omitted ...\n8 9"
+    )
+
+
+def test_capture_process_kills_background_children():
+    process = subprocess.Popen(
+        "sleep 8 & echo started",
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    start = time.monotonic()
+    captured = capture_process(process, timeout=1, max_bytes=1000, buffer_size=100)
+
+    assert time.monotonic() - start < 4
+    assert captured.stdout.decode().strip() == "started"
+    assert "Background processes killed" in captured.killed_reason
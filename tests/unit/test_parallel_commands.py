@@ -0,0 +1,91 @@
+"""Unit tests for executing several commands from one response"""
+import json
+import threading
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+# The agent package has to be imported before autogpt.app, which it imports
+import autogpt.agent  # noqa: F401
+import autogpt.app as app
+from autogpt.promptgenerator import PromptGenerator
+
+SCHEMA_DIR = Path(app.__file__).parent / "json_schemas"
+THOUGHTS = {
+    "text": "t",
+    "reasoning": "r",
+    "plan": "p",
+    "criticism": "c",
+    "speak": "s",
+}
+
+
+def test_get_commands(mocker):
+    mocker.patch.object(app.CFG, "max_parallel_commands", 2)
+    single = {"command": {"name": "google", "args": {"input": "a"}}}
+    assert app.get_commands(single) == [("google", {"input": "a"})]
+
+    several = {
+        "commands": [
+            {"name": "google", "args": {"input": "a"}},
+            {"name": "read_file", "args": {"file": "b"}},
+        ]
+    }
+    assert app.get_commands(several) == [
+        ("google", {"input": "a"}),
+        ("read_file", {"file": "b"}),
+    ]
+
+    several["commands"].append({"name": "do_nothing", "args": {}})
+    [(name, error)] = app.get_commands(several)
+    assert name == "Error:"
+    assert "at most 2 commands" in error
+
+
+def test_execute_commands_runs_concurrently(mocker):
+    barrier = threading.Barrier(2, timeout=5)
+    executed = []
+
+    def execute_command(command_name, arguments):
+        if command_name == "task_complete":
+            executed.append(command_name)
+            return "shutting down"
+        # Both commands have to be running at the same time to pass the barrier
+        barrier.wait()
+        executed.append(command_name)
+        return arguments["input"].upper()
+
+    mocker.patch.object(app, "execute_command", side_effect=execute_command)
+    result = app.execute_commands(
+        [
+            ("task_complete", {"reason": "done"}),
+            ("google", {"input": "a"}),
+            ("google", {"input": "b"}),
+            ("Error:", "bad command"),
+        ]
+    )
+    assert result.splitlines() == [
+        "Command google returned: A",
+        "Command google returned: B",
+        "Command Error: threw the following error: bad command",
+        "Command task_complete returned: shutting down",
+    ]
+    assert executed[-1] == "task_complete"
+
+
+def test_response_format_with_several_commands():
+    generator = PromptGenerator()
+    generator.set_max_commands(3)
+    assert "command" not in generator.response_format
+    assert generator.response_format["commands"][0]["name"] == "command name"
+    assert "up to 3 commands" in generator.constraints[0]
+
+    schema = json.loads((SCHEMA_DIR / "llm_response_format_2.json").read_text())
+    validator = Draft7Validator(schema)
+    command = {"name": "google", "args": {"input": "a"}}
+    assert validator.is_valid({"thoughts": THOUGHTS, "commands": [command]})
+    assert validator.is_valid({"thoughts": THOUGHTS, "command": command})
+    assert not validator.is_valid({"thoughts": THOUGHTS})
+    assert not validator.is_valid(
+        {"thoughts": THOUGHTS, "command": command, "commands": [command]}
+    )
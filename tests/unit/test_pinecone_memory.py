@@ -0,0 +1,126 @@
+"""Unit tests for the Pinecone memory, against a local stand-in index"""
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from autogpt.memory import pinecone as pinecone_memory
+
+
+class Match(dict):
+    """A query match, read both as a dict and through attributes like Pinecone's"""
+
+    __getattr__ = dict.__getitem__
+
+
+class FakeIndex:
+    """Stores vectors per namespace and answers queries by cosine similarity"""
+
+    def __init__(self):
+        self.namespaces = {}
+        self.upserts = []
+        self.lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=None, async_req=False):
+        with self.lock:
+            self.upserts.append(len(vectors))
+            stored = self.namespaces.setdefault(namespace or "", {})
+            for id, values, metadata in vectors:
+                stored[id] = (np.array(values), metadata)
+        result = {"upserted_count": len(vectors)}
+        return SimpleNamespace(get=lambda: result) if async_req else result
+
+    def query(self, vector, top_k, namespace=None, include_metadata=False):
+        stored = self.namespaces.get(namespace or "", {})
+        vector = np.array(vector)
+        matches = [
+            Match(
+                id=id,
+                score=float(
+                    values @ vector / np.linalg.norm(values) / np.linalg.norm(vector)
+                ),
+                metadata=metadata,
+            )
+            for id, (values, metadata) in stored.items()
+        ]
+        matches = sorted(matches, key=lambda m: m.score, reverse=True)[:top_k]
+        # Least relevant first, to check that the memory sorts them
+        return SimpleNamespace(matches=matches[::-1])
+
+    def delete(self, delete_all=False, namespace=None):
+        self.namespaces.pop(namespace or "", None)
+
+    def describe_index_stats(self):
+        return {
+            "namespaces": {
+                name: {"vector_count": len(stored)}
+                for name, stored in self.namespaces.items()
+            }
+        }
+
+
+def embed(texts):
+    # Texts about the same first letter point the same way
+    return [[1.0 if i == ord(text[0]) % 8 else 0.1 for i in range(8)] for text in texts]
+
+
+@pytest.fixture
+def index(mocker):
+    index = FakeIndex()
+    mocker.patch.object(pinecone_memory.pinecone, "init")
+    mocker.patch.object(pinecone_memory.pinecone, "whoami")
+    mocker.patch.object(
+        pinecone_memory.pinecone, "list_indexes", return_value=["auto-gpt"]
+    )
+    mocker.patch.object(pinecone_memory.pinecone, "Index", return_value=index)
+    mocker.patch.object(
+        pinecone_memory, "create_embeddings_with_ada", side_effect=embed
+    )
+    return index
+
+
+@pytest.fixture
+def make_memory(index, config, new_singleton, mocker):
+    def make(namespace=""):
+        mocker.patch.object(config, "pinecone_namespace", namespace)
+        return new_singleton(pinecone_memory.PineconeMemory, config)
+
+    return make
+
+
+def test_add_many_upserts_in_batches(index, make_memory):
+    memory = make_memory()
+    memory.add_many([f"text {i}" for i in range(250)])
+
+    assert index.upserts == [100, 100, 50]
+    assert index.describe_index_stats()["namespaces"][""]["vector_count"] == 250
+
+
+def test_ids_are_stable_across_runs(index, make_memory):
+    make_memory().add("the same memory")
+    make_memory().add("the same memory")
+    make_memory().add("another memory")
+
+    assert len(index.namespaces[""]) == 2
+
+
+def test_most_relevant_comes_first(index, make_memory):
+    memory = make_memory()
+    memory.add_many(["apple", "banana", "avocado"])
+
+    relevant = memory.get_relevant("apricot", 3)
+
+    assert relevant[-1] == "banana"
+    assert set(relevant[:2]) == {"apple", "avocado"}
+
+
+def test_namespaces_keep_runs_apart(index, make_memory):
+    first, second = make_memory("run-1"), make_memory("run-2")
+    first.add("apple")
+    second.add("apricot")
+
+    assert first.get_relevant("apple", 5) == ["apple"]
+    second.clear()
+    assert second.get_relevant("apple", 5) == []
+    assert first.get_relevant("apple", 5) == ["apple"]
@@ -0,0 +1,171 @@
+"""Unit tests for the pool of Playwright browser contexts"""
+import asyncio
+
+import pytest
+
+from autogpt.commands import web_playwright
+from autogpt.commands.web_playwright import PlaywrightBrowser
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def goto(self, url, wait_until=None):
+        # Let other pages run, so that they compete for the contexts
+        await asyncio.sleep(0)
+        if "fail" in url:
+            raise RuntimeError("navigation failed")
+        self.url = url
+
+    async def content(self):
+        return f"<html><body><a href='{self.url}'>page</a></body></html>"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookies_cleared = 0
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self, browsers):
+        self.browsers = browsers
+        self.chromium = self
+        self.stopped = False
+
+    async def launch(self):
+        # Let other pages run, so that they race to launch a browser
+        await asyncio.sleep(0)
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def browsers(mocker):
+    browsers = []
+
+    async def start():
+        await asyncio.sleep(0)
+        starter.started += 1
+        return FakePlaywright(browsers)
+
+    starter = mocker.Mock()
+    starter.start = start
+    starter.started = 0
+    mocker.patch.object(
+        web_playwright, "async_playwright", return_value=starter, create=True
+    )
+    return browsers
+
+
+@pytest.fixture
+def browser(browsers, mocker):
+    browser = PlaywrightBrowser(max_contexts=1)
+    mocker.patch.object(web_playwright, "browser", browser)
+    yield browser
+    browser.close()
+
+
+def test_reuses_and_clears_context(browser, browsers):
+    browser.run(browser.fetch_html("https://example.com/a"))
+    browser.run(browser.fetch_html("https://example.com/b"))
+
+    assert len(browsers) == 1
+    assert len(browsers[0].contexts) == 1
+    assert browsers[0].contexts[0].cookies_cleared == 2
+
+
+def test_closes_context_of_failed_page(browser, browsers):
+    with pytest.raises(RuntimeError):
+        browser.run(browser.fetch_html("https://example.com/fail"))
+    browser.run(browser.fetch_html("https://example.com/a"))
+
+    first, second = browsers[0].contexts
+    assert first.closed
+    assert not second.closed
+
+
+def test_relaunches_crashed_browser(browser, browsers):
+    browser.run(browser.fetch_html("https://example.com/a"))
+    browsers[0].connected = False
+    browser.run(browser.fetch_html("https://example.com/b"))
+
+    assert len(browsers) == 2
+    assert len(browsers[1].contexts) == 1
+
+
+def test_concurrent_pages_launch_one_browser(browsers, mocker):
+    browser = PlaywrightBrowser(max_contexts=3)
+    mocker.patch.object(web_playwright, "browser", browser)
+    urls = [f"https://example.com/{i}" for i in range(3)]
+    try:
+        results = asyncio.run(web_playwright.scrape_pages_async(urls))
+    finally:
+        browser.close()
+
+    assert all(isinstance(result, tuple) for result in results)
+    assert web_playwright.async_playwright.return_value.started == 1
+    assert len(browsers) == 1
+
+
+def test_close_shuts_down_browser(browser, browsers):
+    browser.run(browser.fetch_html("https://example.com/a"))
+    playwright = browser._playwright
+    loop = browser._loop
+    browser.close()
+
+    assert not browsers[0].connected
+    assert playwright.stopped
+    assert browser._loop is None
+    assert loop.is_closed()
+
+
+def test_scrape_from_several_event_loops(browser, browsers):
+    urls = ["https://example.com/a", "https://example.com/b"]
+    for _ in range(2):
+        results = asyncio.run(web_playwright.scrape_pages_async(urls))
+        assert [links for _, links in results] == [
+            ["page (https://example.com/a)"],
+            ["page (https://example.com/b)"],
+        ]
+        # The browser and its semaphore come back on a new event loop
+        browser.close()
+
+    assert len(browsers) == 2
+    assert all(len(launched.contexts) == 1 for launched in browsers)
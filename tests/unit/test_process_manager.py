@@ -0,0 +1,57 @@
+"""Unit tests for the manager of background jobs"""
+import sys
+import time
+
+import pytest
+
+from autogpt.process_manager import ProcessManager, TooManyJobs
+
+
+def wait_until_done(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while job.ended is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ProcessManager(tmp_path / "jobs", max_jobs=1, max_log_bytes=200)
+    yield manager
+    manager.kill_all()
+
+
+def python_command(code: str) -> str:
+    return f'"{sys.executable}" -c "{code}"'
+
+
+def test_logs_output_of_job(manager, tmp_path):
+    job = manager.start(python_command("print('hello'); exit(3)"), tmp_path)
+    wait_until_done(job)
+    assert job.log_path.read_text() == "hello\n"
+    assert "exited with code 3" in job.describe()
+
+
+def test_rotates_log(manager, tmp_path):
+    job = manager.start(python_command("[print(i) for i in range(200)]"), tmp_path)
+    wait_until_done(job)
+    assert job.log_path.read_text().endswith("199\n")
+    assert job.log_path.stat().st_size <= 200
+    assert job.log_path.with_name("job-1.log.1").exists()
+
+
+def test_caps_running_jobs_and_kills(manager, tmp_path):
+    job = manager.start(python_command("import time; time.sleep(30)"), tmp_path)
+    with pytest.raises(TooManyJobs):
+        manager.start("echo too many", tmp_path)
+
+    assert manager.kill(str(job.id)) is job
+    assert "is killed" in job.describe()
+    second = manager.start("echo next", tmp_path)
+    assert second.id == 2
+
+
+def test_unknown_job(manager):
+    with pytest.raises(KeyError):
+        manager.get("42")
+    with pytest.raises(KeyError):
+        manager.get("not a number")
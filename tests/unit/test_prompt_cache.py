@@ -0,0 +1,48 @@
+"""Unit tests for caching the full prompt and its token count"""
+from autogpt import token_counter
+from autogpt.commands.command import COMMAND_REGISTRY, command
+from autogpt.config.ai_config import AIConfig
+
+
+def test_full_prompt_is_rendered_once(mocker):
+    get_prompt = mocker.patch("autogpt.prompt.get_prompt", return_value="COMMANDS")
+    config = AIConfig("Bot", "a test bot", ["pass the test"])
+
+    prompt = config.construct_full_prompt()
+    assert config.construct_full_prompt() is prompt
+    assert "1. pass the test" in prompt
+    assert get_prompt.call_count == 1
+
+    config.ai_goals.append("pass it again")
+    assert "2. pass it again" in config.construct_full_prompt()
+    assert get_prompt.call_count == 2
+
+
+def test_full_prompt_follows_command_registry(mocker):
+    get_prompt = mocker.patch("autogpt.prompt.get_prompt", return_value="COMMANDS")
+    config = AIConfig("Bot", "a test bot", ["pass the test"])
+    config.construct_full_prompt()
+
+    @command("test_prompt_cache_command", "Test Command")
+    def test_prompt_cache_command() -> None:
+        pass
+
+    try:
+        config.construct_full_prompt()
+        assert get_prompt.call_count == 2
+    finally:
+        COMMAND_REGISTRY.unregister("test_prompt_cache_command")
+
+
+def test_full_prompt_tokens_are_counted_once(mocker):
+    mocker.patch("autogpt.prompt.get_prompt", return_value="COMMANDS")
+    count = mocker.patch.object(
+        token_counter, "count_message_tokens", return_value=1234
+    )
+    token_counter.count_static_message_tokens.cache_clear()
+    config = AIConfig("Bot", "a test bot", ["count the tokens"])
+
+    assert config.count_full_prompt_tokens("gpt-3.5-turbo") == 1234
+    assert config.count_full_prompt_tokens("gpt-3.5-turbo") == 1234
+    assert count.call_count == 1
+    token_counter.count_static_message_tokens.cache_clear()
@@ -0,0 +1,106 @@
+"""Unit tests for adding memories to Redis in bulk"""
+import pytest
+
+redismem = pytest.importorskip("autogpt.memory.redismem")
+
+
+@pytest.fixture
+def embeddings(patch_embeddings):
+    return patch_embeddings(redismem)
+
+
+@pytest.fixture
+def client(mocker):
+    client = mocker.MagicMock()
+    client.get.return_value = None
+    client.incrby.side_effect = lambda key, amount: amount
+    mocker.patch.object(redismem.redis, "Redis", return_value=client)
+    return client
+
+
+@pytest.fixture
+def memory(client, embeddings, config, new_singleton, mocker):
+    mocker.patch.object(config, "wipe_redis_on_start", False)
+    return new_singleton(redismem.RedisMemory, config)
+
+
+def test_add_many_embeds_in_batches_and_pipelines_once(memory, client, embeddings):
+    texts = [f"memory {i}" for i in range(250)]
+    texts[10] = "Command Error: unknown command"
+
+    results = memory.add_many(texts)
+
+    assert [len(call.args[0]) for call in embeddings.call_args_list] == [100, 100, 49]
+    client.incrby.assert_called_once_with(f"{memory.cfg.memory_index}-vec_num", 249)
+    pipe = client.pipeline.return_value
+    assert pipe.hset.call_count == 249
+    pipe.execute.assert_called_once()
+    assert results[10] == ""
+    assert results[11].startswith("Inserting data into memory at index: 10:")
+    assert memory.vec_num == 249
+
+
+def test_add_skips_errors(memory, client, embeddings):
+    assert memory.add("Command Error: unknown command") == ""
+    embeddings.assert_not_called()
+    client.pipeline.assert_not_called()
+
+
+def test_get_relevant_returns_empty_list_on_error(memory, client):
+    memory.index.search.side_effect = redismem.redis.ResponseError("no index")
+
+    assert memory.get_relevant("anything") == []
+
+
+def test_vectors_are_stored_as_configured_type(
+    client, embeddings, config, new_singleton, mocker
+):
+    mocker.patch.multiple(
+        config,
+        wipe_redis_on_start=False,
+        redis_vector_type="FLOAT16",
+        redis_hnsw_m=16,
+        redis_hnsw_ef_construction=200,
+        redis_hnsw_ef_runtime=10,
+    )
+    memory = new_singleton(redismem.RedisMemory, config)
+    memory.add("a memory")
+
+    mapping = client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+    assert len(mapping["embedding"]) == 1536 * 2
+    fields = client.ft.return_value.create_index.call_args.kwargs["fields"]
+    assert fields[1].args[3:5] == ["TYPE", "FLOAT16"]
+    assert fields[1].args[-6:] == ["M", 16, "EF_CONSTRUCTION", 200, "EF_RUNTIME", 10]
+
+
+def test_relevant_memories_are_scored_and_filtered(memory, mocker):
+    memory.index.search.return_value = mocker.Mock(
+        docs=[
+            mocker.Mock(data="close", vector_score="0.1"),
+            mocker.Mock(data="far", vector_score="0.6"),
+        ]
+    )
+
+    assert memory.get_relevant_with_scores("query", 5, min_similarity=0.5) == [
+        ("close", pytest.approx(0.9))
+    ]
+    assert memory.get_relevant("query", 5) == ["close", "far"]
+    params = memory.index.search.call_args.kwargs["query_params"]
+    assert params["ef_runtime"] == memory.cfg.redis_hnsw_ef_runtime
+
+
+def test_stats_report_sizes(memory, config, mocker):
+    mocker.patch.object(config, "redis_vector_type", "FLOAT32")
+    memory.index.info.return_value = {
+        "num_docs": "1000",
+        "vector_index_sz_mb": "8",
+        "inverted_sz_mb": "1.5",
+        "doc_table_size_mb": "0.5",
+    }
+
+    stats = memory.get_stats()
+
+    assert stats["num_docs"] == 1000
+    assert stats["bytes_per_vector"] == 1536 * 4
+    assert stats["index_mb"] == 10
+    assert stats["vector_index_bytes_per_doc"] == 8 * 1024 * 1024 / 1000
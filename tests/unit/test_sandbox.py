@@ -0,0 +1,98 @@
+"""Unit tests for the sandboxes Python files are executed in"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from autogpt import sandbox
+from autogpt.sandbox import DockerSandboxPool, LocalSandbox, parse_memory
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(sandbox, "WORKSPACE_PATH", tmp_path)
+    return tmp_path
+
+
+def test_local_sandbox_runs_file(workspace):
+    (workspace / "hello.py").write_text("import sys\nprint('hi')\nsys.exit(3)\n")
+    assert LocalSandbox().run("hello.py") == (3, "hi\n")
+
+
+def test_local_sandbox_times_out(workspace):
+    (workspace / "loop.py").write_text(
+        "print('started', flush=True)\nwhile True:\n    pass\n"
+    )
+    exit_code, output = LocalSandbox(timeout=0.5).run("loop.py")
+    assert exit_code != 0
+    assert output == "started\n\nProcess killed after running for 0.5 seconds"
+
+
+def test_local_sandbox_kills_chatty_file(workspace):
+    (workspace / "chatty.py").write_text("while True:\n    print('x' * 1000)\n")
+    sandbox = LocalSandbox(
+        timeout=10, max_output_bytes=100_000, output_buffer_size=10
+    )
+    exit_code, output = sandbox.run("chatty.py")
+    assert exit_code != 0
+    assert output.startswith("x" * 10 + "\n... ")
+    assert output.endswith(
+        "Process killed after writing more than 100000 bytes of output"
+    )
+
+
+def test_parse_memory():
+    assert parse_memory("512m") == 512 * 1024**2
+    assert parse_memory("1.5g") == int(1.5 * 1024**3)
+    assert parse_memory("1024") == 1024
+    assert parse_memory("") == 0
+
+
+def make_pool(*containers, outputs=((0, [b"done\n"]),), **limits):
+    pool = DockerSandboxPool(size=1, **limits)
+    pool._client = MagicMock()
+    pool._client.containers.run.side_effect = list(containers)
+    pool._client.api.exec_create.return_value = {"Id": "exec"}
+    pool._client.api.exec_start.side_effect = [iter(chunks) for _, chunks in outputs]
+    pool._client.api.exec_inspect.side_effect = [
+        {"ExitCode": exit_code} for exit_code, _ in outputs
+    ]
+    return pool
+
+
+def test_docker_pool_reuses_container():
+    container = MagicMock(status="running")
+    pool = make_pool(container, outputs=[(0, [b"do", b"ne\n"])] * 2, timeout=5)
+
+    assert pool.run("a.py") == (0, "done\n")
+    assert pool.run("b.py") == (0, "done\n")
+    pool._client.containers.run.assert_called_once()
+    command = pool._client.api.exec_create.call_args.args[1]
+    assert command == ["timeout", "-s", "KILL", "5", "python", "b.py"]
+
+
+def test_docker_pool_replaces_stopped_container():
+    stopped = MagicMock(status="exited")
+    fresh = MagicMock(status="running")
+    pool = make_pool(stopped, fresh, outputs=[(0, []), (137, [b"partial"])])
+
+    pool.run("a.py")
+    exit_code, output = pool.run("a.py")
+    assert exit_code == 137
+    assert output.startswith("partial\nProcess killed after running for")
+    stopped.remove.assert_called_once_with(force=True)
+
+
+def test_docker_pool_kills_chatty_file():
+    container = MagicMock(status="running")
+    pool = make_pool(
+        container,
+        outputs=[(None, [b"x" * 60, b"y" * 60, b"z" * 60])],
+        max_output_bytes=100,
+        output_buffer_size=4,
+    )
+    _, output = pool.run("a.py")
+    assert output == (
+        "xxxx\n... 112 bytes of output omitted ...\nyyyy"
+        "\nProcess killed after writing more than 100 bytes of output"
+    )
+    container.exec_run.assert_any_call(["sh", "-c", "kill -9 -1"], user="root")
@@ -0,0 +1,39 @@
+"""Unit tests for the time it takes to start Auto-GPT"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmark.benchmark_startup import HEAVY_MODULES, import_times
+
+# Generous, so the test only fails when a heavy import sneaks back in. Startup
+# takes about 0.5s, it took 1.3s when every command imported its libraries.
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys, autogpt.__main__;"
+            "print(json.dumps(sorted(sys.modules)))",
+        ],
+        cwd=Path(__file__).parent.parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Process start is slower")
+def test_startup_time_budget():
+    # The fastest of a few rounds, to ignore the rounds a busy machine slows down
+    seconds = min(
+        import_times("autogpt.__main__")["autogpt.__main__"] / 1e6 for _ in range(3)
+    )
+    assert seconds < STARTUP_BUDGET_SECONDS
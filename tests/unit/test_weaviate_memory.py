@@ -0,0 +1,101 @@
+"""Unit tests for batching and deduplication in the Weaviate memory"""
+import pytest
+
+pytest.importorskip("weaviate")
+from autogpt.memory import weaviate as weaviate_memory  # noqa: E402
+
+
+@pytest.fixture
+def embeddings(patch_embeddings):
+    return patch_embeddings(weaviate_memory)
+
+
+@pytest.fixture
+def client(mocker):
+    client = mocker.MagicMock()
+    mocker.patch.object(weaviate_memory, "Client", return_value=client)
+    return client
+
+
+def existing(client, uuids):
+    query = client.query.get.return_value.with_where.return_value
+    query.with_limit.return_value.do.return_value = {
+        "data": {"Get": {"Memory": [{"_additional": {"id": id}} for id in uuids]}}
+    }
+
+
+@pytest.fixture
+def memory(client, embeddings, config, new_singleton, mocker):
+    mocker.patch.multiple(
+        config,
+        memory_index="memory",
+        use_weaviate_embedded=False,
+        weaviate_flush_interval=60,
+    )
+    existing(client, [])
+    memory = new_singleton(weaviate_memory.WeaviateMemory, config)
+    yield memory
+    memory.flush()
+
+
+def test_add_many_embeds_only_new_texts(memory, client, embeddings):
+    known = weaviate_memory.generate_uuid5("known", "Memory")
+    existing(client, [known])
+
+    results = memory.add_many(["known", "new", "new", "other"])
+
+    embeddings.assert_called_once_with(["new", "other"])
+    assert client.batch.add_data_object.call_count == 2
+    assert results[0].startswith("Data already in memory")
+    assert results[1].startswith("Inserting data into memory")
+    client.batch.flush.assert_not_called()
+
+
+def test_texts_are_added_when_existing_uuids_are_unknown(
+    memory, client, embeddings, mocker
+):
+    error = mocker.patch.object(weaviate_memory.logger, "error")
+    query = client.query.get.return_value.with_where.return_value
+    query.with_limit.return_value.do.return_value = {
+        "errors": [{"message": "unavailable"}]
+    }
+
+    results = memory.add_many(["one", "two"])
+
+    error.assert_called_once()
+    embeddings.assert_called_once_with(["one", "two"])
+    assert all(result.startswith("Inserting data") for result in results)
+
+
+def test_pending_texts_are_not_added_twice(memory, client, embeddings):
+    memory.add("new")
+    memory.add("new")
+
+    assert client.batch.add_data_object.call_count == 1
+
+
+def test_search_flushes_the_batch(memory, client):
+    memory.add("new")
+    memory.get_relevant("query")
+
+    client.batch.flush.assert_called_once()
+
+
+def test_query_embeddings_are_cached(memory, embeddings):
+    weaviate_memory.cached_embedding.cache_clear()
+    memory.get_relevant("query")
+    memory.get_relevant("query")
+
+    assert embeddings.call_count == 1
+    weaviate_memory.cached_embedding.cache_clear()
+
+
+def test_errors_of_interval_flush_are_logged(memory, client, mocker):
+    error = mocker.patch.object(weaviate_memory.logger, "error")
+    mocker.patch.object(memory.cfg, "weaviate_flush_interval", 0.01)
+    client.batch.flush.side_effect = RuntimeError("unavailable")
+    memory.add("new")
+    memory._timer.join()
+
+    error.assert_called_once()
+    client.batch.flush.side_effect = None
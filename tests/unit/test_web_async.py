@@ -0,0 +1,99 @@
+"""Unit tests for fetching several pages concurrently"""
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from autogpt.commands import web_async
+
+
+@pytest.fixture
+def no_cache(mocker, tmp_path):
+    from autogpt.http_cache import HTTPCache
+
+    mocker.patch.object(web_async, "http_cache", HTTPCache(tmp_path, max_size=0))
+    # The test server runs on localhost, which is normally refused
+    mocker.patch.object(web_async, "validate_url", lambda url: url)
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_fetch_pages_keeps_order_and_limits_per_host(no_cache):
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        name = request.match_info["name"]
+        if name == "missing":
+            return web.Response(status=404)
+        return web.Response(text=f"<p>{name}</p>", content_type="text/html")
+
+    async def main():
+        runner, base = await serve(handler)
+        try:
+            urls = [f"{base}/page{i}" for i in range(5)] + [f"{base}/missing"]
+            return await web_async.fetch_pages(
+                urls, max_connections=10, max_connections_per_host=2
+            )
+        finally:
+            await runner.cleanup()
+
+    pages = asyncio.run(main())
+    assert pages[:5] == [(f"<p>page{i}</p>", None) for i in range(5)]
+    assert pages[5] == (None, "Error: HTTP 404 error")
+    assert peak == 2
+
+
+def test_fetch_pages_reads_whole_body_up_to_limit(no_cache, mocker):
+    body = "<p>" + "x" * 3_600_000 + "</p>"
+
+    async def handler(request):
+        return web.Response(text=body, content_type="text/html")
+
+    async def main():
+        runner, base = await serve(handler)
+        try:
+            return await web_async.fetch_pages([f"{base}/big"])
+        finally:
+            await runner.cleanup()
+
+    [(html, error)] = asyncio.run(main())
+    assert error is None
+    assert html == body
+
+    mocker.patch.object(web_async, "MAX_PAGE_SIZE", 100_000)
+    [(html, error)] = asyncio.run(main())
+    assert html == body[:100_000]
+
+
+def test_browse_websites_rejects_bad_input():
+    assert web_async.browse_websites([], "q") == "Error: No URLs given"
+    urls = [f"https://example.com/{i}" for i in range(web_async.MAX_URLS + 1)]
+    assert web_async.browse_websites(urls, "q").startswith("Error: Too many URLs")
+
+
+def test_browse_websites_reports_errors_per_url(mocker):
+    mocker.patch.object(
+        web_async.summary, "summarize_text", return_value="summary"
+    )
+    result = json.loads(
+        web_async.browse_websites("file:///etc/passwd, file:///etc/passwd", "q")
+    )
+    assert result == {
+        "file:///etc/passwd": "Error: Access to local files is restricted"
+    }
@@ -0,0 +1,161 @@
+"""Unit tests for the pool of selenium web drivers"""
+import re
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from autogpt.commands.web_selenium import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.healthy = True
+        self.quit_called = False
+        self.cookies_deleted = 0
+        self.visited = []
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise WebDriverException("browser crashed")
+
+    def delete_all_cookies(self):
+        self.cookies_deleted += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers():
+    return []
+
+
+@pytest.fixture
+def pool(drivers):
+    def create_driver():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    return WebDriverPool(create_driver, size=2, max_pages=3)
+
+
+def test_reuses_and_resets_driver(pool, drivers):
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second
+    assert len(drivers) == 1
+    assert first.cookies_deleted == 2
+    assert first.visited == ["about:blank", "about:blank"]
+
+
+class FakeChromeDriver(FakeDriver):
+    def __init__(self):
+        super().__init__()
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp_commands.append((cmd, cmd_args))
+
+
+def test_clears_data_of_every_site_with_cdp():
+    pool = WebDriverPool(FakeChromeDriver, size=1, max_pages=3)
+    with pool.driver() as driver:
+        pass
+    assert driver.cdp_commands == [
+        ("Network.clearBrowserCookies", {}),
+        ("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"}),
+    ]
+    assert driver.cookies_deleted == 0
+    assert driver.visited == ["about:blank"]
+
+
+def test_recycles_driver_after_max_pages(pool, drivers):
+    for _ in range(4):
+        with pool.driver():
+            pass
+    assert len(drivers) == 2
+    assert drivers[0].quit_called
+    assert not drivers[1].quit_called
+
+
+def test_replaces_unhealthy_driver(pool, drivers):
+    with pool.driver() as driver:
+        pass
+    driver.healthy = False
+    with pool.driver() as replacement:
+        pass
+    assert replacement is not driver
+    assert driver.quit_called
+
+
+def test_discards_driver_on_error(pool, drivers):
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            raise RuntimeError("page failed")
+    assert drivers[0].quit_called
+    with pool.driver() as driver:
+        assert driver is drivers[1]
+
+
+def test_close_quits_idle_drivers(pool, drivers):
+    with pool.driver():
+        with pool.driver():
+            pass
+    pool.close()
+    assert len(drivers) == 2
+    assert all(driver.quit_called for driver in drivers)
+
+
+class ScriptedDriver:
+    def __init__(self, results):
+        self.results = list(results)
+
+    def execute_script(self, script):
+        return self.results.pop(0)
+
+
+def test_wait_for_stable_dom_stops_when_unchanged():
+    from autogpt.commands.web_selenium import wait_for_stable_dom
+
+    driver = ScriptedDriver(["10:5", "20:50", "30:80", "30:80", "40:90"])
+    wait_for_stable_dom(driver, timeout=1, interval=0)
+    assert driver.results == ["40:90"]
+
+
+def test_page_load_stats(mocker):
+    from autogpt.commands import web_selenium
+    from autogpt.commands.web_selenium import get_page_load_stats
+
+    mocker.patch.object(web_selenium.CFG, "selenium_text_only", False)
+    stats = get_page_load_stats(ScriptedDriver([[2048, 3, 4]]), 1.5)
+    assert (stats.transferred_bytes, stats.requests) == (2048, 3)
+    assert str(stats) == "loaded in 1.50s, 3 requests, 2 KB transferred"
+    assert get_page_load_stats(ScriptedDriver([None]), 1.5) is None
+
+    mocker.patch.object(web_selenium.CFG, "selenium_text_only", True)
+    stats = get_page_load_stats(ScriptedDriver([[2048, 3, 4]]), 1.5)
+    assert str(stats).endswith(", 4 images and media not downloaded")
+
+
+def is_blocked(url):
+    from autogpt.commands.web_selenium import BLOCKED_URL_PATTERNS
+
+    # Chrome's patterns only have the * wildcard
+    return any(
+        re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url)
+        for pattern in BLOCKED_URL_PATTERNS
+    )
+
+
+def test_blocked_url_patterns_spare_pages():
+    assert is_blocked("https://example.com/fonts/roboto.woff2")
+    assert is_blocked("https://example.com/video.mp4?start=10")
+    assert not is_blocked("https://www.movies.com/")
+    assert not is_blocked("https://www.avis.com/en/home")
+    assert not is_blocked("https://en.wikipedia.org/wiki/File:Example.png")
+    assert not is_blocked("https://example.com/watch?v=video.mp4x")
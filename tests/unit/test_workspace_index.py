@@ -0,0 +1,71 @@
+"""Unit tests for the workspace file index"""
+import os
+
+import pytest
+
+from autogpt.workspace_index import WorkspaceIndex
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    (tmp_path / ".hidden").write_text("")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("")
+    return tmp_path
+
+
+def test_search_lists_all_visible_files(workspace):
+    index = WorkspaceIndex(workspace)
+    files, total = index.search()
+    assert files == ["notes.txt", "src/main.py", "src/pkg/util.py"]
+    assert total == 3
+
+
+def test_search_directory_and_pattern(workspace):
+    index = WorkspaceIndex(workspace)
+    assert index.search("src")[0] == ["src/main.py", "src/pkg/util.py"]
+    assert index.search("src/pkg")[0] == ["src/pkg/util.py"]
+    assert index.search(pattern="*.py")[0] == ["src/main.py", "src/pkg/util.py"]
+    assert index.search(pattern="src/pkg/*")[0] == ["src/pkg/util.py"]
+    assert index.search(pattern="*.md") == ([], 0)
+
+
+def test_search_pagination(workspace):
+    index = WorkspaceIndex(workspace)
+    files, total = index.search(offset=1, limit=1)
+    assert files == ["src/main.py"]
+    assert total == 3
+
+
+def test_add_and_remove_are_incremental(workspace):
+    index = WorkspaceIndex(workspace, rescan_interval=3600)
+    index.search()
+
+    new_file = workspace / "src" / "new" / "module.py"
+    new_file.parent.mkdir()
+    new_file.write_text("")
+    index.add(new_file)
+    assert "src/new/module.py" in index.search()[0]
+
+    os.remove(workspace / "notes.txt")
+    index.remove(workspace / "notes.txt")
+    assert "notes.txt" not in index.search()[0]
+
+
+def test_refresh_picks_up_external_changes(workspace):
+    index = WorkspaceIndex(workspace, rescan_interval=3600)
+    index.search()
+
+    (workspace / "cloned" / "repo").mkdir(parents=True)
+    (workspace / "cloned" / "repo" / "README.md").write_text("")
+    (workspace / "src" / "pkg" / "util.py").unlink()
+    (workspace / "src" / "pkg").rmdir()
+
+    # Not visible until the rescan interval elapses or a refresh is forced
+    assert "cloned/repo/README.md" not in index.search()[0]
+    index.refresh(force=True)
+    assert index.search()[0] == ["cloned/repo/README.md", "notes.txt", "src/main.py"]